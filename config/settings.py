@@ -120,6 +120,25 @@ DATABASES = {
     }
 }
 
+# Cache shared by every worker process: community list fragments and their generation counters
+# (weddings.community_cache), buffered post views (weddings.view_counter) and vendor search markers.
+# Set REDIS_URL in production (redis package, in requirements.txt). Without it the cache is per-process LocMem,
+# which is only correct for a single-process server (runserver, one gunicorn worker).
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -188,3 +207,50 @@ NAVER_CLIENT_SECRET = os.environ.get('NAVER_CLIENT_SECRET', 'YOUR_NAVER_CLIENT_S
 
 # Google Maps Platform API
 GOOGLE_MAPS_API_KEY = os.environ.get('GOOGLE_MAPS_API_KEY', 'YOUR_GOOGLE_MAPS_API_KEY')
+
+# External vendor API endpoints (override to point at a local stub server)
+NAVER_API_BASE_URL = os.environ.get('NAVER_API_BASE_URL', 'https://openapi.naver.com')
+GOOGLE_PLACES_BASE_URL = os.environ.get('GOOGLE_PLACES_BASE_URL', 'https://maps.googleapis.com')
+
+# Vendor API client: (connect, read) timeouts per endpoint, retries, circuit breaker
+VENDOR_API_TIMEOUTS = {
+    'naver_local': (3.05, 5),
+    'google_textsearch': (3.05, 8),
+    'google_details': (3.05, 8),
+}
+VENDOR_API_MAX_RETRIES = 2
+VENDOR_API_CIRCUIT_FAILURES = 5
+VENDOR_API_CIRCUIT_RESET = 30
+
+# Concurrent provider search: worker threads per process and overall deadline (seconds)
+VENDOR_FANOUT_WORKERS = 8
+VENDOR_FANOUT_DEADLINE = 4.0
+
+# Vendor search stale-while-revalidate: how long a (category, region) result stays fresh,
+# and how soon a partially failed refresh is retried (seconds)
+VENDOR_SEARCH_FRESH_TTL = 60 * 60 * 24
+VENDOR_SEARCH_RETRY_TTL = 60 * 5
+
+# Raw provider payload cache. MODE: 'off' | 'record' | 'replay' (offline, recorded fixtures only)
+VENDOR_PAYLOAD_CACHE = {
+    'MODE': os.environ.get('VENDOR_PAYLOAD_CACHE_MODE', 'record'),
+    'DIR': os.environ.get('VENDOR_PAYLOAD_CACHE_DIR', BASE_DIR / 'var' / 'provider_payloads'),
+    'TTL': 60 * 60 * 24,
+    'MAX_BYTES': 200 * 1024 * 1024,
+}
+
+# Provider API quotas shared by all workers (token bucket: RATE tokens/sec up to BURST, plus a DAILY cap).
+# Background refreshes leave BACKGROUND_RESERVE of the bucket and (1 - BACKGROUND_DAILY_SHARE) of the
+# daily budget for interactive calls; interactive calls wait up to MAX_WAIT seconds for a token.
+VENDOR_API_QUOTAS = {
+    'naver': {'RATE': 10, 'BURST': 10, 'DAILY': 25000, 'BACKGROUND_RESERVE': 0.3, 'BACKGROUND_DAILY_SHARE': 0.8, 'MAX_WAIT': 1.0},
+    'google': {'RATE': 10, 'BURST': 20, 'DAILY': 5000, 'BACKGROUND_RESERVE': 0.3, 'BACKGROUND_DAILY_SHARE': 0.8, 'MAX_WAIT': 1.0},
+}
+
+# Vendor category whose final selection is the wedding venue ("near the venue" searches)
+VENDOR_VENUE_CATEGORY = 'venue'
+
+# Post views are buffered in the cache and written to Post.view_count by the first view request after
+# this many seconds (or by the flush_post_views cron, which needs the shared REDIS_URL cache).
+# Without traffic or cron, buffered views can wait until their keys expire (weddings.view_counter).
+POST_VIEW_FLUSH_INTERVAL = 30
@@ -1,3 +1,12 @@
 from django.contrib import admin
+from .models import Sido, Sigungu
 
-# Register your models here.
+@admin.register(Sido)
+class SidoAdmin(admin.ModelAdmin):
+    list_display = ('name', 'full_name')
+
+@admin.register(Sigungu)
+class SigunguAdmin(admin.ModelAdmin):
+    list_display = ('name', 'sido')
+    list_filter = ('sido',)
+    search_fields = ('name',)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate, pre_migrate
+        from core.fts import drop_index_triggers, install_index_triggers
+
+        pre_migrate.connect(drop_index_triggers, sender=self)
+        post_migrate.connect(install_index_triggers, sender=self)
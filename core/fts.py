@@ -0,0 +1,208 @@
+"""
+SQLite FTS5 전문 검색 인덱스 공통 도구
+
+- trigram 토크나이저를 사용하므로 형태소 분석 없이 한글 부분 문자열 검색이 됩니다.
+- 인덱스는 원본 테이블의 트리거로 갱신됩니다 (ORM save, bulk_create, update 등 모든 쓰기에 반영).
+  마이그레이션은 FTS 테이블만 (자체 SQL 로) 만들고, 트리거는 migrate 전후 시그널에서 내렸다가 다시 만듭니다.
+- 3글자 미만 검색어(예: '강남')는 trigram 으로 찾을 수 없어 인덱스 내용에 instr() 로 대조합니다.
+- SQLite 가 아니거나 FTS5 trigram 을 지원하지 않으면 인덱스를 만들지 않고 icontains 검색으로 대신합니다.
+"""
+import unicodedata
+
+from django.db import connection as default_connection, connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+MIN_TRIGRAM_LENGTH = 3
+
+
+# Indexes kept up to date by triggers (see register / the migrate signal handlers below)
+INDEXES = []
+
+
+def register(index):
+    INDEXES.append(index)
+    return index
+
+
+def drop_index_triggers(sender, using, plan=None, **kwargs):
+    """
+    pre_migrate: SQLite 는 ALTER 대신 테이블을 새로 만들어 바꾸는(remake) 경우가 많은데, 그때 원본 테이블의
+    트리거는 함께 사라지고 다른 테이블을 참조하는 트리거는 RENAME 을 막습니다. 마이그레이션 동안은 트리거를 내립니다.
+    """
+    connection = connections[using]
+    if not plan:
+        return
+    for index in INDEXES:
+        if index.exists(connection):
+            index.drop_triggers(connection)
+
+
+def install_index_triggers(sender, using, plan=None, **kwargs):
+    """post_migrate: 트리거를 다시 만들고 전체 재색인 (변경할 마이그레이션이 없었고 트리거가 온전하면 생략)"""
+    connection = connections[using]
+    for index in INDEXES:
+        if index.exists(connection) and (plan or not index.has_triggers(connection)):
+            index.install_triggers(connection)
+
+
+def split_terms(text):
+    """검색어를 공백 단위 용어로 (NFKC 정규화, 따옴표 제거)"""
+    text = unicodedata.normalize('NFKC', text or '').replace('"', ' ')
+    return [term for term in text.split() if term]
+
+
+class FullTextIndex:
+    """
+    원본 테이블 한 개에 대한 FTS5 인덱스 정의
+
+    columns : [(인덱스 컬럼, 원본 행 기준 SQL 식)] - 식 안의 {row} 는 NEW 또는 원본 테이블명으로 치환
+    weights : 컬럼별 bm25 가중치 (columns 순서)
+    watch   : 이 컬럼이 바뀔 때만 재색인 (평점 등 다른 컬럼 UPDATE 는 인덱스를 건드리지 않음)
+    related : [(참조 테이블, 감시 컬럼, 인덱스 컬럼, 원본 FK 컬럼[, 값 SQL 식])] - 참조 행이 바뀌면 해당 컬럼만 갱신
+              감시 컬럼이 여러 개면 'a, b' 로, 값 식은 NEW 기준 (기본값 NEW.감시 컬럼)
+    fallback_fields : 인덱스를 쓸 수 없을 때 icontains 로 검색할 {ORM 필드: 대응하는 인덱스 컬럼}
+    """
+
+    def __init__(self, table, source_table, columns, weights, watch, related=(), fallback_fields=None):
+        self.table = table
+        self.source_table = source_table
+        self.columns = columns
+        self.weights = weights
+        self.watch = watch
+        self.related = related
+        self.fallback_fields = fallback_fields or {}
+
+    def _names(self):
+        return ', '.join(name for name, _ in self.columns)
+
+    def _values(self, row):
+        return ', '.join(expr.format(row=row) for _, expr in self.columns)
+
+    def trigger_sql(self):
+        t, src = self.table, self.source_table
+        insert = f"INSERT INTO {t}(rowid, {self._names()}) VALUES (NEW.id, {self._values('NEW')});"
+        statements = [
+            f"CREATE TRIGGER {t}_ai AFTER INSERT ON {src} BEGIN {insert} END",
+            f"CREATE TRIGGER {t}_ad AFTER DELETE ON {src} BEGIN DELETE FROM {t} WHERE rowid = OLD.id; END",
+            f"CREATE TRIGGER {t}_au AFTER UPDATE OF {', '.join(self.watch)} ON {src} "
+            f"BEGIN DELETE FROM {t} WHERE rowid = OLD.id; {insert} END",
+        ]
+        for i, (rel_table, rel_column, column, fk, *value) in enumerate(self.related):
+            value = value[0] if value else f"NEW.{rel_column}"
+            statements.append(
+                f"CREATE TRIGGER {t}_rel{i} AFTER UPDATE OF {rel_column} ON {rel_table} "
+                f"BEGIN UPDATE {t} SET {column} = {value} "
+                f"WHERE rowid IN (SELECT id FROM {src} WHERE {fk} = NEW.id); END"
+            )
+        return statements
+
+    def _trigger_names(self):
+        return [f"{self.table}_{suffix}" for suffix in ('ai', 'ad', 'au')] + [
+            f"{self.table}_rel{i}" for i in range(len(self.related))
+        ]
+
+    def rebuild_sql(self):
+        t, src = self.table, self.source_table
+        return [
+            f"DELETE FROM {t}",
+            f"INSERT INTO {t}(rowid, {self._names()}) SELECT id, {self._values(src)} FROM {src}",
+            f"INSERT INTO {t}({t}) VALUES ('optimize')",
+        ]
+
+    def drop_triggers(self, connection):
+        with connection.cursor() as cursor:
+            for name in self._trigger_names():
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    def install_triggers(self, connection):
+        """트리거를 (다시) 만들고 원본 테이블 전체를 색인"""
+        self.drop_triggers(connection)
+        with connection.cursor() as cursor:
+            for sql in self.trigger_sql() + self.rebuild_sql():
+                cursor.execute(sql)
+
+    def has_triggers(self, connection):
+        with connection.cursor() as cursor:
+            names = self._trigger_names()
+            cursor.execute(
+                f"SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN ({', '.join(['%s'] * len(names))})",
+                names,
+            )
+            return cursor.fetchone()[0] == len(self._trigger_names())
+
+    def rebuild(self, connection=default_connection):
+        with connection.cursor() as cursor:
+            for sql in self.rebuild_sql():
+                cursor.execute(sql)
+
+    def exists(self, connection=default_connection):
+        if connection.vendor != 'sqlite':
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [self.table])
+            return cursor.fetchone() is not None
+
+    def _conditions(self, terms, columns):
+        """(MATCH 식, rowid 서브쿼리) - columns 가 주어지면 해당 인덱스 컬럼에서만 찾음"""
+        long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+        short_terms = [term for term in terms if len(term) < MIN_TRIGRAM_LENGTH]
+        columns = columns or [name for name, _ in self.columns]
+
+        match = ' '.join(f'"{term}"' for term in long_terms)
+        if match and len(columns) < len(self.columns):
+            match = f"{{{' '.join(columns)}}} : ({match})"
+
+        where, params = [], []
+        if match:
+            where.append(f"{self.table} MATCH %s")
+            params.append(match)
+        for term in short_terms:
+            where.append('(' + ' OR '.join(f"instr(lower({name}), %s) > 0" for name in columns) + ')')
+            params += [term.lower()] * len(columns)
+        return match, RawSQL(f"SELECT rowid FROM {self.table} WHERE {' AND '.join(where)}", params)
+
+    def filter(self, queryset, text, columns=None, connection=default_connection):
+        """queryset 을 검색어와 일치하는 행으로만 거름 (순위 없음)"""
+        terms = split_terms(text)
+        if not terms:
+            return queryset
+        if not self.exists(connection):
+            return self._fallback(queryset, terms, columns)
+        _, matched = self._conditions(terms, columns)
+        return queryset.filter(pk__in=matched)
+
+    def search(self, queryset, text, connection=default_connection):
+        """
+        queryset 을 검색어로 거르고 search_rank(작을수록 관련도 높음)를 붙여 관련도순 정렬
+        3글자 이상 용어는 bm25 로 순위를 매기고, 짧은 용어만 있으면 순위 없이 일치 여부로만 거릅니다.
+        """
+        terms = split_terms(text)
+        no_rank = Value(0.0, output_field=FloatField())
+        if not terms:
+            return queryset.annotate(search_rank=no_rank)
+        if not self.exists(connection):
+            return self._fallback(queryset, terms).annotate(search_rank=no_rank)
+
+        match, matched = self._conditions(terms, None)
+        queryset = queryset.filter(pk__in=matched)
+        if not match:
+            return queryset.annotate(search_rank=no_rank)
+
+        rank = RawSQL(
+            f"SELECT rank FROM {self.table} WHERE {self.table} MATCH %s AND rowid = {self.source_table}.id",
+            [match],
+            output_field=FloatField(),
+        )
+        return queryset.annotate(search_rank=rank).order_by(F('search_rank').asc(nulls_last=True), 'pk')
+
+    def _fallback(self, queryset, terms, columns=None):
+        fields = self.fallback_fields
+        if columns:
+            fields = [field for field, column in self.fallback_fields.items() if column in columns]
+        for term in terms:
+            condition = Q()
+            for field in fields:
+                condition |= Q(**{f'{field}__icontains': term})
+            queryset = queryset.filter(condition)
+        return queryset
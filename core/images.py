@@ -0,0 +1,181 @@
+"""
+업로드 이미지 파생본 (썸네일/카드/원본 크기 제한본)
+
+- 원본 바이트의 sha256 을 키로 derived/<앞 2자리>/<해시>/<크기>.<webp|jpg> 에 저장합니다 (content-addressed).
+  같은 이미지를 여러 번 올려도 파생본은 한 번만 만들고 저장합니다.
+- EXIF 방향을 픽셀에 반영한 뒤 메타데이터(EXIF/GPS 등) 없이 다시 인코딩합니다.
+- 새로 올라온 원본도 메타데이터 없이 다시 인코딩해 <upload_to>/<해시>.<확장자> 로 저장합니다.
+  같은 이미지가 이미 저장돼 있으면 새로 저장하지 않고 그 파일을 가리킵니다.
+- 모델에는 해시(image_hash)만 저장하고, 템플릿은 {% picture %} 태그(core.templatetags.images)로
+  WebP + JPEG 대체 이미지를 참조합니다. 파생본이 없으면 원본으로 대신합니다.
+"""
+import hashlib
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+DERIVED_ROOT = 'derived'
+
+# variant -> longest edge (px); images are never upscaled
+VARIANTS = {
+    'thumb': 320,
+    'card': 640,
+    'full': 1600,
+}
+
+# format -> (file extension, Pillow save options)
+FORMATS = {
+    'webp': ('webp', {'format': 'WEBP', 'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+# Stored originals: source format -> (file extension, Pillow save options); None keeps the bytes as uploaded.
+# GIF has no EXIF/GPS block and re-encoding would drop its animation. Other formats are stored as PNG.
+ORIGINALS = {
+    'JPEG': ('jpg', {'format': 'JPEG', 'quality': 95}),
+    'PNG': ('png', {'format': 'PNG', 'optimize': True}),
+    'WEBP': ('webp', {'format': 'WEBP', 'quality': 95}),
+    'GIF': ('gif', None),
+}
+
+# Decompression bomb guard for user uploads (~50 megapixels), checked before decoding
+MAX_PIXELS = 50_000_000
+
+
+def derived_path(digest, variant, fmt):
+    extension = FORMATS[fmt][0]
+    return f"{DERIVED_ROOT}/{digest[:2]}/{digest}/{variant}.{extension}"
+
+
+def derived_url(digest, variant, fmt):
+    return default_storage.url(derived_path(digest, variant, fmt))
+
+
+def _read(field_file):
+    if field_file._committed:
+        with field_file.open('rb') as f:
+            return f.read()
+    # Upload not written to storage yet: leave it rewound for the model save
+    upload = field_file.file
+    upload.seek(0)
+    data = upload.read()
+    upload.seek(0)
+    return data
+
+
+def _decode(data):
+    """바이트 -> EXIF 방향을 반영한 이미지 (크기 초과나 손상 시 OSError 등)"""
+    with Image.open(io.BytesIO(data)) as source:
+        if source.width * source.height > MAX_PIXELS:
+            raise OSError(f"image too large ({source.width}x{source.height})")
+        source.load()
+        return ImageOps.exif_transpose(source)
+
+
+def _flatten(image):
+    """JPEG 용: 투명 배경은 흰색으로"""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image, fmt):
+    _, options = FORMATS[fmt]
+    if fmt == 'jpeg':
+        image = _flatten(image)
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'P') else 'RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, **options)  # no exif= argument: metadata is dropped
+    return buffer.getvalue()
+
+
+def create_derivatives(data):
+    """
+    이미지 바이트 -> 파생본 저장 후 해시 반환 (이미 저장된 해시면 인코딩 생략)
+    이미지가 아니거나 열 수 없으면 None
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    paths = [derived_path(digest, variant, fmt) for variant in VARIANTS for fmt in FORMATS]
+    if all(default_storage.exists(path) for path in paths):
+        return digest
+
+    try:
+        image = _decode(data)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        logger.warning("Skipping image derivatives: %s", e)
+        return None
+
+    for variant, edge in VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        for fmt in FORMATS:
+            path = derived_path(digest, variant, fmt)
+            if not default_storage.exists(path):
+                default_storage.save(path, ContentFile(_encode(resized, fmt)))
+    return digest
+
+
+def _original_format(data):
+    with Image.open(io.BytesIO(data)) as source:
+        return ORIGINALS.get(source.format, ORIGINALS['PNG'])
+
+
+def _encode_original(data, options):
+    image = _decode(data)
+    if options['format'] == 'JPEG':
+        image = image if image.mode == 'L' else _flatten(image)
+    elif image.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    # Keep only what the pixels need: exif_transpose leaves EXIF/XMP in info for some formats
+    image.info = {key: image.info[key] for key in ('transparency',) if key in image.info}
+    buffer = io.BytesIO()
+    image.save(buffer, **options)
+    return buffer.getvalue()
+
+
+def _store_original(field_file, data, digest):
+    """
+    저장 전 업로드를 메타데이터를 지운 원본으로 바꾸고 해시 파일명으로 지정
+    같은 해시의 원본이 이미 있으면 업로드를 저장하지 않고 그 파일을 가리킵니다.
+    """
+    try:
+        extension, options = _original_format(data)
+        name = field_file.field.generate_filename(field_file.instance, f"{digest}.{extension}")
+        if field_file.storage.exists(name):
+            field_file.name = name
+            field_file._committed = True  # FileField.pre_save skips the upload
+            return
+        content = data if options is None else _encode_original(data, options)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        logger.warning("Keeping original upload as is: %s", e)
+        return
+    # FileField.pre_save writes this under upload_to
+    field_file.name = f"{digest}.{extension}"
+    field_file.file = ContentFile(content)
+
+
+def process_field(field_file):
+    """
+    ImageField 값(업로드 중이거나 저장된 파일)의 파생본을 만들고 해시 반환
+    저장 전 업로드는 원본도 메타데이터를 지우고 해시 파일명으로 바꿉니다 (_store_original).
+    """
+    if not field_file:
+        return ''
+    try:
+        data = _read(field_file)
+    except (FileNotFoundError, OSError) as e:
+        logger.warning("Cannot read %s: %s", field_file.name, e)
+        return ''
+    digest = create_derivatives(data)
+    if digest and not field_file._committed:
+        _store_original(field_file, data, digest)
+    return digest or ''
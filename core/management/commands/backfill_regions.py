@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from core.regions import resolve_first
+from vendors.models import Vendor
+from weddings.models import WeddingProfile
+
+
+class Command(BaseCommand):
+    help = "기존 업체/프로필의 지역 문자열(주소, 시도/시군구)을 행정구역 FK(sido, sigungu)로 매핑"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--all', action='store_true', help="이미 매핑된 행도 다시 매핑")
+
+    def handle(self, *args, **options):
+        targets = [
+            (Vendor, ('address', 'region_sido', 'region_sigungu'),
+             lambda address, sido, sigungu: (address, f"{sido} {sigungu}")),
+            (WeddingProfile, ('region_sido', 'region_sigungu'),
+             lambda sido, sigungu: (f"{sido or ''} {sigungu or ''}",)),
+        ]
+        for model, fields, texts in targets:
+            queryset = model.objects.all()
+            if not options['all']:
+                queryset = queryset.filter(sido__isnull=True)
+            updated, unresolved = self.backfill(model, queryset, fields, texts, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{model.__name__}: updated={updated} unresolved={unresolved}"
+            ))
+
+    def backfill(self, model, queryset, fields, texts, batch_size):
+        updated = unresolved = 0
+        batch = []
+        rows = queryset.order_by('pk').values_list('pk', 'sido_id', 'sigungu_id', *fields)
+        for pk, sido_id, sigungu_id, *values in rows.iterator(chunk_size=batch_size):
+            match = resolve_first(*texts(*values))
+            if not match:
+                unresolved += 1
+            if (match.sido_id, match.sigungu_id) == (sido_id, sigungu_id):
+                continue
+            batch.append(model(pk=pk, sido_id=match.sido_id, sigungu_id=match.sigungu_id))
+            if len(batch) >= batch_size:
+                model.objects.bulk_update(batch, ['sido', 'sigungu'])
+                updated += len(batch)
+                batch = []
+        model.objects.bulk_update(batch, ['sido', 'sigungu'])
+        return updated + len(batch), unresolved
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from core.images import process_field
+from vendors.models import Vendor
+from weddings.models import Post
+
+
+class Command(BaseCommand):
+    help = "업체/커뮤니티 이미지의 파생본(썸네일/카드/원본 크기 제한본, WebP + JPEG)을 만들고 image_hash 저장"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--all', action='store_true', help="이미 처리된 이미지도 다시 처리 (빠진 파생본 복구)")
+
+    def handle(self, *args, **options):
+        for model in (Vendor, Post):
+            queryset = model.objects.exclude(image='').exclude(image__isnull=True)
+            if not options['all']:
+                queryset = queryset.filter(image_hash='')
+            processed, failed = self.build(model, queryset, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"{model.__name__}: processed={processed} failed={failed}"))
+
+    def build(self, model, queryset, batch_size):
+        processed = failed = 0
+        batch = []
+        for obj in queryset.only('pk', 'image', 'image_hash').order_by('pk').iterator(chunk_size=batch_size):
+            digest = process_field(obj.image)
+            if not digest:
+                failed += 1
+                continue
+            processed += 1
+            if digest != obj.image_hash:
+                batch.append(model(pk=obj.pk, image_hash=digest))
+            if len(batch) >= batch_size:
+                model.objects.bulk_update(batch, ['image_hash'])
+                batch = []
+        model.objects.bulk_update(batch, ['image_hash'])
+        return processed, failed
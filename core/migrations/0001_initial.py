@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sido',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20, unique=True)),
+                ('full_name', models.CharField(max_length=20, unique=True)),
+                ('aliases', models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Sigungu',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20)),
+                ('aliases', models.JSONField(blank=True, default=list)),
+                ('sido', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sigungus', to='core.sido')),
+            ],
+            options={
+                'ordering': ['sido_id', 'id'],
+                'unique_together': {('sido', 'name')},
+            },
+        ),
+    ]
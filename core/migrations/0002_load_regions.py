@@ -0,0 +1,40 @@
+import json
+from pathlib import Path
+
+from django.db import migrations
+
+DATA_PATH = Path(__file__).resolve().parent.parent / 'data' / 'regions.json'
+
+
+def forwards(apps, schema_editor):
+    # Historical models only: the migration must not depend on core.regions, which can change
+    Sido = apps.get_model('core', 'Sido')
+    Sigungu = apps.get_model('core', 'Sigungu')
+    with open(DATA_PATH, encoding='utf-8') as f:
+        data = json.load(f)
+    for entry in data:
+        sido, _ = Sido.objects.update_or_create(
+            name=entry['name'],
+            defaults={'full_name': entry['full_name'], 'aliases': entry['aliases']},
+        )
+        for name in entry['sigungu']:
+            Sigungu.objects.update_or_create(
+                sido=sido,
+                name=name,
+                defaults={'aliases': entry['districts'].get(name, [])},
+            )
+
+
+def backwards(apps, schema_editor):
+    apps.get_model('core', 'Sido').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
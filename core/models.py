@@ -1,3 +1,50 @@
 from django.db import models
 
-# Create your models here.
+
+class DerivedFieldsModel(models.Model):
+    """
+    pre_save 시그널이 원본 필드로 다시 계산하는 파생 필드가 있는 모델
+    DERIVED_FIELDS = {파생 필드: {원본 필드}} - save(update_fields=[원본 필드]) 에도 파생 필드를 함께 저장합니다.
+    """
+    DERIVED_FIELDS = {}
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is not None:
+            # update_fields is a frozenset by the time pre_save runs, so the handlers can't extend it
+            update_fields = set(update_fields)
+            update_fields |= {field for field, sources in self.DERIVED_FIELDS.items() if sources & update_fields}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+
+class Sido(models.Model):
+    """
+    광역 행정구역 (시/도). core/data/regions.json 에서 적재
+    """
+    name = models.CharField(max_length=20, unique=True)  # 약칭: 서울, 경기 ...
+    full_name = models.CharField(max_length=20, unique=True)  # 서울특별시, 경기도 ...
+    aliases = models.JSONField(default=list, blank=True)  # 서울시, 강원도 등 예전/비공식 표기
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return self.name
+
+
+class Sigungu(models.Model):
+    """
+    기초 행정구역 (시/군/구). 일반구가 있는 시는 일반구 이름을 aliases 로 가짐 (예: 성남시 - 분당구)
+    """
+    sido = models.ForeignKey(Sido, on_delete=models.CASCADE, related_name='sigungus')
+    name = models.CharField(max_length=20)
+    aliases = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ['sido_id', 'id']
+        unique_together = ('sido', 'name')
+
+    def __str__(self):
+        return f"{self.sido.name} {self.name}"
@@ -0,0 +1,160 @@
+"""
+키셋(커서) 페이지네이션
+
+OFFSET/COUNT 대신 정렬 키의 마지막 값 이후(또는 첫 값 이전)만 읽습니다. 페이지가 깊어져도 비용이 같고,
+정렬 키 순서의 복합 인덱스가 있으면 인덱스 범위 스캔 + LIMIT 으로 끝납니다.
+
+- ordering 의 마지막 키는 유일해야 합니다 (보통 'pk' / '-pk').
+- 정렬 키 값은 NULL 이 아니어야 합니다 (NULL 은 비교 조건에서 빠짐).
+- 다음 페이지 여부는 per_page + 1 행을 읽어 판단하고 전체 개수는 세지 않습니다.
+"""
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # Keep microseconds: DjangoJSONEncoder rounds datetimes to milliseconds,
+        # which would put a created_at cursor before its own row
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, cls=CursorEncoder, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return values
+
+
+def cursor_query(params, **cursor):
+    """현재 GET 파라미터에서 커서만 바꾼 쿼리 문자열 (after/before 는 항상 새로 지정)"""
+    params = params.copy()
+    for key in ('after', 'before'):
+        params.pop(key, None)
+    for key, value in cursor.items():
+        if value:
+            params[key] = value
+    return params.urlencode()
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+
+class KeysetPaginator:
+    """
+    queryset 을 ordering(예: ['-avg_rating', '-pk']) 기준으로 per_page 개씩 자름
+    ordering 에는 모델 필드나 queryset 의 annotate 이름을 쓸 수 있습니다.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+
+    def _fields(self):
+        return [key.lstrip('-') for key in self.ordering]
+
+    def _values(self, obj):
+        return [getattr(obj, 'pk' if name == 'pk' else name) for name in self._fields()]
+
+    def _to_python(self, values):
+        if len(values) != len(self.ordering):
+            raise InvalidCursor(values)
+        converted = []
+        for name, value in zip(self._fields(), values):
+            try:
+                field = self.queryset.model._meta.pk if name == 'pk' else self.queryset.model._meta.get_field(name)
+                value = field.to_python(value)
+            except FieldDoesNotExist:
+                pass  # annotation: JSON value as is
+            except ValidationError:
+                raise InvalidCursor(values)
+            converted.append(value)
+        return converted
+
+    def _after(self, values, reverse=False):
+        """정렬 순서상 values 다음에 오는 행 조건 ((a > x) OR (a = x AND b > y) ...)"""
+        condition = Q()
+        for i, key in enumerate(self.ordering):
+            name = key.lstrip('-')
+            descending = key.startswith('-') != reverse
+            lookup = f"{name}__{'lt' if descending else 'gt'}"
+            equal = {self._fields()[j]: values[j] for j in range(i)}
+            condition |= Q(**equal, **{lookup: values[i]})
+        # Redundant bound on the first key so the database can seek the index instead of filtering the OR
+        first = self.ordering[0]
+        descending = first.startswith('-') != reverse
+        return Q(**{f"{first.lstrip('-')}__{'lte' if descending else 'gte'}": values[0]}) & condition
+
+    @staticmethod
+    def _reversed(ordering):
+        return [key[1:] if key.startswith('-') else f'-{key}' for key in ordering]
+
+    def page(self, after=None, before=None):
+        """
+        after 커서가 있으면 그 다음 페이지, before 커서가 있으면 그 이전 페이지, 둘 다 없으면 첫 페이지
+        잘못된 커서는 InvalidCursor
+        """
+        if before:
+            values = self._to_python(decode_cursor(before))
+            rows = list(self.queryset
+                        .filter(self._after(values, reverse=True))
+                        .order_by(*self._reversed(self.ordering))[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            next_cursor = encode_cursor(self._values(rows[-1])) if rows else before
+            previous_cursor = encode_cursor(self._values(rows[0])) if rows and has_more else None
+            return KeysetPage(rows, next_cursor, previous_cursor)
+
+        queryset = self.queryset
+        if after:
+            queryset = queryset.filter(self._after(self._to_python(decode_cursor(after))))
+        rows = list(queryset.order_by(*self.ordering)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        next_cursor = encode_cursor(self._values(rows[-1])) if rows and has_more else None
+        previous_cursor = encode_cursor(self._values(rows[0])) if rows and after else None
+        return KeysetPage(rows, next_cursor, previous_cursor)
@@ -0,0 +1,128 @@
+"""
+행정구역(시도/시군구) 정규화
+
+사용자 입력("강남구", "서울 강남", "경기도 성남시 분당구")과 제공자 주소("대한민국 서울특별시 강남구 ...")를
+core.Sido / core.Sigungu 로 매핑합니다. 기준 데이터는 core/data/regions.json (마이그레이션 core 0002 로 적재).
+
+- 시도: 약칭/정식 명칭/별칭 일치
+- 시군구: 정식 명칭, 접미사(구/시/군)를 뗀 이름(예: 강남), 일반구(예: 분당구 -> 성남시)
+- 시도 없이 시군구만 주어지면 전국에서 하나로 특정될 때만 매핑 (예: '중구' 는 시도가 있어야 함)
+"""
+import re
+import unicodedata
+
+# Only the first few tokens of an address carry the region
+MAX_REGION_TOKENS = 4
+
+
+class RegionMatch:
+    __slots__ = ('sido_id', 'sigungu_id', 'sido_name', 'sigungu_name')
+
+    def __init__(self, sido_id=None, sigungu_id=None, sido_name='', sigungu_name=''):
+        self.sido_id = sido_id
+        self.sigungu_id = sigungu_id
+        self.sido_name = sido_name
+        self.sigungu_name = sigungu_name
+
+    def __bool__(self):
+        return self.sido_id is not None
+
+    @property
+    def label(self):
+        """정규화된 지역 문자열 (예: '서울 강남구')"""
+        return ' '.join(name for name in (self.sido_name, self.sigungu_name) if name)
+
+    def __repr__(self):
+        return f"<RegionMatch {self.label or '-'}>"
+
+
+def _strip_suffix(name):
+    stem = name[:-1]
+    return stem if name[-1] in '시군구' and len(stem) >= 2 else None
+
+
+_index_cache = None
+
+
+def _index():
+    global _index_cache
+    if _index_cache is not None:
+        return _index_cache
+    from .models import Sido, Sigungu
+
+    sidos = {}
+    sido_names = {}
+    for pk, name, full_name, aliases in Sido.objects.values_list('pk', 'name', 'full_name', 'aliases'):
+        sido_names[pk] = name
+        for key in [name, full_name, *aliases]:
+            sidos[key] = pk
+
+    sigungus = {}  # token -> [(sido_id, sigungu_id, name)]
+    for pk, sido_id, name, aliases in Sigungu.objects.values_list('pk', 'sido_id', 'name', 'aliases'):
+        entry = (sido_id, pk, name)
+        for key in {name, _strip_suffix(name), *aliases} - {None}:
+            sigungus.setdefault(key, []).append(entry)
+    if sidos:  # don't pin an empty index when called before the regions are loaded
+        _index_cache = (sidos, sido_names, sigungus)
+    return sidos, sido_names, sigungus
+
+
+def reset_region_cache():
+    global _index_cache
+    _index_cache = None
+
+
+def canonical_sido(name):
+    """시도 약칭/정식 명칭/별칭 한 단어 -> 약칭 (예: '서울특별시' -> '서울'), 시도가 아니면 빈 문자열"""
+    sidos, sido_names, _ = _index()
+    pk = sidos.get(name)
+    return sido_names[pk] if pk is not None else ''
+
+
+def _tokens(text):
+    text = unicodedata.normalize('NFKC', text or '')
+    text = re.sub(r'[^0-9가-힣\s]', ' ', text)
+    return [token for token in text.split() if token != '대한민국'][:MAX_REGION_TOKENS]
+
+
+def resolve_region(text):
+    """
+    지역 문자열/주소 -> RegionMatch (시도를 특정하지 못하면 빈 RegionMatch, bool 값 False)
+    """
+    sidos, sido_names, sigungus = _index()
+    match = RegionMatch()
+    for token in _tokens(text):
+        if match.sido_id is None and token in sidos:
+            match.sido_id = sidos[token]
+            continue
+        candidates = sigungus.get(token, [])
+        if match.sido_id is not None:
+            candidates = [c for c in candidates if c[0] == match.sido_id]
+        if len(candidates) == 1:
+            match.sido_id, match.sigungu_id, match.sigungu_name = candidates[0]
+            break
+        if match.sido_id is not None and not candidates:
+            break  # past the region part of the address
+    if match.sido_id is not None:
+        match.sido_name = sido_names[match.sido_id]
+    return match
+
+
+def resolve_first(*texts):
+    """여러 후보(주소, 검색 지역 ...) 중 가장 구체적으로 매핑되는 결과"""
+    best = RegionMatch()
+    for text in texts:
+        match = resolve_region(text)
+        if match.sigungu_id is not None:
+            return match
+        if match and not best:
+            best = match
+    return best
+
+
+def assign_region(instance, *texts):
+    """instance.sido/sigungu FK 를 texts 중 가장 구체적인 매핑 결과로 설정 (매핑 실패 시 비움)"""
+    match = resolve_first(*texts)
+    instance.sido_id = match.sido_id
+    instance.sigungu_id = match.sigungu_id
+    return match
@@ -0,0 +1,31 @@
+from django import template
+from django.utils.html import format_html
+
+from core.images import VARIANTS, derived_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(obj, variant='card', alt='', css_class='', style=''):
+    """
+    {% picture vendor 'card' alt=vendor.name css_class='...' %}
+    obj.image_hash 가 있으면 WebP/JPEG 파생본 <picture>, 없으면 원본 <img> (이미지가 없으면 빈 문자열)
+    """
+    image = getattr(obj, 'image', None)
+    if not image:
+        return ''
+    digest = getattr(obj, 'image_hash', '')
+    if not digest or variant not in VARIANTS:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" style="{}" loading="lazy">', image.url, alt, css_class, style
+        )
+    return format_html(
+        '<picture style="display: contents"><source type="image/webp" srcset="{}">'
+        '<img src="{}" alt="{}" class="{}" style="{}" loading="lazy"></picture>',
+        derived_url(digest, variant, 'webp'),
+        derived_url(digest, variant, 'jpeg'),
+        alt,
+        css_class,
+        style,
+    )
@@ -1,3 +1,151 @@
-from django.test import TestCase
+import io
+import tempfile
+from datetime import datetime, timedelta, timezone
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+
+from core.images import VARIANTS, derived_path
+from core.pagination import InvalidCursor, KeysetPaginator, decode_cursor, encode_cursor
+from core.regions import canonical_sido, reset_region_cache, resolve_region
+from weddings.models import Post
+
+
+class CursorEncodingTests(SimpleTestCase):
+    def test_round_trip_keeps_microseconds(self):
+        when = datetime(2026, 5, 1, 12, 30, 45, 123456, tzinfo=timezone.utc)
+        values = decode_cursor(encode_cursor([when, 4.5, 'a b', 17]))
+        self.assertEqual(values, [when.isoformat(), 4.5, 'a b', 17])
+
+    def test_invalid_cursor(self):
+        for cursor in ['@@@', encode_cursor({'a': 1})[:-2], encode_cursor({'a': 1})]:
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor)
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = get_user_model().objects.create_user('writer', password='pw')
+        base = datetime(2026, 5, 1, 12, 0, 0, 500, tzinfo=timezone.utc)
+        posts = Post.objects.bulk_create([
+            Post(title=f'글 {i}', content='내용', author=author, view_count=i % 3) for i in range(11)
+        ])
+        # Ties on created_at (1 microsecond apart) and on view_count exercise the pk tie-breaker
+        for i, post in enumerate(posts):
+            Post.objects.filter(pk=post.pk).update(created_at=base + timedelta(microseconds=i // 2))
+
+    def walk(self, ordering, per_page):
+        paginator = KeysetPaginator(Post.objects.all(), ordering, per_page)
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(after=pages[-1].next_cursor))
+        return paginator, pages
+
+    def test_forward_walk_matches_offset_order(self):
+        for ordering in (['-created_at', '-pk'], ['view_count', 'pk'], ['-view_count', '-pk']):
+            with self.subTest(ordering=ordering):
+                _, pages = self.walk(ordering, per_page=4)
+                self.assertEqual([len(page) for page in pages], [4, 4, 3])
+                self.assertEqual(
+                    [post.pk for page in pages for post in page],
+                    list(Post.objects.order_by(*ordering).values_list('pk', flat=True)),
+                )
+                self.assertFalse(pages[0].has_previous())
+
+    def test_backward_walk_returns_the_same_pages(self):
+        paginator, pages = self.walk(['-created_at', '-pk'], per_page=4)
+        for earlier, later in zip(pages, pages[1:]):
+            previous = paginator.page(before=later.previous_cursor)
+            self.assertEqual([post.pk for post in previous], [post.pk for post in earlier])
+            self.assertEqual(previous.has_previous(), earlier.has_previous())
+            self.assertEqual(previous.next_cursor, earlier.next_cursor)
+
+    def test_invalid_cursor_values(self):
+        paginator = KeysetPaginator(Post.objects.all(), ['-created_at', '-pk'], 4)
+        for cursor in [encode_cursor([1]), encode_cursor(['not a date', 1])]:
+            with self.assertRaises(InvalidCursor):
+                paginator.page(after=cursor)
+
+
+class ImageOriginalTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = override_settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.author = get_user_model().objects.create_user('writer', password='pw')
+
+    def photo(self):
+        """GPS 좌표와 회전(Orientation=6)이 든 40x20 JPEG"""
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        exif[0x8825] = {1: 'N', 2: (37.0, 30.0, 0.0), 3: 'E', 4: (127.0, 2.0, 0.0)}
+        buffer = io.BytesIO()
+        Image.new('RGB', (40, 20), (200, 30, 30)).save(buffer, format='JPEG', exif=exif)
+        return buffer.getvalue()
+
+    def post(self, data, name='IMG_0001.jpg'):
+        return Post.objects.create(title='사진', content='내용', author=self.author,
+                                   image=SimpleUploadedFile(name, data, content_type='image/jpeg'))
+
+    def test_stored_original_has_no_metadata(self):
+        post = self.post(self.photo())
+        self.assertEqual(post.image.name, f'community_images/{post.image_hash}.jpg')
+        with default_storage.open(post.image.name) as f, Image.open(f) as stored:
+            self.assertEqual(stored.size, (20, 40))  # rotation applied to the pixels
+            self.assertEqual(dict(stored.getexif()), {})
+            self.assertNotIn('exif', stored.info)
+        for variant in VARIANTS:
+            self.assertTrue(default_storage.exists(derived_path(post.image_hash, variant, 'jpeg')))
+
+    def test_same_upload_is_stored_once(self):
+        first = self.post(self.photo())
+        second = self.post(self.photo(), name='copy.jpg')
+        self.assertEqual(second.image.name, first.image.name)
+        _, files = default_storage.listdir('community_images')
+        self.assertEqual(files, [f'{first.image_hash}.jpg'])
+
+    def test_partial_save_stores_the_hash(self):
+        post = Post.objects.create(title='사진', content='내용', author=self.author)
+        post.image = SimpleUploadedFile('IMG_0002.jpg', self.photo(), content_type='image/jpeg')
+        post.save(update_fields=['image'])
+        post.refresh_from_db()
+        self.assertTrue(post.image_hash)
+        self.assertEqual(post.image.name, f'community_images/{post.image_hash}.jpg')
+
+    def test_non_image_upload_is_kept(self):
+        with self.assertLogs('core.images', 'WARNING'):
+            post = self.post(b'not an image', name='notes.jpg')
+        self.assertEqual((post.image.name, post.image_hash), ('community_images/notes.jpg', ''))
+
+
+class RegionTests(TestCase):
+    def setUp(self):
+        reset_region_cache()
+        self.addCleanup(reset_region_cache)
+
+    def test_resolve_region_variants(self):
+        cases = {
+            '강남구': '서울 강남구',
+            '서울 강남': '서울 강남구',
+            '서울특별시 강남구': '서울 강남구',
+            '대한민국 서울특별시 강남구 테헤란로 152': '서울 강남구',
+            '경기도 성남시 분당구 판교역로 1': '경기 성남시',
+            '부산 중구': '부산 중구',
+            '전라북도': '전북',
+            '중구': '',  # several sido have one
+            '테헤란로 123': '',
+        }
+        for text, label in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(resolve_region(text).label, label)
+
+    def test_canonical_sido(self):
+        self.assertEqual([canonical_sido(name) for name in ['서울특별시', '서울시', '서울', '강원도', '제주도']],
+                         ['서울', '서울', '서울', '강원', '제주'])
+        self.assertEqual(canonical_sido('강남구'), '')
@@ -46,7 +46,13 @@ def create_data():
 
     for v_data in vendors_data:
         cat = cat_objs[v_data.pop('category')]
-        Vendor.objects.get_or_create(name=v_data['name'], defaults={**v_data, 'category': cat})
+        defaults = {
+            **v_data,
+            'category': cat,
+            'provider_rating': v_data['avg_rating'],
+            'provider_review_count': v_data['review_count'],
+        }
+        Vendor.objects.get_or_create(name=v_data['name'], defaults=defaults)
         print(f"Vendor: {v_data['name']}")
 
 if __name__ == '__main__':
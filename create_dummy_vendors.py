@@ -55,6 +55,7 @@ def create_dummy_data():
     for cat_slug, vendor_list in data:
         cat = cats_objs[cat_slug]
         for name, region, summary, rating in vendor_list:
+            review_count = random.randint(10, 100)
             v, created = Vendor.objects.get_or_create(
                 name=name,
                 defaults={
@@ -62,7 +63,9 @@ def create_dummy_data():
                     'region_sido': '서울특별시',
                     'region_sigungu': region.split()[1],
                     'avg_rating': rating,
-                    'review_count': random.randint(10, 100),
+                    'review_count': review_count,
+                    'provider_rating': rating,
+                    'provider_review_count': review_count,
                     'summary_positive': summary,
                     'summary_negative': '주말 예약이 어려움' if random.random() > 0.5 else '주차 공간 협소'
                 }
@@ -0,0 +1,156 @@
+"""
+업체 평점 집계 (RawReview 기반)
+
+- 증분 갱신: 새로 저장된 리뷰 배치마다 (업체, 출처)별 누적값과 1~5점 분포를 UPDATE 한 번,
+  업체의 rating_sum/rating_count/avg_rating/review_count/score 를 UPDATE 한 번으로 반영
+  (review_count 는 제공자 리뷰 수와 수집한 평점 수 중 큰 값, vendors.scoring.review_count_expression)
+- 전체 재계산: GROUP BY 집계로 VendorRatingBreakdown 을 다시 만들고 Vendor 를 서브쿼리 UPDATE 로 맞춤
+  (recompute_vendor_ratings 관리 명령)
+
+수집한 리뷰가 하나도 없는 업체는 제공자 평점(provider_rating/provider_review_count)을 그대로 보여줍니다.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from vendors.models import Vendor
+from vendors.scoring import review_count_expression, score_expression
+
+from .models import RawReview, VendorRatingBreakdown
+
+STAR_FIELDS = ['stars_1', 'stars_2', 'stars_3', 'stars_4', 'stars_5']
+
+
+def star_bucket(rating):
+    """평점을 1~5 정수 구간으로 (반올림)"""
+    return min(5, max(1, int(rating + 0.5)))
+
+
+def _delta_case(deltas, field, match, output_field):
+    whens = [When(then=Value(delta[field]), **match(key)) for key, delta in deltas.items() if delta[field]]
+    if not whens:
+        return Value(0, output_field=output_field)
+    return Case(*whens, default=Value(0), output_field=output_field)
+
+
+def apply_review_batch(reviews):
+    """
+    새로 저장된 RawReview 목록을 집계에 더함 (배치당 UPDATE 2회 + 누락 행 생성 1회)
+    """
+    by_source = defaultdict(lambda: dict.fromkeys(['review_count', 'rating_count', 'rating_sum'] + STAR_FIELDS, 0))
+    for review in reviews:
+        delta = by_source[(review.vendor_id, review.source)]
+        delta['review_count'] += 1
+        if review.rating is not None:
+            delta['rating_count'] += 1
+            delta['rating_sum'] += review.rating
+            delta[STAR_FIELDS[star_bucket(review.rating) - 1]] += 1
+    if not by_source:
+        return
+
+    by_vendor = defaultdict(lambda: {'rating_count': 0, 'rating_sum': 0.0})
+    for (vendor_id, _), delta in by_source.items():
+        by_vendor[vendor_id]['rating_count'] += delta['rating_count']
+        by_vendor[vendor_id]['rating_sum'] += delta['rating_sum']
+
+    def source_match(key):
+        return {'vendor_id': key[0], 'source': key[1]}
+
+    def vendor_match(key):
+        return {'pk': key}
+
+    with transaction.atomic():
+        VendorRatingBreakdown.objects.bulk_create(
+            [VendorRatingBreakdown(vendor_id=vendor_id, source=source) for vendor_id, source in by_source],
+            ignore_conflicts=True,
+        )
+
+        source_filter = Q()
+        for vendor_id, source in by_source:
+            source_filter |= Q(vendor_id=vendor_id, source=source)
+        updates = {}
+        for field in ['review_count', 'rating_count'] + STAR_FIELDS:
+            updates[field] = F(field) + _delta_case(by_source, field, source_match, IntegerField())
+        updates['rating_sum'] = F('rating_sum') + _delta_case(by_source, 'rating_sum', source_match, FloatField())
+        VendorRatingBreakdown.objects.filter(source_filter).update(**updates)
+
+        rated = {pk: delta for pk, delta in by_vendor.items() if delta['rating_count']}
+        if rated:
+            count_delta = _delta_case(rated, 'rating_count', vendor_match, IntegerField())
+            sum_delta = _delta_case(rated, 'rating_sum', vendor_match, FloatField())
+            # Right-hand sides see the pre-update row, so the new average uses old + delta
+            new_count = F('rating_count') + count_delta
+            new_average = (F('rating_sum') + sum_delta) / new_count
+            Vendor.objects.filter(pk__in=rated).update(
+                rating_sum=F('rating_sum') + sum_delta,
+                rating_count=new_count,
+                review_count=review_count_expression(new_count),
+                avg_rating=new_average,
+                score=score_expression(new_average, review_count_expression(new_count)),
+            )
+
+
+def _star_filter(star):
+    if star == 1:
+        return Q(rating__lt=1.5)
+    if star == 5:
+        return Q(rating__gte=4.5)
+    return Q(rating__gte=star - 0.5, rating__lt=star + 0.5)
+
+
+def recompute_vendor_ratings(vendor_ids=None, batch_size=1000):
+    """
+    RawReview 전체를 GROUP BY 로 다시 집계 (vendor_ids 지정 시 해당 업체만)
+    """
+    reviews = RawReview.objects.all()
+    breakdowns = VendorRatingBreakdown.objects.all()
+    vendors = Vendor.objects.all()
+    if vendor_ids is not None:
+        reviews = reviews.filter(vendor_id__in=vendor_ids)
+        breakdowns = breakdowns.filter(vendor_id__in=vendor_ids)
+        vendors = vendors.filter(pk__in=vendor_ids)
+
+    grouped = (reviews.order_by()
+               .values('vendor_id', 'source')
+               .annotate(
+                   n_reviews=Count('id'),
+                   n_rated=Count('rating'),
+                   total=Coalesce(Sum('rating'), Value(0.0)),
+                   **{f'n_{field}': Count('id', filter=_star_filter(i + 1)) for i, field in enumerate(STAR_FIELDS)}
+               ))
+
+    with transaction.atomic():
+        breakdowns.delete()
+        batch = []
+        for row in grouped.iterator(chunk_size=batch_size):
+            batch.append(VendorRatingBreakdown(
+                vendor_id=row['vendor_id'],
+                source=row['source'],
+                review_count=row['n_reviews'],
+                rating_count=row['n_rated'],
+                rating_sum=row['total'],
+                **{field: row[f'n_{field}'] for field in STAR_FIELDS},
+            ))
+            if len(batch) >= batch_size:
+                VendorRatingBreakdown.objects.bulk_create(batch)
+                batch = []
+        VendorRatingBreakdown.objects.bulk_create(batch)
+
+        per_vendor = RawReview.objects.filter(vendor_id=OuterRef('pk'), rating__isnull=False).order_by().values('vendor_id')
+        rating_sum = Subquery(per_vendor.annotate(total=Sum('rating')).values('total'), output_field=FloatField())
+        rating_count = Subquery(per_vendor.annotate(n=Count('id')).values('n'), output_field=IntegerField())
+        vendors.update(
+            rating_sum=Coalesce(rating_sum, Value(0.0)),
+            rating_count=Coalesce(rating_count, Value(0)),
+        )
+        vendors.filter(rating_count__gt=0).update(
+            avg_rating=F('rating_sum') / F('rating_count'),
+            review_count=review_count_expression(),
+        )
+        vendors.filter(rating_count=0).update(
+            avg_rating=F('provider_rating'),
+            review_count=F('provider_review_count'),
+        )
+        vendors.update(score=score_expression())
@@ -0,0 +1,134 @@
+"""
+업체 리뷰 수집 파이프라인
+
+업체를 청크 단위로 순회하며 제공자 리뷰를 스트리밍으로 읽고, 리뷰마다 내용 해시를 계산해
+(vendor, content_hash) unique 제약으로 이미 수집한 리뷰를 건너뜁니다 (동시에 넣은 리뷰는 집계에 한 번만 반영).
+쓰기는 고정 크기 bulk_create 배치로 처리하므로 업체 수와 무관하게 메모리 사용량이 일정합니다.
+배치마다 업체 평점 집계(reviews.aggregates)도 함께 갱신합니다.
+"""
+import hashlib
+import logging
+import unicodedata
+from datetime import datetime, timezone as dt_timezone
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+
+from vendors.utils import fetch_google_place_details
+
+from .aggregates import apply_review_batch
+from .models import RawReview
+
+logger = logging.getLogger(__name__)
+
+
+def review_hash(source, author_name, written_at, content):
+    text = ' '.join(unicodedata.normalize('NFKC', content or '').split())
+    raw = '\x1f'.join([source, author_name or '', written_at.isoformat() if written_at else '', text])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def build_review(vendor_id, source, author_name, content, rating=None, written_at=None):
+    author_name = (author_name or '')[:100]
+    return RawReview(
+        vendor_id=vendor_id,
+        source=source,
+        author_name=author_name,
+        content=content,
+        rating=rating,
+        written_at=written_at,
+        content_hash=review_hash(source, author_name, written_at, content),
+    )
+
+
+def google_review(vendor_id, payload):
+    content = (payload.get('text') or '').strip()
+    if not content:
+        return None
+    written_at = None
+    if payload.get('time'):
+        written_at = datetime.fromtimestamp(payload['time'], tz=dt_timezone.utc).date()
+    rating = payload.get('rating')
+    return build_review(
+        vendor_id,
+        'Google',
+        payload.get('author_name'),
+        content,
+        rating=float(rating) if rating is not None else None,
+        written_at=written_at,
+    )
+
+
+def iter_google_reviews(vendors, chunk_size=200):
+    """
+    업체 queryset 을 청크 단위로 읽으며 구글 Place Details 리뷰를 RawReview(미저장)로 하나씩 생성
+    """
+    rows = (vendors.exclude(google_place_id__isnull=True)
+            .order_by('pk')
+            .values_list('pk', 'google_place_id'))
+    for vendor_id, place_id in rows.iterator(chunk_size=chunk_size):
+        details = fetch_google_place_details(place_id)
+        for payload in (details or {}).get('reviews') or []:
+            review = google_review(vendor_id, payload)
+            if review is not None:
+                yield review
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def ingest_reviews(reviews, batch_size=500):
+    """
+    RawReview(미저장) 스트림을 batch_size 단위로 저장
+    반환값: (inserted, skipped) - skipped 는 이미 저장되어 있거나 배치 내에서 중복된 리뷰 수
+    """
+    inserted = skipped = 0
+    for batch in _batches(reviews, batch_size):
+        unique = {}
+        for review in batch:
+            unique.setdefault((review.vendor_id, review.content_hash), review)
+
+        # Both columns of the (vendor, content_hash) unique index, so the lookup is an index probe
+        existing = set(
+            RawReview.objects
+            .filter(vendor_id__in={key[0] for key in unique}, content_hash__in=[key[1] for key in unique])
+            .values_list('vendor_id', 'content_hash')
+        )
+        new_reviews = [review for key, review in unique.items() if key not in existing]
+
+        with transaction.atomic():
+            # Aggregate only the rows this call actually wrote
+            written = _insert_new(new_reviews)
+            apply_review_batch(written)
+        inserted += len(written)
+        skipped += len(batch) - len(written)
+    return inserted, skipped
+
+
+def _insert_new(reviews):
+    """
+    reviews 를 저장하고 실제로 저장된 것만 반환
+    조회 이후 다른 워커가 같은 리뷰를 먼저 넣었으면 (unique 충돌) 한 건씩 다시 넣어 그 리뷰만 뺌
+    """
+    try:
+        with transaction.atomic():
+            RawReview.objects.bulk_create(reviews)
+        return reviews
+    except IntegrityError:
+        pass
+    written = []
+    for review in reviews:
+        review.pk = None
+        try:
+            with transaction.atomic():
+                RawReview.objects.bulk_create([review])
+        except IntegrityError:
+            continue
+        written.append(review)
+    return written
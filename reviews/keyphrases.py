@@ -0,0 +1,178 @@
+"""
+리뷰 장점/단점 핵심 문구 추출 (로컬, 결정적)
+
+외부 모델 없이 사전(aspect/감성 단서) 기반으로 동작하므로 같은 입력이면 항상 같은 결과가 나옵니다.
+Django 에 의존하지 않는 순수 함수만 두어 프로세스 풀 워커에서 그대로 실행합니다.
+
+1. 리뷰를 문장으로 나누고 어절마다 조사/어미를 떼어 어간 토큰으로 정규화
+2. 문장에서 항목(음식, 주차, 직원 ...)과 감성 단서(좋다, 불친절 ...)를 찾음.
+   단서가 없으면 리뷰 평점(4점 이상 긍정, 2점 이하 부정)으로 극성을 정함
+3. 항목별로 긍정/부정 언급 리뷰 수를 세어 많이 언급된 순으로 문구를 고름
+   (어느 항목에도 걸리지 않으면 극성별로 자주 나온 토큰을 대신 사용)
+"""
+import re
+import unicodedata
+from collections import Counter
+
+# aspect label -> (keywords, positive phrase, negative phrase)
+ASPECTS = {
+    'food': (('음식', '식사', '뷔페', '밥', '요리', '메뉴', '코스', '맛'), '음식이 맛있음', '음식이 아쉬움'),
+    'staff': (('직원', '매니저', '플래너', '실장', '사장', '응대', '서비스', '상담'), '직원이 친절함', '응대가 아쉬움'),
+    'hall': (('홀', '예식장', '분위기', '인테리어', '조명', '버진로드', '신부대기실', '채플'), '홀 분위기가 좋음', '홀 시설이 아쉬움'),
+    'parking': (('주차', '주차장', '발렛'), '주차가 편리함', '주차가 불편함'),
+    'location': (('위치', '교통', '역', '접근성', '거리'), '접근성이 좋음', '찾아가기 불편함'),
+    'price': (('가격', '비용', '견적', '가성비', '금액', '추가금'), '가격이 합리적임', '추가 비용 부담'),
+    'photo': (('사진', '촬영', '원본', '보정', '앨범', '작가'), '사진 결과물이 좋음', '사진 결과물이 아쉬움'),
+    'dress': (('드레스', '피팅', '턱시도'), '드레스가 예쁨', '드레스 선택지가 아쉬움'),
+    'makeup': (('메이크업', '화장', '헤어'), '메이크업이 만족스러움', '메이크업이 아쉬움'),
+    'schedule': (('예약', '일정', '대기', '시간', '진행'), '진행이 매끄러움', '예약/진행이 번거로움'),
+}
+
+POSITIVE_CUES = (
+    '좋', '친절', '맛있', '만족', '깔끔', '추천', '예쁘', '예뻤', '이쁘', '최고', '넓', '편하', '편리', '합리',
+    '저렴', '감사', '훌륭', '완벽', '세심', '꼼꼼', '매끄', '쾌적', '고급', '화사',
+)
+NEGATIVE_CUES = (
+    '아쉽', '아쉬', '불친절', '별로', '좁', '비싸', '비쌌', '불편', '부족', '복잡', '최악', '실망', '불만',
+    '늦', '지연', '짜증', '엉망', '추가금', '강요', '더럽', '시끄', '혼잡', '오래 걸',
+    # '없' forms listed one by one: '문제없', '걱정없' are positive
+    '맛없', '맛이 없', '성의없', '성의가 없', '정신없', '볼품없', '소용없', '의미없',
+)
+NEGATIONS = ('안', '못', '않', '없')
+
+# Longest first so that '에서' is stripped before '서'
+PARTICLES = sorted((
+    '에서는', '으로는', '에게서', '이라서', '이에요', '입니다', '습니다', '했어요', '해요', '에서', '으로', '에게',
+    '까지', '부터', '처럼', '보다', '이랑', '하고', '은', '는', '이', '가', '을', '를', '에', '의', '도', '로',
+    '와', '과', '만', '요',
+), key=len, reverse=True)
+
+STOPWORDS = {
+    '너무', '정말', '진짜', '아주', '매우', '조금', '그냥', '많이', '다', '또', '더', '좀', '잘', '것', '거', '수',
+    '저희', '우리', '제가', '여기', '이번', '그리고', '하지만', '그런데', '결혼식', '웨딩', '결혼', '있', '했',
+}
+
+SENTENCE_SPLIT = re.compile(r'[.!?~\n]+|(?<=[요다])\s')
+TOKEN = re.compile(r'[0-9a-z가-힣]+')
+
+
+def normalize(text):
+    return unicodedata.normalize('NFKC', text or '').casefold()
+
+
+def strip_particle(token):
+    for particle in PARTICLES:
+        if token.endswith(particle) and len(token) - len(particle) >= 1:
+            return token[:-len(particle)]
+    return token
+
+
+def tokenize(sentence):
+    return [strip_particle(token) for token in TOKEN.findall(sentence)]
+
+
+def _match_cues(sentence, cues):
+    """
+    문장에 나온 단서 목록과 단서 자리를 가린 문장을 반환 (긴 단서부터)
+    가린 자리에서는 더 짧은 단서가 다시 걸리지 않습니다 ('불친절' 안의 '친절', '불편' 안의 '편')
+    """
+    found = []
+    for cue in sorted(cues, key=len, reverse=True):
+        if cue in sentence:
+            found.append(cue)
+            sentence = sentence.replace(cue, '#' * len(cue))
+    return found, sentence
+
+
+def sentence_polarity(sentence, rating_polarity):
+    """
+    문장 극성: 1(긍정), -1(부정), 0(판단 불가)
+    부정 단서를 먼저 찾아 가린 뒤 긍정 단서를 찾습니다.
+    """
+    negative, masked = _match_cues(sentence, NEGATIVE_CUES)
+    positive, _ = _match_cues(masked, POSITIVE_CUES)
+    score = -len(negative)
+    for cue in positive:
+        # '안 좋', '좋지 않', '친절하지 않'
+        negated = any(
+            f'{neg} {cue}' in masked or re.search(rf'{re.escape(cue)}\w{{0,2}}지\s*{neg}', masked)
+            for neg in NEGATIONS
+        )
+        score += -1 if negated else 1
+    if score:
+        return 1 if score > 0 else -1
+    return rating_polarity
+
+
+def rating_polarity(rating):
+    if rating is None:
+        return 0
+    if rating >= 4:
+        return 1
+    if rating <= 2:
+        return -1
+    return 0
+
+
+def _aspects_in(tokens):
+    found = set()
+    for label, (keywords, _, _) in ASPECTS.items():
+        if any(token.startswith(keyword) for token in tokens for keyword in keywords):
+            found.add(label)
+    return found
+
+
+def extract_key_phrases(reviews, limit=3):
+    """
+    reviews: [(content, rating)] -> (positive_phrases, negative_phrases)
+    문구는 언급 리뷰 수가 많은 순, 동률이면 항목 정의 순서로 정렬됩니다.
+    """
+    aspect_counts = {1: Counter(), -1: Counter()}
+    token_counts = {1: Counter(), -1: Counter()}
+
+    for content, rating in reviews:
+        default = rating_polarity(rating)
+        mentioned = {1: set(), -1: set()}
+        tokens_seen = {1: set(), -1: set()}
+        for sentence in SENTENCE_SPLIT.split(normalize(content)):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            polarity = sentence_polarity(sentence, default)
+            if not polarity:
+                continue
+            tokens = tokenize(sentence)
+            mentioned[polarity] |= _aspects_in(tokens)
+            tokens_seen[polarity].update(t for t in tokens if len(t) >= 2 and t not in STOPWORDS)
+        # Count each aspect/token once per review so that one long review can't dominate
+        for polarity in (1, -1):
+            aspect_counts[polarity].update(mentioned[polarity])
+            token_counts[polarity].update(tokens_seen[polarity])
+
+    order = list(ASPECTS)
+    phrases = {}
+    for polarity, index in ((1, 1), (-1, 2)):
+        ranked = sorted(aspect_counts[polarity].items(), key=lambda item: (-item[1], order.index(item[0])))
+        picked = [ASPECTS[label][index] for label, _ in ranked[:limit]]
+        if not picked:
+            # No known aspect: fall back to the most frequent distinctive tokens (seen in 2+ reviews)
+            other = token_counts[-polarity]
+            ranked_tokens = sorted(
+                ((token, count) for token, count in token_counts[polarity].items()
+                 if count >= 2 and count > other.get(token, 0)),
+                key=lambda item: (-item[1], item[0]),
+            )
+            picked = [token for token, _ in ranked_tokens[:limit]]
+        phrases[polarity] = picked
+    return phrases[1], phrases[-1]
+
+
+def summarize_chunk(chunk, limit=3):
+    """
+    프로세스 풀 작업 단위. chunk: [(vendor_id, [(content, rating)])] -> [(vendor_id, positive, negative)]
+    """
+    results = []
+    for vendor_id, reviews in chunk:
+        positive, negative = extract_key_phrases(reviews, limit=limit)
+        results.append((vendor_id, ', '.join(positive), ', '.join(negative)))
+    return results
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from reviews.ingest import ingest_reviews, iter_google_reviews
+from vendors.models import Vendor
+from vendors.quota import use_lane
+
+
+class Command(BaseCommand):
+    help = "구글 Place Details 리뷰를 RawReview 로 수집 (이미 수집한 리뷰는 건너뜀)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--category', help="특정 카테고리 slug 만 처리")
+        parser.add_argument('--batch-size', type=int, default=500, help="bulk_create 배치 크기")
+        parser.add_argument('--chunk-size', type=int, default=200, help="업체 조회 청크 크기")
+
+    def handle(self, *args, **options):
+        vendors = Vendor.objects.all()
+        if options['category']:
+            vendors = vendors.filter(category__slug=options['category'])
+
+        with use_lane('background'):
+            inserted, skipped = ingest_reviews(
+                iter_google_reviews(vendors, chunk_size=options['chunk_size']),
+                batch_size=options['batch_size'],
+            )
+        self.stdout.write(self.style.SUCCESS(f"inserted={inserted} skipped={skipped}"))
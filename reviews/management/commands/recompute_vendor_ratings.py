@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from reviews.aggregates import recompute_vendor_ratings
+from reviews.models import VendorRatingBreakdown
+
+
+class Command(BaseCommand):
+    help = "RawReview 전체를 GROUP BY 로 다시 집계하여 업체 평점/분포를 재계산"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        recompute_vendor_ratings(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {VendorRatingBreakdown.objects.count()} vendor/source rating breakdown(s)"
+        ))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from reviews.summarize import summarize_vendors
+from vendors.models import Vendor
+
+
+class Command(BaseCommand):
+    help = "새 리뷰가 들어온 업체만 장점/단점 요약(summary_positive/summary_negative)을 갱신"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--category', help="특정 카테고리 slug 만 처리")
+        parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본: CPU 코어 수, 1 이면 단일 프로세스)")
+        parser.add_argument('--chunk-size', type=int, default=100, help="워커 작업 단위 업체 수")
+        parser.add_argument('--max-reviews', type=int, default=300, help="업체당 요약에 사용할 최근 리뷰 수")
+        parser.add_argument('--full', action='store_true', help="워터마크를 초기화하고 전체 업체를 다시 요약")
+
+    def handle(self, *args, **options):
+        vendors = Vendor.objects.all()
+        if options['category']:
+            vendors = vendors.filter(category__slug=options['category'])
+        if options['full']:
+            vendors.update(summary_watermark=0)
+
+        updated = summarize_vendors(
+            vendors,
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            max_reviews=options['max_reviews'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Summarized {updated} vendor(s)"))
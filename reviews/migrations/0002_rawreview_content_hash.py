@@ -0,0 +1,51 @@
+import hashlib
+import unicodedata
+
+from django.db import migrations, models
+
+
+def fill_content_hash(apps, schema_editor):
+    """
+    기존 리뷰의 content_hash 계산 (reviews.ingest.review_hash 와 동일한 방식)
+    완전히 같은 리뷰가 여러 번 저장되어 있으면 가장 먼저 저장된 행만 남김
+    """
+    RawReview = apps.get_model('reviews', 'RawReview')
+    seen = set()
+    duplicates = []
+    for review in RawReview.objects.order_by('id').iterator():
+        text = ' '.join(unicodedata.normalize('NFKC', review.content or '').split())
+        raw = '\x1f'.join([
+            review.source,
+            review.author_name or '',
+            review.written_at.isoformat() if review.written_at else '',
+            text,
+        ])
+        review.content_hash = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+        key = (review.vendor_id, review.content_hash)
+        if key in seen:
+            duplicates.append(review.id)
+            continue
+        seen.add(key)
+        review.save(update_fields=['content_hash'])
+    RawReview.objects.filter(id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rawreview',
+            name='content_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_content_hash, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='rawreview',
+            constraint=models.UniqueConstraint(fields=('vendor', 'content_hash'), name='unique_review_per_vendor'),
+        ),
+    ]
@@ -9,6 +9,37 @@ class RawReview(models.Model):
     rating = models.FloatField(null=True, blank=True)
     written_at = models.DateField(null=True, blank=True)
     crawled_at = models.DateTimeField(auto_now_add=True)
+    content_hash = models.CharField(max_length=64)  # 중복 수집 방지용 (source, 작성자, 작성일, 본문) 해시
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['vendor', 'content_hash'], name='unique_review_per_vendor'),
+        ]
 
     def __str__(self):
         return f"{self.vendor.name} - {self.source} ({self.rating})"
+
+class VendorRatingBreakdown(models.Model):
+    """
+    업체 x 출처별 리뷰 집계 (리뷰 수, 평점 합/개수, 1~5점 분포)
+    """
+    vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, related_name='rating_breakdowns')
+    source = models.CharField(max_length=20)
+    review_count = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+    rating_sum = models.FloatField(default=0)
+    stars_1 = models.IntegerField(default=0)
+    stars_2 = models.IntegerField(default=0)
+    stars_3 = models.IntegerField(default=0)
+    stars_4 = models.IntegerField(default=0)
+    stars_5 = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('vendor', 'source')
+
+    def __str__(self):
+        return f"{self.vendor.name} - {self.source} ({self.rating_count})"
+
+    @property
+    def histogram(self):
+        return [self.stars_1, self.stars_2, self.stars_3, self.stars_4, self.stars_5]
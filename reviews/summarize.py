@@ -0,0 +1,94 @@
+"""
+업체 리뷰 요약 배치 (summary_positive / summary_negative)
+
+- 증분: Vendor.summary_watermark(마지막으로 요약에 반영한 RawReview id)보다 새 리뷰가 있는 업체만 처리
+- 병렬: 업체 청크를 순수 데이터로 만들어 프로세스 풀(reviews.keyphrases.summarize_chunk)에서 요약
+- 반영: 청크 결과를 bulk_update 로 한 번에 저장하면서 워터마크도 함께 올림
+
+요약 도중 새 리뷰가 들어오면 워터마크가 그보다 작게 남으므로 다음 실행에서 다시 처리됩니다.
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db.models import F, Max
+
+from vendors.models import Vendor
+
+from .keyphrases import summarize_chunk
+from .models import RawReview
+
+logger = logging.getLogger(__name__)
+
+
+def stale_vendor_ids(queryset=None):
+    """요약 이후 새 리뷰가 들어온 업체 id (오름차순)"""
+    queryset = Vendor.objects.all() if queryset is None else queryset
+    return list(queryset
+                .annotate(latest_review_id=Max('reviews__id'))
+                .filter(latest_review_id__gt=F('summary_watermark'))
+                .order_by('pk')
+                .values_list('pk', flat=True))
+
+
+def _load_chunk(vendor_ids, max_reviews):
+    """
+    업체별 최근 리뷰 max_reviews 건을 (vendor_id, [(content, rating)]) 로, 워터마크와 함께 반환
+    """
+    reviews = {pk: [] for pk in vendor_ids}
+    watermarks = dict.fromkeys(vendor_ids, 0)
+    rows = (RawReview.objects
+            .filter(vendor_id__in=vendor_ids)
+            .order_by('vendor_id', '-id')
+            .values_list('vendor_id', 'id', 'content', 'rating'))
+    for vendor_id, review_id, content, rating in rows.iterator(chunk_size=2000):
+        watermarks[vendor_id] = max(watermarks[vendor_id], review_id)
+        if len(reviews[vendor_id]) < max_reviews:
+            reviews[vendor_id].append((content, rating))
+    return list(reviews.items()), watermarks
+
+
+def _save_chunk(results, watermarks):
+    vendors = []
+    for vendor_id, positive, negative in results:
+        vendors.append(Vendor(
+            pk=vendor_id,
+            summary_positive=positive,
+            summary_negative=negative,
+            summary_watermark=watermarks[vendor_id],
+        ))
+    Vendor.objects.bulk_update(vendors, ['summary_positive', 'summary_negative', 'summary_watermark'])
+    return len(vendors)
+
+
+def summarize_vendors(queryset=None, workers=None, chunk_size=100, max_reviews=300, limit=3):
+    """
+    새 리뷰가 있는 업체의 장점/단점 요약을 갱신하고 처리한 업체 수를 반환
+    workers=1 이면 프로세스 풀 없이 현재 프로세스에서 실행합니다.
+    """
+    vendor_ids = stale_vendor_ids(queryset)
+    if not vendor_ids:
+        return 0
+    chunks = [vendor_ids[i:i + chunk_size] for i in range(0, len(vendor_ids), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+
+    updated = 0
+    if workers == 1 or len(chunks) == 1:
+        for ids in chunks:
+            data, watermarks = _load_chunk(ids, max_reviews)
+            updated += _save_chunk(summarize_chunk(data, limit), watermarks)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            # Keep at most `workers` chunks in flight so memory stays bounded by chunk size
+            pending = []
+            for ids in chunks:
+                data, watermarks = _load_chunk(ids, max_reviews)
+                pending.append((executor.submit(summarize_chunk, data, limit), watermarks))
+                if len(pending) >= workers:
+                    future, watermarks = pending.pop(0)
+                    updated += _save_chunk(future.result(), watermarks)
+            for future, watermarks in pending:
+                updated += _save_chunk(future.result(), watermarks)
+
+    logger.info("Summarized reviews for %d vendor(s)", updated)
+    return updated
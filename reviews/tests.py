@@ -1,3 +1,111 @@
-from django.test import TestCase
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from reviews.aggregates import recompute_vendor_ratings
+from reviews.ingest import build_review, ingest_reviews
+from reviews.keyphrases import extract_key_phrases, normalize, sentence_polarity
+from reviews.models import RawReview, VendorRatingBreakdown
+from vendors.models import Vendor, VendorCategory
+
+
+class SentencePolarityTests(SimpleTestCase):
+    def polarity(self, sentence, default=0):
+        return sentence_polarity(normalize(sentence), default)
+
+    def test_negative_cue_masks_contained_positive_cue(self):
+        # '불친절' contains '친절', '불편' contains '편'
+        self.assertEqual(self.polarity('직원이 불친절해요', default=1), -1)
+        self.assertEqual(self.polarity('주차가 불편해요', default=1), -1)
+
+    def test_eopda_negatives(self):
+        self.assertEqual(self.polarity('음식이 맛없어요', default=1), -1)
+        self.assertEqual(self.polarity('음식이 맛이 없어요', default=1), -1)
+
+    def test_positive_eopda_is_not_negative(self):
+        self.assertEqual(self.polarity('문제없이 진행이 매끄러웠어요'), 1)
+
+    def test_negated_positive(self):
+        self.assertEqual(self.polarity('안 좋아요'), -1)
+        self.assertEqual(self.polarity('좋지 않아요'), -1)
+        self.assertEqual(self.polarity('친절하지 않아요'), -1)
+
+    def test_no_cue_falls_back_to_rating(self):
+        self.assertEqual(self.polarity('주차장은 지하에 있어요', default=1), 1)
+        self.assertEqual(self.polarity('주차장은 지하에 있어요', default=-1), -1)
+
+
+class ExtractKeyPhrasesTests(SimpleTestCase):
+    def test_negative_sentences_in_five_star_reviews(self):
+        positive, negative = extract_key_phrases([
+            ('직원이 불친절해요', 5),
+            ('음식이 맛없어요', 5),
+        ])
+        self.assertNotIn('직원이 친절함', positive)
+        self.assertNotIn('음식이 맛있음', positive)
+        self.assertIn('응대가 아쉬움', negative)
+        self.assertIn('음식이 아쉬움', negative)
+
+    def test_positive_phrases(self):
+        positive, negative = extract_key_phrases([
+            ('직원이 친절해요. 음식도 맛있어요', 5),
+            ('직원분들이 정말 친절했어요', 4),
+        ])
+        self.assertEqual(positive[0], '직원이 친절함')
+        self.assertIn('음식이 맛있음', positive)
+        self.assertEqual(negative, [])
+
+    def test_deterministic(self):
+        reviews = [('홀이 예쁘고 주차가 편리해요', 5), ('추가금이 많아요', 2), ('사진 작가님이 꼼꼼해요', 5)]
+        self.assertEqual(extract_key_phrases(reviews), extract_key_phrases(list(reviews)))
+
+
+class IngestReviewsTests(TestCase):
+    def setUp(self):
+        category = VendorCategory.objects.create(name='웨딩홀', slug='hall')
+        self.vendor = Vendor.objects.create(
+            name='더채플', category=category, region_sido='서울', region_sigungu='강남구',
+            provider_rating=4.7, provider_review_count=900,
+        )
+
+    def reviews(self):
+        return [
+            build_review(self.vendor.pk, 'Google', '김신부', '홀이 예뻐요', rating=5, written_at=date(2026, 5, 1)),
+            build_review(self.vendor.pk, 'Google', '박신랑', '주차가 불편해요', rating=3, written_at=date(2026, 5, 2)),
+        ]
+
+    def test_reingest_is_idempotent(self):
+        self.assertEqual(ingest_reviews(self.reviews()), (2, 0))
+        self.assertEqual(ingest_reviews(self.reviews()), (0, 2))
+        self.vendor.refresh_from_db()
+        self.assertEqual(RawReview.objects.count(), 2)
+        self.assertEqual((self.vendor.rating_count, self.vendor.rating_sum), (2, 8.0))
+
+    def test_duplicate_within_batch_counted_once(self):
+        reviews = self.reviews()
+        self.assertEqual(ingest_reviews(reviews + [reviews[0]]), (2, 1))
+
+    def test_review_inserted_by_another_worker_is_not_aggregated(self):
+        # The other worker's row lands after our existence lookup
+        first, second = self.reviews()
+        RawReview.objects.bulk_create([build_review(
+            self.vendor.pk, 'Google', '김신부', '홀이 예뻐요', rating=5, written_at=date(2026, 5, 1),
+        )])
+        with mock.patch('reviews.ingest.RawReview.objects.filter', return_value=RawReview.objects.none()):
+            self.assertEqual(ingest_reviews([first, second]), (1, 1))
+        self.vendor.refresh_from_db()
+        breakdown = VendorRatingBreakdown.objects.get(vendor=self.vendor, source='Google')
+        self.assertEqual((self.vendor.rating_count, self.vendor.rating_sum), (1, 3.0))
+        self.assertEqual((breakdown.review_count, breakdown.stars_3, breakdown.stars_5), (1, 1, 0))
+
+    def test_provider_review_count_kept(self):
+        ingest_reviews(self.reviews())
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.review_count, 900)
+        self.assertEqual(self.vendor.avg_rating, 4.0)
+        self.assertGreater(self.vendor.score, 3.95)
+
+        recompute_vendor_ratings()
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.review_count, 900)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Vendor, VendorCategory, UserVendorSelection
+from .models import Vendor, VendorCategory, UserVendorSelection, VendorSearchRefresh, ApiQuotaUsage, VendorRecommendation
 
 @admin.register(VendorCategory)
 class VendorCategoryAdmin(admin.ModelAdmin):
@@ -10,7 +10,7 @@ class VendorCategoryAdmin(admin.ModelAdmin):
 class VendorAdmin(admin.ModelAdmin):
     list_display = ('name', 'category', 'region_sido', 'rating_display')
     search_fields = ('name', 'address')
-    list_filter = ('category', 'region_sido')
+    list_filter = ('category', 'sido')
 
     def rating_display(self, obj):
         return f"{obj.avg_rating} ({obj.review_count})"
@@ -20,3 +20,20 @@ class VendorAdmin(admin.ModelAdmin):
 class UserVendorSelectionAdmin(admin.ModelAdmin):
     list_display = ('profile', 'vendor', 'status', 'created_at')
     list_filter = ('status',)
+
+@admin.register(VendorSearchRefresh)
+class VendorSearchRefreshAdmin(admin.ModelAdmin):
+    list_display = ('category', 'region', 'status', 'requested_at', 'refreshed_at', 'fresh_until')
+    list_filter = ('status', 'category')
+    search_fields = ('region',)
+
+@admin.register(ApiQuotaUsage)
+class ApiQuotaUsageAdmin(admin.ModelAdmin):
+    list_display = ('date', 'provider', 'interactive', 'background', 'denied')
+    list_filter = ('provider',)
+
+@admin.register(VendorRecommendation)
+class VendorRecommendationAdmin(admin.ModelAdmin):
+    list_display = ('segment', 'rank', 'vendor', 'score')
+    search_fields = ('segment',)
+    list_select_related = ('vendor',)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class VendorsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vendors'
+
+    def ready(self):
+        import vendors.signals
+        import vendors.search  # registers the full-text index with core.fts
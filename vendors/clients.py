@@ -0,0 +1,247 @@
+"""
+외부 업체 검색 API(네이버/구글) 공용 HTTP 클라이언트
+
+- 스레드별 requests.Session 을 재사용하여 keep-alive 커넥션을 유지합니다.
+- 엔드포인트별 (connect, read) 타임아웃을 적용합니다.
+- 일시적 오류(네트워크, 429, 5xx)는 지터가 섞인 지수 백오프로 제한된 횟수만큼 재시도합니다.
+- 제공자별 서킷 브레이커가 연속 실패 시 일정 시간 동안 호출을 즉시 차단합니다.
+- 실제 호출 전마다 제공자별 호출량 한도(quota)를 확인합니다.
+"""
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+from .payload_cache import get_payload_cache, payload_key
+
+logger = logging.getLogger(__name__)
+
+# endpoint name -> (provider, path)
+ENDPOINTS = {
+    'naver_local': ('naver', '/v1/search/local.json'),
+    'google_textsearch': ('google', '/maps/api/place/textsearch/json'),
+    'google_details': ('google', '/maps/api/place/details/json'),
+}
+
+# endpoint name -> (connect timeout, read timeout) in seconds
+DEFAULT_TIMEOUTS = {
+    'naver_local': (3.05, 5),
+    'google_textsearch': (3.05, 8),
+    'google_details': (3.05, 8),
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Google reports quota/server problems as HTTP 200 with an error "status" in the body
+GOOGLE_RETRY_STATUSES = {'OVER_QUERY_LIMIT', 'UNKNOWN_ERROR'}
+GOOGLE_ERROR_STATUSES = {'REQUEST_DENIED', 'INVALID_REQUEST'}
+
+
+class ProviderError(Exception):
+    """외부 API 호출 실패 (재시도 소진 포함)"""
+
+    def __init__(self, provider, message):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+
+
+class ProviderUnavailable(ProviderError):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+class ReplayMiss(ProviderError):
+    """replay 모드에서 기록된 응답이 없음"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수가 임계값을 넘으면 reset_timeout 동안 open 상태가 되고,
+    이후 한 번의 시험 호출(half-open)이 성공하면 다시 닫힙니다.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Let exactly one probe through
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def release(self):
+        """시험 호출을 하지 못하고 끝난 경우(호출량 한도 등) 다음 호출이 다시 시험하도록 되돌림"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                # opened_at is unchanged, so the next allow() probes right away
+                self.state = self.OPEN
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning("Circuit opened after %s consecutive failures", self.failures)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class ProviderClient:
+    """
+    단일 제공자(naver/google)에 대한 HTTP 클라이언트
+    """
+
+    def __init__(self, provider, base_url, max_retries=2, backoff_base=0.3,
+                 backoff_max=4.0, pool_size=10, breaker=None):
+        self.provider = provider
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.breaker = breaker or CircuitBreaker()
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def _backoff(self, attempt, retry_after=None):
+        # Full jitter: uniform(0, base * 2^attempt), capped
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def get_json(self, endpoint, params=None, headers=None):
+        """
+        GET 요청 후 JSON 본문을 반환. 실패 시 ProviderError 발생
+        원본 응답 캐시(payload_cache)에 있으면 네트워크 호출 없이 반환합니다.
+        """
+        provider, path = ENDPOINTS[endpoint]
+        timeout = getattr(settings, 'VENDOR_API_TIMEOUTS', {}).get(endpoint, DEFAULT_TIMEOUTS[endpoint])
+
+        payloads = get_payload_cache()
+        cached = payloads.get(endpoint, params)
+        if cached is not None:
+            return cached
+        if payloads.replay_only:
+            raise ReplayMiss(provider, f"no recorded payload for {endpoint} ({payload_key(endpoint, params)[:12]})")
+
+        from .quota import QuotaExceeded, acquire
+
+        if not self.breaker.allow():
+            raise ProviderUnavailable(provider, "circuit open")
+
+        url = f"{self.base_url}{path}"
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                # Every attempt spends provider quota; QuotaExceeded propagates without tripping the breaker
+                try:
+                    acquire(provider)
+                except QuotaExceeded:
+                    self.breaker.release()
+                    raise
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+                if response.status_code in RETRY_STATUSES:
+                    retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+                    last_error = f"HTTP {response.status_code}"
+                else:
+                    response.raise_for_status()
+                    data = response.json()
+                    body_status = data.get('status') if provider == 'google' else None
+                    if body_status in GOOGLE_ERROR_STATUSES:
+                        # Key/request problem, not an outage: close a half-open probe before raising
+                        self.breaker.record_success()
+                        raise ProviderError(provider, f"{endpoint} returned {body_status}")
+                    if body_status in GOOGLE_RETRY_STATUSES:
+                        last_error = body_status
+                        if attempt < self.max_retries:
+                            time.sleep(self._backoff(attempt))
+                        continue
+                    self.breaker.record_success()
+                    payloads.put(endpoint, params, data)
+                    return data
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                last_error = str(e)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # Non-retryable (4xx, malformed JSON): the provider answered, so this resolves a
+                # half-open probe as a success instead of counting against the breaker
+                self.breaker.record_success()
+                raise ProviderError(provider, str(e)) from e
+
+            if attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, retry_after))
+
+        self.breaker.record_failure()
+        raise ProviderError(provider, f"{endpoint} failed after {self.max_retries + 1} attempts: {last_error}")
+
+
+def _parse_retry_after(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(provider):
+    """
+    제공자별 프로세스 공용 클라이언트 (커넥션 풀/서킷 브레이커 공유)
+    """
+    client = _clients.get(provider)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(provider)
+            if client is None:
+                base_urls = {
+                    'naver': settings.NAVER_API_BASE_URL,
+                    'google': settings.GOOGLE_PLACES_BASE_URL,
+                }
+                client = ProviderClient(
+                    provider,
+                    base_urls[provider],
+                    max_retries=getattr(settings, 'VENDOR_API_MAX_RETRIES', 2),
+                    breaker=CircuitBreaker(
+                        failure_threshold=getattr(settings, 'VENDOR_API_CIRCUIT_FAILURES', 5),
+                        reset_timeout=getattr(settings, 'VENDOR_API_CIRCUIT_RESET', 30.0),
+                    ),
+                )
+                _clients[provider] = client
+    return client
+
+
+def reset_clients():
+    """설정 변경 후(예: 스텁 서버 URL 적용) 클라이언트를 다시 만들도록 초기화"""
+    with _clients_lock:
+        _clients.clear()
@@ -0,0 +1,108 @@
+"""
+업체 검색 제공자 동시 호출 (fan-out)
+
+등록된 제공자(네이버, 구글 ...)를 제한된 스레드 풀에서 동시에 호출하고,
+전체 마감 시간(deadline) 안에 도착한 결과만 모아 반환합니다.
+느린 제공자 하나 때문에 페이지 응답이 마감 시간을 넘기지 않습니다.
+"""
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .clients import ProviderError
+from .utils import search_naver_local, search_google_places
+
+logger = logging.getLogger(__name__)
+
+# provider name -> callable(query) returning a list of raw results.
+# Callables must raise ProviderError on failure so that errors are not mistaken for empty results.
+PROVIDERS = {
+    'naver': lambda query: search_naver_local(query, strict=True),
+    'google': lambda query: search_google_places(query, strict=True),
+}
+
+
+class FanOutResult:
+    def __init__(self):
+        self.results = {}    # provider -> list of raw results
+        self.errors = {}     # provider -> error message
+        self.timed_out = []  # providers that missed the deadline
+        self.elapsed = 0.0
+
+    @property
+    def complete(self):
+        return not self.errors and not self.timed_out
+
+    def __repr__(self):
+        counts = {name: len(items) for name, items in self.results.items()}
+        return f"<FanOutResult results={counts} errors={list(self.errors)} timed_out={self.timed_out}>"
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'VENDOR_FANOUT_WORKERS', 8),
+                    thread_name_prefix='vendor-fanout',
+                )
+    return _executor
+
+
+def _call_provider(fn, query):
+    try:
+        return fn(query)
+    finally:
+        # Pool threads outlive requests: don't keep the quota limiter's DB connection open
+        close_old_connections()
+
+
+def fan_out(query, providers=None, deadline=None):
+    """
+    query 로 모든 제공자를 동시에 검색. deadline(초) 이 지나면 기다리지 않고
+    그때까지 받은 결과만 반환합니다 (부분 결과 병합).
+    """
+    providers = providers or PROVIDERS
+    if deadline is None:
+        deadline = getattr(settings, 'VENDOR_FANOUT_DEADLINE', 4.0)
+
+    outcome = FanOutResult()
+    started = time.monotonic()
+    executor = _get_executor()
+    # copy_context() carries the caller's quota lane (see vendors.quota.use_lane) into the pool threads
+    futures = {
+        executor.submit(contextvars.copy_context().run, _call_provider, fn, query): name
+        for name, fn in providers.items()
+    }
+
+    done, not_done = wait(futures, timeout=deadline)
+
+    for future in done:
+        name = futures[future]
+        try:
+            outcome.results[name] = future.result() or []
+        except ProviderError as e:
+            outcome.errors[name] = str(e)
+        except Exception as e:
+            logger.exception("Vendor provider %s raised unexpectedly", name)
+            outcome.errors[name] = str(e)
+
+    for future in not_done:
+        # Still queued tasks are dropped; running ones finish in the background and are ignored
+        future.cancel()
+        outcome.timed_out.append(futures[future])
+
+    outcome.elapsed = time.monotonic() - started
+    if not outcome.complete:
+        logger.warning("Vendor fan-out for %r incomplete: %r (%.2fs)", query, outcome, outcome.elapsed)
+    return outcome
@@ -0,0 +1,121 @@
+"""
+업체 위치 검색 (geohash 셀 + haversine)
+
+1. 반경을 덮을 수 있는 가장 작은 geohash 셀 크기를 골라 중심 셀과 이웃 8개 셀을 구함
+2. 셀마다 (category, geohash) 인덱스 범위 조건(geohash >= 접두어 AND < 접두어+'{')으로 후보만 읽음
+3. 후보에 haversine 거리를 계산해 반경 밖을 버리고 거리순 정렬 (DB 에서 처리하므로 페이지 단위로 LIMIT)
+"""
+import math
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9  # ~4.8m x 4.8m, stored on Vendor.geohash
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+# Korean coordinates only: anything else is a parsing error (or KATECH coordinates from old Naver APIs)
+LAT_RANGE = (32.0, 39.5)
+LNG_RANGE = (123.0, 132.5)
+
+
+def valid_korean_coordinates(lat, lng):
+    return lat is not None and lng is not None and (
+        LAT_RANGE[0] <= lat <= LAT_RANGE[1] and LNG_RANGE[0] <= lng <= LNG_RANGE[1]
+    )
+
+
+def encode(lat, lng, precision=GEOHASH_PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bit = value = 0
+    even = True
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(BASE32[value])
+            bit = value = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """geohash 셀 한 칸의 (위도, 경도) 크기 (도 단위)"""
+    bits = precision * 5
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def precision_for_radius(lat, radius_km):
+    """중심 셀 + 이웃 8셀이 반경을 모두 덮는 가장 긴 geohash 길이"""
+    dlat = radius_km / KM_PER_DEGREE
+    dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    precision = 1
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        cell_lat, cell_lng = cell_size(candidate)
+        if cell_lat < dlat or cell_lng < dlng:
+            break
+        precision = candidate
+    return precision
+
+
+def covering_cells(lat, lng, radius_km):
+    """반경 radius_km 원을 덮는 geohash 셀 목록 (중심 셀과 이웃 셀, 중복 제거)"""
+    precision = precision_for_radius(lat, radius_km)
+    cell_lat, cell_lng = cell_size(precision)
+    cells = []
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            cell = encode(
+                max(-90.0, min(90.0, lat + dy * cell_lat)),
+                (lng + dx * cell_lng + 180.0) % 360.0 - 180.0,
+                precision,
+            )
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def distance_expression(lat, lng):
+    """Vendor.latitude/longitude 와 (lat, lng) 사이 haversine 거리(km) ORM 식"""
+    dlat = Radians(F('latitude') - Value(lat))
+    dlng = Radians(F('longitude') - Value(lng))
+    a = (Power(Sin(dlat / 2), 2)
+         + Cos(Radians(Value(lat))) * Cos(Radians(F('latitude'))) * Power(Sin(dlng / 2), 2))
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Least(Value(1.0), Sqrt(a)), output_field=FloatField())
+
+
+def vendors_near(queryset, lat, lng, radius_km):
+    """
+    queryset 중 (lat, lng) 에서 radius_km 이내 업체를 distance_km 주석과 함께 가까운 순으로 반환
+    """
+    cells = Q()
+    for cell in covering_cells(lat, lng, radius_km):
+        cells |= Q(geohash__gte=cell, geohash__lt=cell + '{')  # '{' sorts right after 'z'
+
+    # Bounding box trims the corners of the cells before the exact distance is computed
+    dlat = radius_km / KM_PER_DEGREE
+    dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    return (queryset
+            .filter(cells)
+            .filter(latitude__range=(lat - dlat, lat + dlat), longitude__range=(lng - dlng, lng + dlng))
+            .annotate(distance_km=distance_expression(lat, lng))
+            .filter(distance_km__lte=radius_km)
+            .order_by('distance_km', 'pk'))
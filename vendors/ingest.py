@@ -0,0 +1,192 @@
+"""
+제공자 검색 결과 -> Vendor 일괄 upsert
+
+검색 결과 묶음을 정규화한 뒤, 기존 행 조회 1회 + bulk_create(update_conflicts=True) 1회로
+반영합니다 (결과 건수와 무관하게 쿼리 수 고정). 제공자 평점은 provider_rating/provider_review_count 에
+저장하고, 수집한 리뷰가 없는 업체만 avg_rating/review_count 에 반영합니다.
+백그라운드 갱신(refresh)과 오프라인 임포트(import_vendors 명령)가 함께 사용합니다.
+"""
+from django.db.models import F
+
+from core.regions import resolve_first
+
+from . import geo
+from .geo import valid_korean_coordinates
+from .models import Vendor
+from .scoring import bayesian_score, review_count_expression, score_expression
+from .utils import clean_naver_title, naver_place_key
+
+# provider -> (conflict key field, fields refreshed when the row already exists)
+UPSERT_SPECS = {
+    # avg_rating/review_count follow our own RawReview aggregates once a vendor has any (see below)
+    'google': ('google_place_id', ['name', 'address', 'latitude', 'longitude', 'geohash',
+                                   'provider_rating', 'provider_review_count']),
+    # Naver ids are derived from name+address, and merged rows (see vendors.matching) keep the
+    # Google name/address: existing Naver rows are left untouched
+    'naver': ('naver_place_id', []),
+}
+
+
+class IngestStats:
+    def __init__(self, inserted=0, updated=0, unchanged=0):
+        self.inserted = inserted
+        self.updated = updated
+        self.unchanged = unchanged
+
+    def __add__(self, other):
+        return IngestStats(
+            self.inserted + other.inserted,
+            self.updated + other.updated,
+            self.unchanged + other.unchanged,
+        )
+
+    def __repr__(self):
+        return f"<IngestStats inserted={self.inserted} updated={self.updated} unchanged={self.unchanged}>"
+
+
+def split_region(region):
+    parts = (region or '').split()
+    return (parts[0] if parts else '', parts[1] if len(parts) > 1 else '')
+
+
+def region_fields(address, region):
+    """
+    신규 행의 지역: 업체 주소로 행정구역을 찾고, 실패하면 검색 조건(region)을 사용
+    (bulk_create 는 pre_save 시그널을 타지 않으므로 FK 도 여기서 설정)
+    """
+    match = resolve_first(address, region)
+    if match:
+        return {
+            'region_sido': match.sido_name,
+            'region_sigungu': match.sigungu_name,
+            'sido_id': match.sido_id,
+            'sigungu_id': match.sigungu_id,
+        }
+    region_sido, region_sigungu = split_region(region)
+    return {'region_sido': region_sido, 'region_sigungu': region_sigungu}
+
+
+def coordinate_fields(lat, lng):
+    if not valid_korean_coordinates(lat, lng):
+        return {'latitude': None, 'longitude': None, 'geohash': ''}
+    return {'latitude': lat, 'longitude': lng, 'geohash': geo.encode(lat, lng)}
+
+
+def normalize_google_result(result):
+    place_id = result.get('place_id')
+    if not place_id:
+        return None
+    location = (result.get('geometry') or {}).get('location') or {}
+    return {
+        'google_place_id': place_id,
+        'name': (result.get('name') or '')[:100],
+        'address': (result.get('formatted_address') or '')[:200],
+        **coordinate_fields(location.get('lat'), location.get('lng')),
+        'provider_rating': float(result.get('rating') or 0),
+        'provider_review_count': int(result.get('user_ratings_total') or 0),
+    }
+
+
+def naver_coordinates(item):
+    # mapx/mapy are WGS84 degrees scaled by 1e7, as strings (e.g. "1270286733", "375701934")
+    try:
+        return int(item['mapy']) / 1e7, int(item['mapx']) / 1e7
+    except (KeyError, TypeError, ValueError):
+        return None, None
+
+
+def normalize_naver_item(item):
+    name = clean_naver_title(item.get('title'))
+    if not name:
+        return None
+    return {
+        'naver_place_id': naver_place_key(item),
+        'name': name[:100],
+        'address': (item.get('roadAddress') or item.get('address') or '')[:200],
+        **coordinate_fields(*naver_coordinates(item)),
+    }
+
+
+NORMALIZERS = {
+    'google': normalize_google_result,
+    'naver': normalize_naver_item,
+}
+
+
+def upsert_vendors(provider, raw_results, category, region, batch_size=500):
+    """
+    한 제공자의 원본 결과 목록을 Vendor 테이블에 upsert 하고 IngestStats 를 반환
+    신규 행의 카테고리는 검색 조건(category)을, 지역은 주소(없으면 검색 조건 region)를 따릅니다.
+    """
+    key_field, update_fields = UPSERT_SPECS[provider]
+    normalize = NORMALIZERS[provider]
+
+    rows = {}
+    for raw in raw_results:
+        row = normalize(raw)
+        if row:
+            rows[row[key_field]] = row  # last one wins on duplicate keys within a batch
+    if not rows:
+        return IngestStats()
+
+    existing = {
+        values[0]: values[1:]
+        for values in Vendor.objects.filter(**{f'{key_field}__in': list(rows)})
+        .values_list(key_field, *update_fields)
+    }
+
+    stats = IngestStats()
+    to_write = []
+    for key, row in rows.items():
+        current = existing.get(key)
+        if current is None:
+            stats.inserted += 1
+        elif tuple(current) != tuple(row[f] for f in update_fields):
+            stats.updated += 1
+        else:
+            stats.unchanged += 1
+            continue
+        to_write.append(Vendor(
+            category=category,
+            avg_rating=row.get('provider_rating', 0),
+            review_count=row.get('provider_review_count', 0),
+            score=bayesian_score(row.get('provider_rating', 0), row.get('provider_review_count', 0)),
+            **region_fields(row['address'], region),
+            **row,
+        ))
+
+    if to_write and update_fields:
+        Vendor.objects.bulk_create(
+            to_write,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=[key_field],
+            update_fields=update_fields,
+        )
+    elif to_write:
+        Vendor.objects.bulk_create(to_write, batch_size=batch_size, ignore_conflicts=True)
+
+    if stats.updated and 'provider_rating' in update_fields:
+        # Vendors without collected reviews keep showing the provider's figures
+        Vendor.objects.filter(**{f'{key_field}__in': list(rows)}, rating_count=0).update(
+            avg_rating=F('provider_rating'),
+            review_count=F('provider_review_count'),
+            score=score_expression(F('provider_rating'), F('provider_review_count')),
+        )
+        # The others keep their own average but count the provider's total
+        Vendor.objects.filter(**{f'{key_field}__in': list(rows)}, rating_count__gt=0).update(
+            review_count=review_count_expression(),
+            score=score_expression(F('avg_rating'), review_count_expression()),
+        )
+    return stats
+
+
+def ingest_provider_results(category, region, results_by_provider):
+    """
+    {'google': [...], 'naver': [...]} 형태의 제공자별 결과를 모두 반영
+    """
+    stats = IngestStats()
+    for provider, raw_results in results_by_provider.items():
+        if provider in UPSERT_SPECS:
+            stats += upsert_vendors(provider, raw_results, category, region)
+    return stats
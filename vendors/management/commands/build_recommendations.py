@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from vendors.recommendations import TOP_K, build_recommendations
+
+
+class Command(BaseCommand):
+    help = "세그먼트(시도 | 스타일 | 예산대)별 추천 업체 목록을 다시 계산 (주기적으로 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=TOP_K, help="세그먼트당 저장할 업체 수")
+
+    def handle(self, *args, **options):
+        segments, rows = build_recommendations(top_k=options['top_k'])
+        self.stdout.write(self.style.SUCCESS(f"Built {rows} recommendation(s) for {segments} segment(s)"))
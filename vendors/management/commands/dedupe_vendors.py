@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from vendors.matching import resolve_duplicates
+from vendors.models import Vendor
+
+
+class Command(BaseCommand):
+    help = "네이버/구글로 따로 저장된 동일 업체를 찾아 하나로 병합"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--category', help="특정 카테고리 slug 만 처리")
+        parser.add_argument('--threshold', type=float, default=0.75, help="병합 기준 점수 (0~1)")
+        parser.add_argument('--batch-size', type=int, default=500, help="트랜잭션당 병합 쌍 수")
+        parser.add_argument('--dry-run', action='store_true', help="병합하지 않고 후보만 출력")
+
+    def handle(self, *args, **options):
+        queryset = Vendor.objects.all()
+        if options['category']:
+            queryset = queryset.filter(category__slug=options['category'])
+            if not queryset.exists():
+                raise CommandError(f"No vendors in category: {options['category']}")
+
+        names = dict(queryset.values_list('id', 'name')) if options['dry_run'] else {}
+        pairs = resolve_duplicates(
+            queryset,
+            threshold=options['threshold'],
+            dry_run=options['dry_run'],
+            batch_size=options['batch_size'],
+        )
+
+        if options['dry_run']:
+            for score, a, b in pairs:
+                self.stdout.write(f"{score:.2f}  #{a} {names.get(a)}  <->  #{b} {names.get(b)}")
+        verb = "Would merge" if options['dry_run'] else "Merged"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(pairs)} vendor pair(s)"))
@@ -0,0 +1,31 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from vendors.ingest import ingest_provider_results
+from vendors.models import VendorCategory
+
+
+class Command(BaseCommand):
+    help = "저장해 둔 제공자 검색 결과(JSON)를 Vendor 테이블에 일괄 upsert"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='{"google": [...], "naver": [...]} 형식의 JSON 파일')
+        parser.add_argument('--category', required=True, help="VendorCategory slug")
+        parser.add_argument('--region', required=True, help='예: "서울 강남구"')
+
+    def handle(self, *args, **options):
+        try:
+            category = VendorCategory.objects.get(slug=options['category'])
+        except VendorCategory.DoesNotExist:
+            raise CommandError(f"Unknown category: {options['category']}")
+
+        with open(options['path'], encoding='utf-8') as f:
+            payload = json.load(f)
+        if not isinstance(payload, dict):
+            raise CommandError("Expected a JSON object keyed by provider name")
+
+        stats = ingest_provider_results(category, options['region'], payload)
+        self.stdout.write(self.style.SUCCESS(
+            f"inserted={stats.inserted} updated={stats.updated} unchanged={stats.unchanged}"
+        ))
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from vendors.refresh import claim_next, run_refresh
+
+
+class Command(BaseCommand):
+    help = "업체 검색 갱신 큐(VendorSearchRefresh) 처리 워커"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="대기 중인 요청을 모두 처리하면 종료")
+        parser.add_argument('--sleep', type=float, default=2.0, help="큐가 비었을 때 대기 시간(초)")
+        parser.add_argument('--max-jobs', type=int, default=0, help="처리할 최대 요청 수 (0 = 무제한)")
+
+    def handle(self, *args, **options):
+        processed = 0
+        while True:
+            state = claim_next()
+            if state is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            outcome = run_refresh(state)
+            processed += 1
+            self.stdout.write(f"Refreshed {state.category.slug} / {state.region}: {outcome!r}")
+
+            if options['max_jobs'] and processed >= options['max_jobs']:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} refresh request(s)"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from vendors.payload_cache import get_payload_cache
+
+
+class Command(BaseCommand):
+    help = "제공자 원본 응답 캐시에서 만료/용량 초과 항목 정리"
+
+    def handle(self, *args, **options):
+        payloads = get_payload_cache()
+        removed, remaining = payloads.evict()
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} entr{'y' if removed == 1 else 'ies'} from {payloads.root} "
+            f"({remaining / 1024 / 1024:.1f} MB remaining, mode={payloads.mode})"
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from vendors.search import VENDOR_INDEX
+
+
+class Command(BaseCommand):
+    help = "업체 전문 검색 인덱스(vendors_vendor_fts)를 전체 다시 색인"
+
+    def handle(self, *args, **options):
+        if not VENDOR_INDEX.exists():
+            raise CommandError("검색 인덱스가 없습니다 (SQLite FTS5 trigram 미지원 환경에서는 icontains 검색을 사용합니다)")
+        VENDOR_INDEX.rebuild()
+        self.stdout.write(self.style.SUCCESS("Rebuilt vendor search index"))
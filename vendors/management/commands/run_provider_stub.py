@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from vendors.stub_server import StubProviderServer
+
+
+class Command(BaseCommand):
+    help = "네이버/구글 API 스텁 서버 실행 (NAVER_API_BASE_URL, GOOGLE_PLACES_BASE_URL 에 주소 지정)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--delay', type=float, default=0.0, help="응답 지연(초)")
+        parser.add_argument('--fail-rate', type=float, default=0.0, help="503 응답 비율 (0~1)")
+        parser.add_argument('--status', type=int, default=None, help="항상 이 상태 코드로 응답")
+
+    def handle(self, *args, **options):
+        server = StubProviderServer(
+            host=options['host'],
+            port=options['port'],
+            delay=options['delay'],
+            fail_rate=options['fail_rate'],
+            status=options['status'],
+            verbose=True,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Provider stub listening on {server.url}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
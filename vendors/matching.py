@@ -0,0 +1,289 @@
+"""
+제공자 간 업체 동일성 판별 (entity resolution)
+
+네이버 결과(naver_place_id)와 구글 결과(google_place_id)로 따로 저장된 같은 업체를
+하나의 Vendor 로 합칩니다.
+
+1. 정규화: 업체명(법인 표기/지점 접미사/업종 단어 제거), 주소(국가명/층수 제거, 시도 표기는 core.regions 약칭으로)
+2. 블로킹: (카테고리, 시도) 블록 안에서 업체명 바이그램 역색인으로 후보 쌍만 생성 → 거의 선형
+3. 점수: 업체명 바이그램 Dice 유사도 + 주소 토큰 유사도 가중합
+4. 병합: 구글 행을 남기고 네이버 ID/빈 필드를 옮긴 뒤, 연관 행(선택/리뷰 등)을 옮기고 삭제
+"""
+import logging
+import re
+import unicodedata
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+
+from core.regions import canonical_sido
+
+from .models import Vendor, UserVendorSelection
+
+logger = logging.getLogger(__name__)
+
+NAME_NOISE = re.compile(r'\(주\)|㈜|주식회사|\(유\)|유한회사')
+NAME_SUFFIXES = ('본점', '직영점', '점')
+NAME_GENERIC_WORDS = (
+    '웨딩홀', '웨딩컨벤션', '컨벤션', '웨딩', '예식장', '스튜디오', '드레스', '메이크업', '한복',
+    'weddinghall', 'wedding', 'convention', 'studio', 'hall',
+)
+ADDRESS_NOISE = re.compile(r'\([^)]*\)|지하\s*\d+층|\d+\s*층|\bb\d+\b|\d+\s*호')
+
+# Bigrams shared by more than this many vendors in one block carry no signal
+MAX_POSTING = 50
+
+
+def _nfkc(text):
+    return unicodedata.normalize('NFKC', text or '').casefold()
+
+
+def normalize_sido(text):
+    text = _nfkc(text).strip()
+    if not text:
+        return ''
+    first = text.split()[0]
+    return canonical_sido(first) or first
+
+
+def normalize_name(name):
+    text = NAME_NOISE.sub(' ', _nfkc(name))
+    text = re.sub(r'[^0-9a-z가-힣]', '', text)
+    for word in NAME_GENERIC_WORDS:
+        stripped = text.replace(word, '')
+        if len(stripped) >= 2:  # never strip a name down to nothing
+            text = stripped
+    for suffix in NAME_SUFFIXES:
+        if text.endswith(suffix) and len(text) - len(suffix) >= 2:
+            text = text[:-len(suffix)]
+            break
+    return text
+
+
+def normalize_address(address):
+    text = ADDRESS_NOISE.sub(' ', _nfkc(address))
+    text = text.replace('대한민국', ' ')
+    text = re.sub(r'[^0-9a-z가-힣\s-]', ' ', text)
+    tokens = [canonical_sido(token) or token for token in text.split()]
+    return tokens
+
+
+def bigrams(text):
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def dice(a, b):
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def address_similarity(a_tokens, b_tokens):
+    if not a_tokens or not b_tokens:
+        return None
+    a, b = set(a_tokens), set(b_tokens)
+    score = len(a & b) / len(a | b)
+    # Road name + building number agreeing is close to conclusive
+    a_numbers = {t for t in a if t[0].isdigit()}
+    if a_numbers and a_numbers & b and any(t.endswith(('로', '길')) for t in a & b):
+        score = max(score, 0.9)
+    return score
+
+
+def pair_score(a, b):
+    """
+    a, b: _Candidate. 주소가 한쪽이라도 없으면 업체명만으로 판단(더 엄격한 임계값 적용은 호출 측)
+    """
+    name_score = dice(a.name_grams, b.name_grams)
+    if a.name and a.name == b.name:
+        name_score = 1.0
+    addr_score = address_similarity(a.address, b.address)
+    if addr_score is None:
+        return name_score, False
+    return 0.6 * name_score + 0.4 * addr_score, True
+
+
+class _Candidate:
+    __slots__ = ('id', 'name', 'name_grams', 'address', 'naver_place_id', 'google_place_id')
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.name = normalize_name(row['name'])
+        self.name_grams = bigrams(self.name)
+        self.address = normalize_address(row['address'])
+        self.naver_place_id = row['naver_place_id']
+        self.google_place_id = row['google_place_id']
+
+    def complements(self, other):
+        """제공자 ID가 서로 겹치지 않아야(네이버 전용 + 구글 전용) 병합 대상"""
+        return (
+            not (self.naver_place_id and other.naver_place_id)
+            and not (self.google_place_id and other.google_place_id)
+        )
+
+
+def find_matches(rows, threshold=0.75, name_only_threshold=0.95):
+    """
+    한 블록의 업체 목록(dict rows)에서 동일 업체 쌍을 찾아 [(score, id_a, id_b)] 로 반환
+    각 업체는 최대 한 쌍에만 포함됩니다 (점수 높은 순으로 탐욕 선택).
+    """
+    candidates = [_Candidate(row) for row in rows]
+    index = defaultdict(list)
+    for i, candidate in enumerate(candidates):
+        for gram in candidate.name_grams:
+            index[gram].append(i)
+
+    scored = []
+    seen = set()
+    for i, candidate in enumerate(candidates):
+        for gram in candidate.name_grams:
+            posting = index[gram]
+            if len(posting) > MAX_POSTING:
+                continue
+            for j in posting:
+                if j <= i or (i, j) in seen:
+                    continue
+                seen.add((i, j))
+                other = candidates[j]
+                if not candidate.complements(other):
+                    continue
+                score, with_address = pair_score(candidate, other)
+                if score >= (threshold if with_address else name_only_threshold):
+                    scored.append((score, candidate.id, other.id))
+
+    scored.sort(reverse=True)
+    used = set()
+    matches = []
+    for score, a, b in scored:
+        if a in used or b in used:
+            continue
+        used.update((a, b))
+        matches.append((score, a, b))
+    return matches
+
+
+def _repoint_relations(loser, winner):
+    """
+    loser 를 가리키는 모든 FK 행을 winner 로 옮김 (unique 충돌 행은 삭제)
+    """
+    # Selections: keep the stronger status when both vendors were picked by the same profile
+    for selection in UserVendorSelection.objects.filter(vendor=loser):
+        existing = UserVendorSelection.objects.filter(profile=selection.profile, vendor=winner).first()
+        if existing is None:
+            selection.vendor = winner
+            selection.save(update_fields=['vendor'])
+            continue
+        if selection.status == 'final' and existing.status != 'final':
+            existing.status = 'final'
+            existing.save(update_fields=['status'])
+        selection.delete()
+
+    for rel in Vendor._meta.related_objects:
+        if not rel.one_to_many or rel.related_model is UserVendorSelection:
+            continue
+        field = rel.field.name
+        qs = rel.related_model._default_manager.filter(**{field: loser})
+        try:
+            with transaction.atomic():
+                qs.update(**{field: winner})
+        except IntegrityError:
+            for obj in qs:
+                try:
+                    with transaction.atomic():
+                        setattr(obj, field, winner)
+                        obj.save(update_fields=[field])
+                except IntegrityError:
+                    obj.delete()
+
+
+def merge_vendors(winner, loser):
+    """
+    loser 의 정보를 winner 에 합치고 loser 를 삭제
+    """
+    with transaction.atomic():
+        naver_place_id = winner.naver_place_id or loser.naver_place_id
+        google_place_id = winner.google_place_id or loser.google_place_id
+        for field in ('address', 'image', 'summary_positive', 'summary_negative',
+                      'region_sido', 'region_sigungu', 'sido_id', 'sigungu_id'):
+            if not getattr(winner, field) and getattr(loser, field):
+                setattr(winner, field, getattr(loser, field))
+        if winner.latitude is None and loser.latitude is not None:
+            winner.latitude, winner.longitude, winner.geohash = loser.latitude, loser.longitude, loser.geohash
+        if loser.provider_review_count > winner.provider_review_count:
+            winner.provider_rating = loser.provider_rating
+            winner.provider_review_count = loser.provider_review_count
+
+        _repoint_relations(loser, winner)
+        loser.delete()  # frees the unique provider id before it is copied over
+
+        winner.naver_place_id = naver_place_id
+        winner.google_place_id = google_place_id
+        winner.summary_watermark = 0  # reviews moved over may be older than the winner's watermark
+        winner.save()
+
+        # Reviews moved over from the loser: rebuild the winner's rating aggregates
+        from reviews.aggregates import recompute_vendor_ratings
+        recompute_vendor_ratings([winner.pk])
+        winner.refresh_from_db()
+    return winner
+
+
+def _pick_winner(a, b):
+    # Prefer the Google row (ratings), then the older row
+    if bool(a.google_place_id) != bool(b.google_place_id):
+        return (a, b) if a.google_place_id else (b, a)
+    return (a, b) if a.pk < b.pk else (b, a)
+
+
+def block_key(vendor_row):
+    sido = normalize_sido(vendor_row['region_sido']) or normalize_sido(
+        ' '.join(normalize_address(vendor_row['address'])[:1])
+    )
+    return vendor_row['category_id'], sido
+
+
+def resolve_duplicates(queryset=None, threshold=0.75, dry_run=False, batch_size=500):
+    """
+    queryset(기본: 전체 Vendor)을 (카테고리, 시도) 블록으로 나누어 동일 업체를 병합
+    카테고리 단위로 읽어 들이므로 메모리 사용량은 가장 큰 카테고리 크기에 비례합니다.
+    반환값: 병합(또는 dry_run 시 병합 예정) 쌍 목록 [(score, vendor_id_a, vendor_id_b)]
+    """
+    queryset = Vendor.objects.all() if queryset is None else queryset
+    fields = ('id', 'name', 'address', 'category_id', 'region_sido', 'naver_place_id', 'google_place_id')
+
+    results = []
+    pending = []
+
+    def flush():
+        if dry_run or not pending:
+            pending.clear()
+            return
+        with transaction.atomic():
+            vendors = Vendor.objects.in_bulk([pk for _, a, b in pending for pk in (a, b)])
+            for score, a, b in pending:
+                if a not in vendors or b not in vendors:
+                    continue
+                winner, loser = _pick_winner(vendors[a], vendors[b])
+                merge_vendors(winner, loser)
+        pending.clear()
+
+    category_ids = queryset.order_by().values_list('category_id', flat=True).distinct()
+    for category_id in list(category_ids):
+        blocks = defaultdict(list)
+        rows = queryset.filter(category_id=category_id).values(*fields)
+        for row in rows.iterator(chunk_size=2000):
+            blocks[block_key(row)].append(row)
+
+        for rows in blocks.values():
+            for score, a, b in find_matches(rows, threshold=threshold):
+                pending.append((score, a, b))
+                results.append((score, a, b))
+                if len(pending) >= batch_size:
+                    flush()
+    flush()
+
+    if results:
+        logger.info("Vendor entity resolution %s %d pair(s)", "found" if dry_run else "merged", len(results))
+    return results
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0002_alter_vendorcategory_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorSearchRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('idle', '대기 없음'), ('pending', '갱신 대기'), ('running', '갱신 중')], default='idle', max_length=20)),
+                ('requested_at', models.DateTimeField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+                ('fresh_until', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_refreshes', to='vendors.vendorcategory')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'requested_at'], name='vendors_ven_status_ef40b4_idx')],
+                'unique_together': {('category', 'region')},
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+
+
+def blanks_to_null(apps, schema_editor):
+    """
+    빈 문자열 ID를 NULL 로 바꾸고, 중복된 ID는 가장 먼저 생성된 행에만 남김
+    (unique 제약 추가 전 정리)
+    """
+    Vendor = apps.get_model('vendors', 'Vendor')
+    for field in ('naver_place_id', 'google_place_id'):
+        Vendor.objects.filter(**{field: ''}).update(**{field: None})
+        seen = set()
+        duplicates = []
+        rows = (Vendor.objects.exclude(**{f'{field}__isnull': True})
+                .order_by('id').values_list('id', field))
+        for pk, value in rows.iterator():
+            if value in seen:
+                duplicates.append(pk)
+            else:
+                seen.add(value)
+        if duplicates:
+            Vendor.objects.filter(pk__in=duplicates).update(**{field: None})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0003_vendorsearchrefresh'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vendor',
+            name='google_place_id',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='vendor',
+            name='naver_place_id',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.RunPython(blanks_to_null, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='vendor',
+            name='google_place_id',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='vendor',
+            name='naver_place_id',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+    ]
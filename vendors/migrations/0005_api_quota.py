@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0004_vendor_provider_ids_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiRateBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=20, unique=True)),
+                ('tokens', models.FloatField(default=0)),
+                ('updated_at', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ApiQuotaUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=20)),
+                ('date', models.DateField()),
+                ('interactive', models.IntegerField(default=0)),
+                ('background', models.IntegerField(default=0)),
+                ('denied', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date', 'provider'],
+                'unique_together': {('provider', 'date')},
+            },
+        ),
+    ]
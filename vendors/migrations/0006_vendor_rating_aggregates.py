@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:50
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_provider_ratings(apps, schema_editor):
+    # Until now avg_rating/review_count held the provider's figures
+    Vendor = apps.get_model('vendors', 'Vendor')
+    Vendor.objects.update(provider_rating=F('avg_rating'), provider_review_count=F('review_count'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0005_api_quota'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='provider_rating',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='provider_review_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='rating_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='rating_sum',
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(copy_provider_ratings, migrations.RunPython.noop),
+    ]
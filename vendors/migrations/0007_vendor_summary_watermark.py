@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0006_vendor_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='summary_watermark',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations, OperationalError
+
+# The SQL this migration runs lives here, not in core.fts, so later changes there can't alter it.
+# Only the FTS table is created: the vendors_vendor triggers and the initial indexing are installed
+# after every migrate (core.fts.install_index_triggers), because SQLite table remakes in later
+# migrations drop triggers on vendors_vendor and the category trigger blocks their RENAME.
+TABLE = 'vendors_vendor_fts'
+COLUMNS = 'name, category, region, address, summary_positive, summary_negative'
+# Name hits matter most, review summaries least
+RANK = 'bm25(10.0, 5.0, 3.0, 2.0, 1.0, 1.0)'
+TRIGGERS = [f'{TABLE}_ai', f'{TABLE}_ad', f'{TABLE}_au', f'{TABLE}_rel0']
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return  # search falls back to icontains
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(f"CREATE VIRTUAL TABLE {TABLE} USING fts5({COLUMNS}, tokenize='trigram')")
+        except OperationalError:
+            return  # SQLite built without FTS5 / the trigram tokenizer
+        cursor.execute(f"INSERT INTO {TABLE}({TABLE}, rank) VALUES ('rank', '{RANK}')")
+
+
+def drop_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0007_vendor_summary_watermark'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
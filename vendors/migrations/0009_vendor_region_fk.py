@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_load_regions'),
+        ('vendors', '0008_vendor_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='sido',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='vendors', to='core.sido'),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='sigungu',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='vendors', to='core.sigungu'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['category', 'sido'], name='vendors_ven_categor_332924_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['category', 'sigungu'], name='vendors_ven_categor_cbba87_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_load_regions'),
+        ('vendors', '0009_vendor_region_fk'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='geohash',
+            field=models.CharField(blank=True, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['category', 'geohash'], name='vendors_ven_categor_2fdf67_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['geohash'], name='vendors_ven_geohash_c9f028_idx'),
+        ),
+    ]
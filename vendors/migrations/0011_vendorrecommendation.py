@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0010_vendor_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('segment', models.CharField(max_length=50)),
+                ('score', models.FloatField()),
+                ('rank', models.IntegerField()),
+                ('vendor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='vendors.vendor')),
+            ],
+            options={
+                'ordering': ['segment', 'rank'],
+                'indexes': [models.Index(fields=['segment', 'rank'], name='vendors_ven_segment_4eed13_idx')],
+                'unique_together': {('segment', 'vendor')},
+            },
+        ),
+    ]
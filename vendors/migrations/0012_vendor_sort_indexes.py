@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_load_regions'),
+        ('vendors', '0011_vendorrecommendation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['category', 'avg_rating', 'id'], name='vendors_ven_categor_3ba21e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['avg_rating', 'id'], name='vendors_ven_avg_rat_76fd69_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['category', 'review_count', 'id'], name='vendors_ven_categor_077942_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['review_count', 'id'], name='vendors_ven_review__529eb6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['category', 'name', 'id'], name='vendors_ven_categor_b00247_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['name', 'id'], name='vendors_ven_name_827847_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:06
+
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+
+# Frozen copy of vendors.scoring as of this migration (the live module may change)
+PRIOR_MEAN = 3.5
+PRIOR_REVIEWS = 10
+
+
+def compute_scores(apps, schema_editor):
+    Vendor = apps.get_model('vendors', 'Vendor')
+    Vendor.objects.update(score=ExpressionWrapper(
+        (Value(PRIOR_REVIEWS * PRIOR_MEAN) + F('avg_rating') * F('review_count'))
+        / (Value(float(PRIOR_REVIEWS)) + F('review_count')),
+        output_field=FloatField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_load_regions'),
+        ('vendors', '0012_vendor_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vendor',
+            name='vendors_ven_categor_3ba21e_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='vendor',
+            name='vendors_ven_avg_rat_76fd69_idx',
+        ),
+        migrations.AddField(
+            model_name='vendor',
+            name='score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(compute_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['category', 'score', 'id'], name='vendors_ven_categor_70dbbb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['score', 'id'], name='vendors_ven_score_155613_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['sido', 'score', 'id'], name='vendors_ven_sido_id_3ea7ae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['sigungu', 'score', 'id'], name='vendors_ven_sigungu_59464f_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0013_vendor_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='image_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
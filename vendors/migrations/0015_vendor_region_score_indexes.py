@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_load_regions'),
+        ('vendors', '0014_vendor_image_hash'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vendor',
+            name='vendors_ven_categor_332924_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='vendor',
+            name='vendors_ven_categor_cbba87_idx',
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['category', 'sido', 'score', 'id'], name='vendors_ven_categor_5e9422_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['category', 'sigungu', 'score', 'id'], name='vendors_ven_categor_25de77_idx'),
+        ),
+    ]
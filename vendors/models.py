@@ -1,4 +1,5 @@
 from django.db import models
+from core.models import DerivedFieldsModel, Sido, Sigungu
 from weddings.models import WeddingProfile
 
 class VendorCategory(models.Model):
@@ -11,19 +12,66 @@ class VendorCategory(models.Model):
     class Meta:
         verbose_name_plural = "Vendor Categories"
 
-class Vendor(models.Model):
+class Vendor(DerivedFieldsModel):
     name = models.CharField(max_length=100)
     category = models.ForeignKey(VendorCategory, on_delete=models.CASCADE, related_name='vendors')
     region_sido = models.CharField(max_length=50)
     region_sigungu = models.CharField(max_length=50)
+    # 정규화된 행정구역 (core.regions.resolve_region 으로 주소/지역 문자열에서 매핑, 지역 필터는 이 FK 로 조회)
+    sido = models.ForeignKey(Sido, on_delete=models.SET_NULL, null=True, blank=True, related_name='vendors')
+    sigungu = models.ForeignKey(Sigungu, on_delete=models.SET_NULL, null=True, blank=True, related_name='vendors')
     address = models.CharField(max_length=200, blank=True)
+    # 좌표 (WGS84) 와 geohash (vendors.geo, 위치 검색 인덱스)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True)
     image = models.ImageField(upload_to='vendors/', blank=True, null=True)
-    naver_place_id = models.CharField(max_length=100, blank=True)
-    google_place_id = models.CharField(max_length=100, blank=True)
+    # 원본 이미지 sha256 (core.images 파생본 경로 키, 비어 있으면 원본을 그대로 사용)
+    image_hash = models.CharField(max_length=64, blank=True)
+    # 제공자별 고유 ID (없으면 NULL, upsert 충돌 키로 사용)
+    naver_place_id = models.CharField(max_length=100, blank=True, null=True, unique=True)
+    google_place_id = models.CharField(max_length=100, blank=True, null=True, unique=True)
     avg_rating = models.FloatField(default=0)
     review_count = models.IntegerField(default=0)
+    # 제공자(구글)가 알려준 평점/리뷰 수. 수집한 리뷰(RawReview)가 없을 때 avg_rating/review_count 로 사용
+    provider_rating = models.FloatField(default=0)
+    provider_review_count = models.IntegerField(default=0)
+    # 수집한 리뷰 평점의 누적 합/개수 (reviews.aggregates 가 증분 갱신)
+    rating_sum = models.FloatField(default=0)
+    rating_count = models.IntegerField(default=0)
+    # 리뷰 수를 반영한 베이즈 평균 평점 (vendors.scoring, '평점순' 정렬 키)
+    score = models.FloatField(default=0)
     summary_positive = models.TextField(blank=True)
     summary_negative = models.TextField(blank=True)
+    # 요약에 마지막으로 반영한 RawReview id (reviews.summarize 가 이보다 새 리뷰가 있는 업체만 다시 요약)
+    summary_watermark = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['category', 'geohash']),
+            models.Index(fields=['geohash']),
+            # Keyset pagination sort keys (vendors.views.VENDOR_SORTS), per category and across categories
+            models.Index(fields=['category', 'score', 'id']),
+            models.Index(fields=['score', 'id']),
+            models.Index(fields=['sido', 'score', 'id']),
+            models.Index(fields=['sigungu', 'score', 'id']),
+            # Category + region filter sorted by rating (the default list view); also serve the plain filter
+            models.Index(fields=['category', 'sido', 'score', 'id']),
+            models.Index(fields=['category', 'sigungu', 'score', 'id']),
+            models.Index(fields=['category', 'review_count', 'id']),
+            models.Index(fields=['review_count', 'id']),
+            models.Index(fields=['category', 'name', 'id']),
+            models.Index(fields=['name', 'id']),
+        ]
+
+    # vendors.signals 가 저장 시 다시 계산하는 필드 (core.models.DerivedFieldsModel)
+    DERIVED_FIELDS = {
+        'sido': {'address', 'region_sido', 'region_sigungu'},
+        'sigungu': {'address', 'region_sido', 'region_sigungu'},
+        'geohash': {'latitude', 'longitude'},
+        'score': {'avg_rating', 'review_count'},
+        'image_hash': {'image'},
+    }
 
     def __str__(self):
         return self.name
@@ -43,3 +91,77 @@ class UserVendorSelection(models.Model):
 
     def __str__(self):
         return f"{self.profile.user.username} - {self.vendor.name} ({self.get_status_display()})"
+
+class VendorSearchRefresh(models.Model):
+    """
+    (카테고리, 지역) 검색 결과의 백그라운드 갱신 상태 겸 작업 큐
+    """
+    STATUS_CHOICES = [
+        ('idle', '대기 없음'),
+        ('pending', '갱신 대기'),
+        ('running', '갱신 중'),
+    ]
+    category = models.ForeignKey(VendorCategory, on_delete=models.CASCADE, related_name='search_refreshes')
+    region = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='idle')
+    requested_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    fresh_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        unique_together = ('category', 'region')
+        indexes = [
+            models.Index(fields=['status', 'requested_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.category.slug} / {self.region} ({self.get_status_display()})"
+
+class ApiRateBucket(models.Model):
+    """
+    제공자별 토큰 버킷 상태 (여러 워커 프로세스가 DB로 공유)
+    """
+    provider = models.CharField(max_length=20, unique=True)
+    tokens = models.FloatField(default=0)
+    updated_at = models.FloatField(default=0)  # epoch seconds of the last refill
+
+    def __str__(self):
+        return f"{self.provider}: {self.tokens:.1f} tokens"
+
+class ApiQuotaUsage(models.Model):
+    """
+    제공자별 일일 API 사용량 카운터 (레인별 허용 건수 + 거절 건수)
+    """
+    provider = models.CharField(max_length=20)
+    date = models.DateField()
+    interactive = models.IntegerField(default=0)
+    background = models.IntegerField(default=0)
+    denied = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('provider', 'date')
+        ordering = ['-date', 'provider']
+
+    def __str__(self):
+        return f"{self.provider} {self.date}: {self.interactive + self.background} calls"
+
+class VendorRecommendation(models.Model):
+    """
+    세그먼트(시도 | 스타일 | 예산대)별 추천 업체 상위 목록 (vendors.recommendations 배치가 통째로 교체)
+    """
+    segment = models.CharField(max_length=50)
+    vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, related_name='recommendations')
+    score = models.FloatField()
+    rank = models.IntegerField()
+
+    class Meta:
+        unique_together = ('segment', 'vendor')
+        indexes = [
+            models.Index(fields=['segment', 'rank']),
+        ]
+        ordering = ['segment', 'rank']
+
+    def __str__(self):
+        return f"{self.segment} #{self.rank} {self.vendor.name}"
@@ -0,0 +1,176 @@
+"""
+제공자 API 원본 응답(JSON) 영속 캐시 (record / replay)
+
+- 키: 엔드포인트 + 파라미터(API 키 제외, 검색어 query 만 정규화)의 SHA-256 → 워커/재시작과 무관하게 동일 검색은 API 호출 없이 응답
+- TTL 이 지난 항목은 무시하고, 전체 크기가 상한을 넘으면 가장 오래 사용하지 않은 파일부터 삭제(LRU)
+- 모드
+    off    : 캐시 사용 안 함
+    record : 캐시 우선 조회, 없으면 실제 호출 후 저장 (기본값)
+    replay : 캐시만 사용 (TTL 무시), 없으면 ReplayMiss → 개발/벤치마크/테스트를 완전히 오프라인으로 실행
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'record', 'replay')
+
+# Params that never take part in the cache key (credentials)
+SECRET_PARAMS = {'key'}
+
+# Free-text params: spacing/width/case variants of a search are the same search.
+# Everything else (place_id, display, language ...) is kept exactly, since ids are case-sensitive.
+TEXT_PARAMS = {'query'}
+
+
+def _normalize_text(value):
+    text = unicodedata.normalize('NFKC', str(value))
+    return ' '.join(text.split()).casefold()
+
+
+def payload_key(endpoint, params):
+    normalized = sorted(
+        (name, _normalize_text(value) if name in TEXT_PARAMS else str(value))
+        for name, value in (params or {}).items()
+        if name not in SECRET_PARAMS
+    )
+    raw = json.dumps([endpoint, normalized], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class PayloadCache:
+    def __init__(self, root, mode='record', ttl=60 * 60 * 24, max_bytes=200 * 1024 * 1024, evict_every=50):
+        if mode not in MODES:
+            raise ValueError(f"Unknown payload cache mode: {mode}")
+        self.root = str(root)
+        self.mode = mode
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.mode != 'off'
+
+    @property
+    def replay_only(self):
+        return self.mode == 'replay'
+
+    def _path(self, endpoint, key):
+        return os.path.join(self.root, endpoint, key[:2], f"{key}.json")
+
+    def get(self, endpoint, params):
+        if not self.enabled:
+            return None
+        path = self._path(endpoint, payload_key(endpoint, params))
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Unreadable provider payload cache entry %s: %s", path, e)
+            return None
+
+        if not self.replay_only and time.time() - entry.get('stored_at', 0) > self.ttl:
+            return None
+        try:
+            os.utime(path)  # mtime doubles as the LRU clock
+        except OSError:
+            pass
+        return entry.get('payload')
+
+    def put(self, endpoint, params, payload):
+        if self.mode != 'record':
+            return
+        key = payload_key(endpoint, params)
+        path = self._path(endpoint, key)
+        entry = {
+            'endpoint': endpoint,
+            'params': {k: v for k, v in (params or {}).items() if k not in SECRET_PARAMS},
+            'stored_at': time.time(),
+            'payload': payload,
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file then rename, so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """
+        만료 항목 삭제 후, 전체 크기가 max_bytes 이하가 될 때까지 오래 사용하지 않은 항목부터 삭제
+        반환값: (삭제 건수, 남은 바이트)
+        """
+        now = time.time()
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        removed = 0
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for mtime, size, path in entries:
+            expired = self.mode != 'replay' and now - mtime > self.ttl
+            if not expired and total <= self.max_bytes:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            removed += 1
+            total -= size
+        return removed, total
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_payload_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = getattr(settings, 'VENDOR_PAYLOAD_CACHE', {})
+                _cache = PayloadCache(
+                    root=config.get('DIR', os.path.join(settings.BASE_DIR, 'var', 'provider_payloads')),
+                    mode=config.get('MODE', 'record'),
+                    ttl=config.get('TTL', 60 * 60 * 24),
+                    max_bytes=config.get('MAX_BYTES', 200 * 1024 * 1024),
+                )
+    return _cache
+
+
+def reset_payload_cache():
+    global _cache
+    with _cache_lock:
+        _cache = None
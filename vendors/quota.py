@@ -0,0 +1,129 @@
+"""
+제공자 API 호출량 제한 (프로세스 간 공유 토큰 버킷 + 일일 한도)
+
+- 초당 호출량: ApiRateBucket 행 하나를 조건부 UPDATE 한 번으로 리필+차감 (DB 종류와 무관하게 원자적)
+- 일일 한도: ApiQuotaUsage 카운터를 조건부 UPDATE 로 증가
+- 우선순위 레인
+    interactive : 사용자가 기다리는 요청. 토큰이 부족하면 잠시(MAX_WAIT) 기다렸다가 재시도
+    background  : 백그라운드 갱신. 버킷의 일부(BACKGROUND_RESERVE)와 일일 한도의 일부를
+                  (1 - BACKGROUND_DAILY_SHARE) interactive 몫으로 남겨두고, 부족하면 기다리지 않고 즉시 거절
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Least
+from django.db.models.lookups import GreaterThanOrEqual, LessThan
+from django.utils import timezone
+
+from .clients import ProviderError
+from .models import ApiRateBucket, ApiQuotaUsage
+
+LANES = ('interactive', 'background')
+
+_current_lane = contextvars.ContextVar('vendor_api_lane', default='interactive')
+
+
+@contextmanager
+def use_lane(lane):
+    """이 블록 안의 제공자 호출을 지정한 레인으로 처리"""
+    if lane not in LANES:
+        raise ValueError(f"Unknown quota lane: {lane}")
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+def current_lane():
+    return _current_lane.get()
+
+
+class QuotaExceeded(ProviderError):
+    def __init__(self, provider, lane, reason):
+        super().__init__(provider, f"quota exceeded ({lane}): {reason}")
+        self.lane = lane
+        self.reason = reason
+
+
+def _config(provider):
+    return getattr(settings, 'VENDOR_API_QUOTAS', {}).get(provider)
+
+
+def _take_token(provider, config, lane):
+    rate = float(config['RATE'])
+    burst = float(config['BURST'])
+    threshold = 1.0
+    if lane == 'background':
+        threshold += burst * config.get('BACKGROUND_RESERVE', 0.0)
+
+    now = time.time()
+    refilled = Least(Value(burst), F('tokens') + (Value(now) - F('updated_at')) * Value(rate))
+    taken = (ApiRateBucket.objects
+             .filter(provider=provider)
+             .filter(GreaterThanOrEqual(refilled, Value(threshold)))
+             .update(tokens=refilled - Value(1.0), updated_at=Value(now)))
+    if taken:
+        return True
+
+    if not ApiRateBucket.objects.filter(provider=provider).exists():
+        try:
+            with transaction.atomic():
+                ApiRateBucket.objects.create(provider=provider, tokens=burst, updated_at=now)
+        except IntegrityError:
+            pass  # another process created it first
+        return _take_token(provider, config, lane)
+    return False
+
+
+def _count_daily(provider, config, lane):
+    today = timezone.localdate()
+    usage, _ = ApiQuotaUsage.objects.get_or_create(provider=provider, date=today)
+    daily = config.get('DAILY')
+    qs = ApiQuotaUsage.objects.filter(pk=usage.pk)
+    if daily:
+        limit = daily
+        if lane == 'background':
+            limit = int(daily * config.get('BACKGROUND_DAILY_SHARE', 1.0))
+        qs = qs.filter(LessThan(F('interactive') + F('background'), Value(limit)))
+    return qs.update(**{lane: F(lane) + 1}) == 1
+
+
+def _count_denied(provider):
+    today = timezone.localdate()
+    usage, _ = ApiQuotaUsage.objects.get_or_create(provider=provider, date=today)
+    ApiQuotaUsage.objects.filter(pk=usage.pk).update(denied=F('denied') + 1)
+
+
+def acquire(provider, lane=None):
+    """
+    제공자 호출 1회분 허가를 받음. 한도 초과 시 QuotaExceeded 발생
+    설정(VENDOR_API_QUOTAS)이 없는 제공자는 제한하지 않습니다.
+    """
+    config = _config(provider)
+    if not config:
+        return
+    lane = lane or current_lane()
+    deadline = time.monotonic() + (config.get('MAX_WAIT', 1.0) if lane == 'interactive' else 0)
+
+    while True:
+        with transaction.atomic():
+            if _take_token(provider, config, lane):
+                if _count_daily(provider, config, lane):
+                    return
+                # Daily budget exhausted: roll the token back with the transaction
+                transaction.set_rollback(True)
+                reason = 'daily limit'
+            else:
+                reason = 'rate limit'
+
+        if reason == 'rate limit' and time.monotonic() < deadline:
+            time.sleep(min(1.0 / float(config['RATE']), max(0.0, deadline - time.monotonic())))
+            continue
+
+        _count_denied(provider)
+        raise QuotaExceeded(provider, lane, reason)
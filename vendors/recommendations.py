@@ -0,0 +1,265 @@
+"""
+개인화 업체 추천
+
+오프라인 (build_recommendations 명령)
+    그룹 성향을 세그먼트(시도 | 스타일 | 예산대)로 묶고, 세그먼트마다 업체 점수를 계산해
+    상위 TOP_K 를 VendorRecommendation 에 저장합니다.
+    점수 = 지역 일치 + 스타일 키워드 일치 + 평점 신뢰도(Vendor.score) + 비슷한 그룹의 선택(UserVendorSelection)
+온라인 (vendor_main)
+    세그먼트 키(구체적 -> 시도 -> 전체)로 인덱스 조회 1회 후, 이미 선택한 업체/카테고리와
+    시군구 일치 여부로 가볍게 재정렬하고 카테고리가 겹치지 않게 고릅니다.
+"""
+import heapq
+import logging
+import math
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from .models import UserVendorSelection, Vendor, VendorRecommendation
+
+logger = logging.getLogger(__name__)
+
+ANY = '*'
+TOP_K = 50
+
+# Canonical style -> keywords found in profile.style and in vendor names/review summaries
+STYLE_KEYWORDS = {
+    'classic': ('클래식', '우아', '정통', '호텔', '채플', '경건'),
+    'house': ('하우스', '스몰', '가든', '야외', '소규모', '내추럴'),
+    'modern': ('모던', '심플', '미니멀', '세련', '깔끔'),
+    'lovely': ('러블리', '로맨틱', '화사', '소녀', '밝은'),
+    'luxury': ('럭셔리', '고급', '화려', '웅장', '비즈'),
+}
+
+# Upper bounds (KRW) of the budget bands, by budget_max (or budget_min when only that is set)
+BUDGET_BANDS = (
+    ('under20m', 20_000_000),
+    ('under40m', 40_000_000),
+    ('under70m', 70_000_000),
+    ('over70m', None),
+)
+
+WEIGHTS = {'region': 0.30, 'style': 0.15, 'rating': 0.30, 'similar': 0.25}
+REGIONAL_CANDIDATES = 200  # out-of-region vendors scored per regional segment (best rated first)
+
+
+def style_key(style):
+    text = style or ''
+    for key, keywords in STYLE_KEYWORDS.items():
+        if key == text or any(keyword in text for keyword in keywords):
+            return key
+    return ANY
+
+
+def budget_band(budget_min, budget_max):
+    budget = budget_max or budget_min
+    if not budget:
+        return ANY
+    for band, upper in BUDGET_BANDS:
+        if upper is None or budget < upper:
+            return band
+    return ANY
+
+
+def segment_key(sido_id, style, band):
+    return f"{sido_id or ANY}|{style}|{band}"
+
+
+def fallback_keys(key):
+    """구체적인 세그먼트부터 시도 단위, 전체 순서의 조회 키"""
+    sido, _, _ = key.split('|')
+    keys = [key, segment_key(sido, ANY, ANY), segment_key(None, ANY, ANY)]
+    return list(dict.fromkeys(keys))
+
+
+class Preferences:
+    """그룹(또는 그룹이 없으면 프로필) 단위 선호 조건"""
+
+    def __init__(self, sido_id=None, sigungu_id=None, style=None, budget_min=None, budget_max=None):
+        self.sido_id = sido_id
+        self.sigungu_id = sigungu_id
+        self.style = style_key(style)
+        self.band = budget_band(budget_min, budget_max)
+
+    @property
+    def segment(self):
+        return segment_key(self.sido_id, self.style, self.band)
+
+
+def group_preferences(profile):
+    """그룹 구성원 프로필 중 값이 있는 항목을 모아 선호 조건으로 (본인 프로필 우선)"""
+    from weddings.models import WeddingProfile
+
+    profiles = [profile]
+    if profile.group_id:
+        profiles += list(WeddingProfile.objects.filter(group_id=profile.group_id).exclude(pk=profile.pk))
+    values = {}
+    for field in ('sido_id', 'sigungu_id', 'style', 'budget_min', 'budget_max'):
+        values[field] = next((getattr(p, field) for p in profiles if getattr(p, field)), None)
+    return Preferences(**values)
+
+
+# --- offline -----------------------------------------------------------------
+
+class _VendorFeatures:
+    __slots__ = ('id', 'category_id', 'sido_id', 'styles', 'rating')
+
+    def __init__(self, row):
+        pk, category_id, sido_id, name, summary, score = row
+        self.id = pk
+        self.category_id = category_id
+        self.sido_id = sido_id
+        text = f"{name} {summary}"
+        self.styles = {key for key, keywords in STYLE_KEYWORDS.items() if any(k in text for k in keywords)}
+        self.rating = score / 5.0
+
+
+def _first(members, i):
+    return next((member[i] for member in members if member[i]), None)
+
+
+def _profile_segments():
+    """profile_id -> (segment key, sido key) - 그룹 단위로 같은 세그먼트를 공유"""
+    from weddings.models import WeddingProfile
+
+    by_group = defaultdict(list)
+    rows = WeddingProfile.objects.values_list('pk', 'group_id', 'sido_id', 'style', 'budget_min', 'budget_max')
+    for row in rows.iterator(chunk_size=2000):
+        by_group[row[1] or f"p{row[0]}"].append(row)
+
+    segments = {}
+    for members in by_group.values():
+        preferences = Preferences(
+            sido_id=_first(members, 2),
+            style=_first(members, 3),
+            budget_min=_first(members, 4),
+            budget_max=_first(members, 5),
+        )
+        for member in members:
+            segments[member[0]] = (preferences.segment, segment_key(preferences.sido_id, ANY, ANY))
+    return segments
+
+
+def _similar_counts(profile_segments):
+    """세그먼트 키 -> Counter(vendor_id -> 선택 가중치). 최종 선택은 후보의 2배"""
+    counts = defaultdict(Counter)
+    rows = UserVendorSelection.objects.values_list('profile_id', 'vendor_id', 'status')
+    for profile_id, vendor_id, status in rows.iterator(chunk_size=2000):
+        weight = 2 if status == 'final' else 1
+        for key in profile_segments.get(profile_id, ()):
+            counts[key][vendor_id] += weight
+        counts[segment_key(None, ANY, ANY)][vendor_id] += weight
+    return counts
+
+
+def _score_segment(key, vendors, by_sido, similar, top_k):
+    sido, style, _ = key.split('|')
+    sido_id = None if sido == ANY else int(sido)
+
+    if sido_id is None:
+        candidates = vendors
+    else:
+        # In-region vendors plus the best rated ones elsewhere (region weight keeps them below)
+        candidates = by_sido.get(sido_id, []) + [v for v in vendors[:REGIONAL_CANDIDATES] if v.sido_id != sido_id]
+
+    similar_max = max(similar.values(), default=0)
+    scored = []
+    for vendor in candidates:
+        region = 0.5 if sido_id is None else float(vendor.sido_id == sido_id)
+        style_match = 0.5 if style == ANY else float(style in vendor.styles)
+        picked = similar.get(vendor.id, 0)
+        similar_score = math.log1p(picked) / math.log1p(similar_max) if similar_max else 0.0
+        score = (WEIGHTS['region'] * region
+                 + WEIGHTS['style'] * style_match
+                 + WEIGHTS['rating'] * vendor.rating
+                 + WEIGHTS['similar'] * similar_score)
+        scored.append((score, vendor.id))
+    return heapq.nlargest(top_k, scored)
+
+
+def build_recommendations(top_k=TOP_K):
+    """
+    모든 세그먼트의 추천 목록을 다시 계산해 VendorRecommendation 을 교체하고 (세그먼트 수, 행 수)를 반환
+    """
+    rows = Vendor.objects.values_list('pk', 'category_id', 'sido_id', 'name', 'summary_positive', 'score')
+    vendors = [_VendorFeatures(row) for row in rows.order_by('-score', '-pk')]
+    by_sido = defaultdict(list)
+    for vendor in vendors:
+        if vendor.sido_id:
+            by_sido[vendor.sido_id].append(vendor)
+
+    profile_segments = _profile_segments()
+    similar = _similar_counts(profile_segments)
+
+    keys = {segment_key(None, ANY, ANY)}
+    keys.update(segment_key(sido_id, ANY, ANY) for sido_id in by_sido)
+    for segment, sido_segment in profile_segments.values():
+        keys.update((segment, sido_segment))
+
+    recommendations = []
+    for key in sorted(keys):
+        # Similar groups: the same segment, falling back to the same region when the segment is sparse
+        region_key = segment_key(key.split('|')[0], ANY, ANY)
+        counts = similar.get(key) or similar.get(region_key) or Counter()
+        for rank, (score, vendor_id) in enumerate(_score_segment(key, vendors, by_sido, counts, top_k), start=1):
+            recommendations.append(VendorRecommendation(segment=key, vendor_id=vendor_id, score=score, rank=rank))
+
+    with transaction.atomic():
+        VendorRecommendation.objects.all().delete()
+        VendorRecommendation.objects.bulk_create(recommendations, batch_size=1000)
+    logger.info("Built %d vendor recommendation(s) for %d segment(s)", len(recommendations), len(keys))
+    return len(keys), len(recommendations)
+
+
+# --- online ------------------------------------------------------------------
+
+def recommend_for_profile(profile, limit=4):
+    """
+    프로필(그룹) 맞춤 추천 업체 목록. 세그먼트 조회 1회 + 메모리 재정렬
+    """
+    preferences = group_preferences(profile)
+    keys = fallback_keys(preferences.segment)
+    rows = list(VendorRecommendation.objects
+                .filter(segment__in=keys)
+                .select_related('vendor', 'vendor__category')
+                .order_by('rank'))
+    if not rows:
+        return []
+    # Most specific segment that has been built
+    present = {row.segment for row in rows}
+    segment = next(key for key in keys if key in present)
+    rows = [row for row in rows if row.segment == segment]
+
+    selected = set()
+    final_categories = set()
+    for vendor_id, status, category_id in (UserVendorSelection.objects
+                                           .filter(profile=profile)
+                                           .values_list('vendor_id', 'status', 'vendor__category_id')):
+        selected.add(vendor_id)
+        if status == 'final':
+            final_categories.add(category_id)
+
+    def adjusted(row):
+        score = row.score
+        if preferences.sigungu_id and row.vendor.sigungu_id == preferences.sigungu_id:
+            score += 0.1
+        if row.vendor.category_id in final_categories:
+            score -= 0.3  # this category is already booked
+        return score
+
+    ranked = sorted((row for row in rows if row.vendor_id not in selected), key=adjusted, reverse=True)
+    picked, seen_categories = [], set()
+    for row in ranked:
+        if row.vendor.category_id not in seen_categories:
+            picked.append(row.vendor)
+            seen_categories.add(row.vendor.category_id)
+        if len(picked) == limit:
+            return picked
+    # Fewer categories than slots: fill up with the next best
+    for row in ranked:
+        if row.vendor not in picked:
+            picked.append(row.vendor)
+        if len(picked) == limit:
+            break
+    return picked
@@ -0,0 +1,148 @@
+"""
+업체 검색 결과 stale-while-revalidate 갱신
+
+vendor_list 는 항상 Vendor 테이블에서 즉시 응답하고, (카테고리, 지역) 결과가
+없거나 오래되었으면 VendorSearchRefresh 큐에 갱신 요청만 남깁니다.
+큐 키는 core.regions 로 해석되는 행정구역(정규화된 이름)만 허용하고, 그 밖의 자유 입력은 DB 에서만 찾습니다.
+실제 API 호출과 DB 저장은 process_vendor_refreshes 관리 명령(워커)이 처리합니다.
+"""
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from core.regions import resolve_region
+
+from .ingest import ingest_provider_results
+from .matching import resolve_duplicates
+from .models import Vendor, VendorSearchRefresh
+from .quota import use_lane
+
+logger = logging.getLogger(__name__)
+
+
+def _fresh_ttl():
+    return timedelta(seconds=getattr(settings, 'VENDOR_SEARCH_FRESH_TTL', 60 * 60 * 24))
+
+
+def _retry_ttl():
+    return timedelta(seconds=getattr(settings, 'VENDOR_SEARCH_RETRY_TTL', 60 * 5))
+
+
+def _pending_recheck():
+    return getattr(settings, 'VENDOR_SEARCH_PENDING_RECHECK', 30)
+
+
+def _stuck_after():
+    return timedelta(seconds=getattr(settings, 'VENDOR_SEARCH_STUCK_AFTER', 60 * 10))
+
+
+def search_marker_key(category_slug, region):
+    # Region is free text (Korean, spaces): hash it so the key is safe for any cache backend
+    region_hash = hashlib.md5(region.encode('utf-8')).hexdigest()
+    return f"vendor_search_{category_slug}_{region_hash}"
+
+
+def request_refresh(category, region):
+    """
+    결과가 없거나 오래된 경우 갱신 요청을 큐에 넣음 (같은 키의 중복 요청은 하나로 합쳐짐)
+    region 은 행정구역으로 해석되어야 하며 정규화된 이름('서울 강남구')으로 저장, 해석되지 않으면 큐에 넣지 않음
+    반환값: 갱신이 대기/진행 중이면 True
+    """
+    match = resolve_region(region)
+    if not match:
+        # Free text would grow VendorSearchRefresh (and spend API quota) without bound
+        return False
+    region = match.label
+
+    marker_key = search_marker_key(category.slug, region)
+    marker = cache.get(marker_key)
+    if marker == 'fresh':
+        return False
+    if marker == 'pending':
+        return True
+
+    now = timezone.now()
+    state, _ = VendorSearchRefresh.objects.get_or_create(category=category, region=region)
+
+    if state.fresh_until and state.fresh_until > now:
+        cache.set(marker_key, 'fresh', (state.fresh_until - now).total_seconds())
+        return False
+
+    # Conditional UPDATE: only one concurrent request wins the idle -> pending transition.
+    # Rows stuck in 'running' (crashed worker) are requeued as well.
+    VendorSearchRefresh.objects.filter(pk=state.pk).filter(
+        Q(status='idle') | Q(status='running', started_at__lt=now - _stuck_after())
+    ).update(status='pending', requested_at=now)
+
+    cache.set(marker_key, 'pending', _pending_recheck())
+    return True
+
+
+def claim_next():
+    """
+    가장 오래된 대기 요청 하나를 running 으로 전환하여 반환 (다른 워커와 경쟁 시 재시도)
+    """
+    while True:
+        state = (VendorSearchRefresh.objects
+                 .filter(status='pending')
+                 .select_related('category')
+                 .order_by('requested_at')
+                 .first())
+        if state is None:
+            return None
+        claimed = VendorSearchRefresh.objects.filter(pk=state.pk, status='pending').update(
+            status='running', started_at=timezone.now()
+        )
+        if claimed:
+            return state
+
+
+def run_refresh(state):
+    """
+    제공자 검색 후 결과를 Vendor 테이블에 반영하고 갱신 상태를 기록
+    """
+    from .fanout import fan_out
+
+    category, region = state.category, state.region
+    # Never-fetched keys have a user staring at an empty page: spend the interactive lane on them
+    lane = 'interactive' if state.refreshed_at is None else 'background'
+    with use_lane(lane):
+        outcome = fan_out(f"{region} {category.name}")
+    error = ''
+    try:
+        stats = ingest_provider_results(category, region, outcome.results)
+        logger.info("Vendor refresh for %s: %r", state, stats)
+        if stats.inserted and len(outcome.results) > 1:
+            # New rows from several providers: link the same place found by each of them
+            candidates = Vendor.objects.filter(category=category)
+            match = resolve_region(region)
+            if match:
+                candidates = candidates.filter(sido_id=match.sido_id)
+            resolve_duplicates(candidates)
+    except Exception as e:
+        logger.exception("Vendor refresh for %s failed", state)
+        error = str(e)
+
+    now = timezone.now()
+    complete = outcome.complete and not error
+    if not complete and not error:
+        error = '; '.join(
+            [f"{name}: {message}" for name, message in outcome.errors.items()]
+            + [f"{name}: timed out" for name in outcome.timed_out]
+        )
+
+    # Partial results are kept, but the key becomes stale again soon so it is retried
+    fresh_until = now + (_fresh_ttl() if complete else _retry_ttl())
+    VendorSearchRefresh.objects.filter(pk=state.pk).update(
+        status='idle',
+        refreshed_at=now,
+        fresh_until=fresh_until,
+        last_error=error,
+    )
+    cache.set(search_marker_key(category.slug, region), 'fresh', (fresh_until - now).total_seconds())
+    return outcome
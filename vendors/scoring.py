@@ -0,0 +1,39 @@
+"""
+업체 신뢰도 가중 점수 (Vendor.score)
+
+베이즈 평균: score = (PRIOR_REVIEWS * PRIOR_MEAN + 평점 * 리뷰 수) / (PRIOR_REVIEWS + 리뷰 수)
+리뷰가 적을수록 PRIOR_MEAN 쪽으로 당겨지므로 리뷰 2개 5.0점 업체가 리뷰 900개 4.7점 업체보다 위로 오지 않습니다.
+
+사전 평균을 전체 평균 대신 상수로 두어 점수가 그 업체 행만으로 정해집니다. 그래서 평점 집계를 바꾸는
+UPDATE 에 같은 식을 넣어 함께 갱신하고 (reviews.aggregates, vendors.ingest), 다른 업체를 다시 계산할 일이 없습니다.
+"""
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+from django.db.models.functions import Greatest
+
+PRIOR_MEAN = 3.5
+PRIOR_REVIEWS = 10
+
+
+def bayesian_score(rating, count):
+    """평점/리뷰 수 값으로 점수 계산 (bulk_create 등 파이썬에서 직접 채울 때)"""
+    count = count or 0
+    return (PRIOR_REVIEWS * PRIOR_MEAN + (rating or 0) * count) / (PRIOR_REVIEWS + count)
+
+
+def score_expression(rating=None, count=None):
+    """같은 계산의 ORM 식 (UPDATE 용). 기본은 avg_rating/review_count, 갱신 후 값을 나타내는 식을 넘길 수 있습니다"""
+    rating = F('avg_rating') if rating is None else rating
+    count = F('review_count') if count is None else count
+    return ExpressionWrapper(
+        (Value(PRIOR_REVIEWS * PRIOR_MEAN) + rating * count) / (Value(float(PRIOR_REVIEWS)) + count),
+        output_field=FloatField(),
+    )
+
+
+def review_count_expression(rating_count=None):
+    """
+    표시/점수용 리뷰 수: 제공자 전체 리뷰 수와 수집한 평점 수 중 큰 값
+    (구글 Details 는 리뷰를 최대 5개만 주므로 수집분으로 제공자 합계를 덮어쓰지 않음)
+    """
+    rating_count = F('rating_count') if rating_count is None else rating_count
+    return Greatest(F('provider_review_count'), rating_count)
@@ -0,0 +1,48 @@
+"""
+업체 전문 검색 (업체명, 카테고리, 지역, 주소, 리뷰 요약)
+
+인덱스(vendors_vendor_fts)는 마이그레이션 0008 에서 만들어지고 vendors_vendor 트리거로 갱신됩니다
+(트리거 설치/재설치는 migrate 직후 core.fts.install_index_triggers).
+공통 동작(trigram, 짧은 검색어 처리, 대체 검색)은 core.fts 를 참고하세요.
+"""
+from core.fts import FullTextIndex, register
+
+VENDOR_INDEX = register(FullTextIndex(
+    table='vendors_vendor_fts',
+    source_table='vendors_vendor',
+    columns=[
+        ('name', '{row}.name'),
+        ('category', '(SELECT name FROM vendors_vendorcategory WHERE id = {row}.category_id)'),
+        ('region', "{row}.region_sido || ' ' || {row}.region_sigungu"),
+        ('address', '{row}.address'),
+        ('summary_positive', '{row}.summary_positive'),
+        ('summary_negative', '{row}.summary_negative'),
+    ],
+    # Name hits matter most, review summaries least
+    weights=[10.0, 5.0, 3.0, 2.0, 1.0, 1.0],
+    watch=['name', 'category_id', 'region_sido', 'region_sigungu', 'address', 'summary_positive', 'summary_negative'],
+    related=[('vendors_vendorcategory', 'name', 'category', 'category_id')],
+    fallback_fields={
+        'name': 'name',
+        'category__name': 'category',
+        'region_sido': 'region',
+        'region_sigungu': 'region',
+        'address': 'address',
+        'summary_positive': 'summary_positive',
+        'summary_negative': 'summary_negative',
+    },
+))
+
+
+def search_vendors(text, queryset=None):
+    """
+    검색어로 업체를 찾아 관련도순으로 반환 (search_rank 주석 포함)
+    """
+    from .models import Vendor
+    queryset = Vendor.objects.all() if queryset is None else queryset
+    return VENDOR_INDEX.search(queryset, text)
+
+
+def filter_vendors_by_region(region, queryset):
+    """지역 검색어가 시도/시군구 또는 주소에 포함된 업체로 거름 (인덱스 사용)"""
+    return VENDOR_INDEX.filter(queryset, region, columns=['region', 'address'])
@@ -0,0 +1,58 @@
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from core.images import process_field
+from core.regions import assign_region
+
+from . import geo
+from .scoring import bayesian_score
+from .models import Vendor
+
+@receiver(pre_save, sender=Vendor)
+def normalize_vendor_region(sender, instance, update_fields=None, **kwargs):
+    """
+    저장 시 주소(우선) 또는 시도/시군구 문자열로 행정구역 FK 를 맞춤
+    bulk_create/update 는 시그널이 없으므로 vendors.ingest 와 backfill_regions 명령이 직접 설정합니다.
+    update_fields 에 주소/지역 문자열만 있어도 Vendor.save 가 sido/sigungu 를 함께 저장합니다.
+    """
+    if update_fields is not None and not Vendor.DERIVED_FIELDS['sido'] & set(update_fields):
+        return
+    assign_region(instance, instance.address, f"{instance.region_sido} {instance.region_sigungu}")
+
+
+@receiver(pre_save, sender=Vendor)
+def update_vendor_geohash(sender, instance, update_fields=None, **kwargs):
+    """
+    좌표가 바뀌면 geohash 도 맞춤 (bulk 경로는 vendors.ingest 가 직접 계산)
+    update_fields 에 좌표만 있어도 Vendor.save 가 geohash 를 함께 저장합니다.
+    """
+    if update_fields is not None and not Vendor.DERIVED_FIELDS['geohash'] & set(update_fields):
+        return
+    if geo.valid_korean_coordinates(instance.latitude, instance.longitude):
+        instance.geohash = geo.encode(instance.latitude, instance.longitude)
+    else:
+        instance.geohash = ''
+
+
+@receiver(pre_save, sender=Vendor)
+def update_vendor_score(sender, instance, update_fields=None, **kwargs):
+    """
+    평점/리뷰 수가 바뀌면 score 도 맞춤 (집계 UPDATE 와 bulk 경로는 같은 식을 직접 사용)
+    update_fields 에 평점/리뷰 수만 있어도 Vendor.save 가 score 를 함께 저장합니다.
+    """
+    if update_fields is not None and not Vendor.DERIVED_FIELDS['score'] & set(update_fields):
+        return
+    instance.score = bayesian_score(instance.avg_rating, instance.review_count)
+
+
+@receiver(pre_save, sender=Vendor)
+def update_vendor_image_hash(sender, instance, update_fields=None, **kwargs):
+    """
+    새 이미지가 올라오면 파생본(core.images)을 만들고 해시를 저장, 이미지를 지우면 해시도 비움
+    """
+    if update_fields is not None and not Vendor.DERIVED_FIELDS['image_hash'] & set(update_fields):
+        return
+    if not instance.image:
+        instance.image_hash = ''
+    elif not instance.image._committed:
+        instance.image_hash = process_field(instance.image)
@@ -0,0 +1,134 @@
+"""
+네이버/구글 API 로컬 스텁 서버 (오프라인 테스트용)
+
+NAVER_API_BASE_URL / GOOGLE_PLACES_BASE_URL 을 스텁 주소로 지정하면
+vendors.utils 의 함수들이 실제 API 대신 이 서버를 호출합니다.
+지연(delay), 실패율(fail_rate), 고정 상태 코드(status)로 장애 상황을 재현할 수 있습니다.
+
+    with StubProviderServer(delay=0.5, fail_rate=0.3) as stub:
+        settings.NAVER_API_BASE_URL = settings.GOOGLE_PLACES_BASE_URL = stub.url
+        reset_clients()
+        ...
+"""
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+def _naver_items(query, display):
+    return [
+        {
+            'title': f"<b>{query}</b> 스텁업체 {i}",
+            'link': '',
+            'category': '웨딩>웨딩홀',
+            'address': f"서울특별시 강남구 역삼동 {100 + i}",
+            'roadAddress': f"서울특별시 강남구 테헤란로 {100 + i}",
+            'mapx': str(1270276000 + i * 1000),
+            'mapy': str(374979000 + i * 1000),
+        }
+        for i in range(1, display + 1)
+    ]
+
+
+def _google_results(query):
+    return [
+        {
+            'place_id': f"stub-{zlib.crc32(query.encode('utf-8')) % 10000}-{i}",
+            'name': f"{query} 스텁업체 {i}",
+            'formatted_address': f"대한민국 서울특별시 강남구 테헤란로 {100 + i}",
+            'rating': round(3.5 + (i % 4) * 0.4, 1),
+            'user_ratings_total': 10 * i,
+            'geometry': {'location': {'lat': 37.4979 + i * 0.001, 'lng': 127.0276 + i * 0.001}},
+        }
+        for i in range(1, 6)
+    ]
+
+
+def _google_details(place_id):
+    return {
+        'place_id': place_id,
+        'name': f"스텁업체 {place_id}",
+        'formatted_address': "대한민국 서울특별시 강남구 테헤란로 101",
+        'rating': 4.3,
+        'user_ratings_total': 3,
+        'reviews': [
+            {'author_name': '스텁 사용자 1', 'rating': 5, 'text': '친절하고 음식이 맛있어요', 'time': 1700000000},
+            {'author_name': '스텁 사용자 2', 'rating': 4, 'text': '주차가 편리해요', 'time': 1700100000},
+            {'author_name': '스텁 사용자 3', 'rating': 2, 'text': '대기 시간이 길어요', 'time': 1700200000},
+        ],
+    }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server_version = 'ProviderStub/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        stub = self.server
+        stub.request_count += 1
+        if stub.delay:
+            time.sleep(stub.delay)
+        if stub.status:
+            return self._send(stub.status, {'error': 'stub forced status'})
+        if stub.fail_rate and random.random() < stub.fail_rate:
+            return self._send(503, {'error': 'stub injected failure'})
+
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+        if parsed.path == '/v1/search/local.json':
+            items = _naver_items(params.get('query', ''), int(params.get('display', 5)))
+            return self._send(200, {'total': len(items), 'start': 1, 'display': len(items), 'items': items})
+        if parsed.path == '/maps/api/place/textsearch/json':
+            return self._send(200, {'status': 'OK', 'results': _google_results(params.get('query', ''))})
+        if parsed.path == '/maps/api/place/details/json':
+            return self._send(200, {'status': 'OK', 'result': _google_details(params.get('place_id', ''))})
+        return self._send(404, {'error': 'not found'})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubProviderServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0.0, fail_rate=0.0, status=None, verbose=False):
+        super().__init__((host, port), _StubHandler)
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.status = status
+        self.verbose = verbose
+        self.request_count = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
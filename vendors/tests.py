@@ -1,3 +1,578 @@
-from django.test import TestCase
+import tempfile
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.regions import reset_region_cache, resolve_region
+from reviews.models import RawReview
+from vendors import geo
+from vendors.clients import CircuitBreaker, ProviderClient, ProviderError, ProviderUnavailable, ReplayMiss
+from vendors.fanout import fan_out
+from vendors.ingest import ingest_provider_results
+from vendors.matching import find_matches, normalize_address, normalize_name, resolve_duplicates
+from vendors.models import ApiQuotaUsage, UserVendorSelection, Vendor, VendorCategory, VendorSearchRefresh
+from vendors.payload_cache import payload_key, reset_payload_cache
+from vendors.quota import QuotaExceeded, acquire, current_lane, use_lane
+from vendors.recommendations import (
+    ANY, budget_band, build_recommendations, fallback_keys, recommend_for_profile, segment_key, style_key,
+)
+from vendors.refresh import request_refresh
+from vendors.scoring import PRIOR_MEAN, bayesian_score
+from vendors.search import VENDOR_INDEX, filter_vendors_by_region, search_vendors
+from vendors.stub_server import StubProviderServer
+from weddings.models import WeddingProfile
+
+NAVER_PARAMS = {'query': '강남 웨딩홀', 'display': 5}
+
+
+class RequestRefreshTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_region_cache()
+        self.category = VendorCategory.objects.create(name='웨딩홀', slug='hall')
+
+    def tearDown(self):
+        cache.clear()
+        reset_region_cache()
+
+    def test_region_is_queued_under_its_canonical_name(self):
+        self.assertTrue(request_refresh(self.category, '서울특별시 강남구'))
+        cache.clear()
+        self.assertTrue(request_refresh(self.category, '강남구'))
+        state = VendorSearchRefresh.objects.get()
+        self.assertEqual((state.region, state.status), ('서울 강남구', 'pending'))
+
+    def test_free_text_region_is_not_queued(self):
+        for region in ['테헤란로 123', 'asdf', '강남역 근처 웨딩홀 추천']:
+            self.assertFalse(request_refresh(self.category, region))
+        self.assertFalse(VendorSearchRefresh.objects.exists())
+
+
+
+class VendorRegionTests(TestCase):
+    def setUp(self):
+        reset_region_cache()
+        self.addCleanup(reset_region_cache)
+        self.category = VendorCategory.objects.create(name='웨딩홀', slug='hall')
+
+    def test_region_from_address_then_strings(self):
+        vendor = Vendor.objects.create(name='홀', category=self.category, region_sido='서울특별시',
+                                       region_sigungu='강남', address='')
+        self.assertEqual((vendor.sido.name, vendor.sigungu.name), ('서울', '강남구'))
+
+    def test_partial_save_updates_region(self):
+        vendor = Vendor.objects.create(name='홀', category=self.category, region_sido='서울', region_sigungu='강남구')
+        vendor.address = '부산광역시 해운대구 우동 1'
+        vendor.save(update_fields=['address'])
+        vendor.refresh_from_db()
+        self.assertEqual((vendor.sido.name, vendor.sigungu.name), ('부산', '해운대구'))
+
+@override_settings(VENDOR_API_QUOTAS={}, VENDOR_PAYLOAD_CACHE={'MODE': 'off'})
+class ProviderClientTests(SimpleTestCase):
+    def setUp(self):
+        reset_payload_cache()
+        self.stub = StubProviderServer().start()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        # backoff_base=0: retries sleep uniform(0, 0)
+        self.client = ProviderClient('naver', self.stub.url, max_retries=2, backoff_base=0, breaker=self.breaker)
+
+    def tearDown(self):
+        self.stub.stop()
+        reset_payload_cache()
+
+    def get(self):
+        return self.client.get_json('naver_local', NAVER_PARAMS)
+
+    def test_success(self):
+        data = self.get()
+        self.assertEqual(len(data['items']), 5)
+        self.assertEqual(self.stub.request_count, 1)
+
+    def test_transient_failure_is_retried(self):
+        self.stub.fail_rate = 0.5
+        with mock.patch('vendors.stub_server.random.random', side_effect=[0.0, 0.9]):
+            self.assertEqual(len(self.get()['items']), 5)
+        self.assertEqual(self.stub.request_count, 2)
+        self.assertEqual((self.breaker.state, self.breaker.failures), (CircuitBreaker.CLOSED, 0))
+
+    def test_retries_exhausted(self):
+        self.stub.status = 503
+        with self.assertRaises(ProviderError):
+            self.get()
+        self.assertEqual(self.stub.request_count, 3)
+        self.assertEqual((self.breaker.state, self.breaker.failures), (CircuitBreaker.CLOSED, 1))
+
+    def test_non_retryable_status_is_not_retried(self):
+        self.stub.status = 404
+        with self.assertRaises(ProviderError):
+            self.get()
+        self.assertEqual(self.stub.request_count, 1)
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_backoff_is_capped_and_honours_retry_after(self):
+        client = ProviderClient('naver', self.stub.url, backoff_base=0.3, backoff_max=4.0)
+        for attempt in range(10):
+            self.assertLessEqual(client._backoff(attempt), 4.0)
+        self.assertEqual(client._backoff(0, retry_after=2.5), 2.5)
+        self.assertEqual(client._backoff(0, retry_after=60), 4.0)
+
+    def test_breaker_opens_and_short_circuits(self):
+        self.stub.status = 503
+        for _ in range(2):
+            with self.assertRaises(ProviderError):
+                self.get()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(ProviderUnavailable):
+            self.get()
+        self.assertEqual(self.stub.request_count, 6)
+
+    def open_breaker(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.reset_timeout = 0
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_half_open_probe_success_closes(self):
+        self.open_breaker()
+        self.get()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_failure_reopens(self):
+        self.open_breaker()
+        self.stub.status = 503
+        with self.assertRaises(ProviderError):
+            self.get()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_half_open_probe_resolved_on_client_error(self):
+        self.open_breaker()
+        self.stub.status = 400
+        with self.assertRaises(ProviderError):
+            self.get()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe_released_on_quota_exceeded(self):
+        self.open_breaker()
+        with mock.patch('vendors.quota.acquire', side_effect=QuotaExceeded('naver', 'interactive', 'daily')):
+            with self.assertRaises(QuotaExceeded):
+                self.get()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.get()  # the next call probes straight away
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+
+class FanOutTests(SimpleTestCase):
+    def test_results_and_errors_are_collected_per_provider(self):
+        def broken(query):
+            raise ProviderError('google', 'HTTP 503')
+
+        outcome = fan_out('강남 웨딩홀', {'naver': lambda query: [query, 'b'], 'google': broken}, deadline=2)
+        self.assertEqual(outcome.results, {'naver': ['강남 웨딩홀', 'b']})
+        self.assertEqual(list(outcome.errors), ['google'])
+        self.assertFalse(outcome.complete)
+
+    def test_slow_provider_misses_the_deadline(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow(query):
+            release.wait(5)
+            return ['late']
+
+        outcome = fan_out('강남', {'naver': lambda query: ['fast'], 'google': slow}, deadline=0.2)
+        self.assertEqual(outcome.results, {'naver': ['fast']})
+        self.assertEqual(outcome.timed_out, ['google'])
+        self.assertLess(outcome.elapsed, 2)
+
+    def test_quota_lane_reaches_the_pool_threads(self):
+        with use_lane('background'):
+            outcome = fan_out('강남', {'naver': lambda query: [current_lane()]}, deadline=2)
+        self.assertEqual(outcome.results, {'naver': ['background']})
+
+
+@override_settings(VENDOR_API_QUOTAS={})
+class PayloadReplayTests(SimpleTestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.addCleanup(reset_payload_cache)
+
+    def provider_client(self, mode, base_url):
+        reset_payload_cache()
+        override = override_settings(VENDOR_PAYLOAD_CACHE={'MODE': mode, 'DIR': self.dir.name})
+        override.enable()
+        self.addCleanup(override.disable)
+        return ProviderClient('naver', base_url, max_retries=0)
+
+    def test_recorded_payload_is_replayed_offline(self):
+        with StubProviderServer() as stub:
+            recorded = self.provider_client('record', stub.url).get_json('naver_local', NAVER_PARAMS)
+            # Same search with different spacing/case hits the recorded entry
+            again = self.provider_client('record', stub.url).get_json('naver_local', {'query': ' 강남  웨딩홀', 'display': 5})
+            self.assertEqual(stub.request_count, 1)
+        self.assertEqual(again, recorded)
+
+        # Stub is gone: replay serves from disk only
+        replay = self.provider_client('replay', 'http://127.0.0.1:9')
+        self.assertEqual(replay.get_json('naver_local', NAVER_PARAMS), recorded)
+        with self.assertRaises(ReplayMiss):
+            replay.get_json('naver_local', {'query': '부산 웨딩홀', 'display': 5})
+
+    def test_only_the_query_is_normalized(self):
+        self.assertEqual(
+            payload_key('naver_local', {'query': '강남  웨딩홀 ', 'display': 5}),
+            payload_key('naver_local', {'query': '강남 웨딩홀', 'display': '5'}),
+        )
+        # place_id is case-sensitive: different places must not share a payload
+        self.assertNotEqual(
+            payload_key('google_details', {'place_id': 'ChIJabc'}),
+            payload_key('google_details', {'place_id': 'ChIJABC'}),
+        )
+        self.assertEqual(
+            payload_key('google_details', {'place_id': 'ChIJabc', 'key': 'secret'}),
+            payload_key('google_details', {'place_id': 'ChIJabc'}),
+        )
+
+
+class VendorSearchIndexTests(TestCase):
+    def setUp(self):
+        self.hall = VendorCategory.objects.create(name='웨딩홀', slug='hall')
+        self.vendor = Vendor.objects.create(
+            name='더채플앳청담', category=self.hall, region_sido='서울', region_sigungu='강남구',
+            address='서울특별시 강남구 선릉로 757',
+        )
+
+    def found(self, text):
+        return list(search_vendors(text).values_list('pk', flat=True))
+
+    def test_index_is_installed_with_triggers(self):
+        self.assertTrue(VENDOR_INDEX.exists(connection))
+        self.assertTrue(VENDOR_INDEX.has_triggers(connection))
+
+    def test_insert_update_delete_are_indexed(self):
+        self.assertEqual(self.found('채플앳'), [self.vendor.pk])
+        self.vendor.name = '라비두스'
+        self.vendor.save()
+        self.assertEqual(self.found('채플앳'), [])
+        self.assertEqual(self.found('라비두스'), [self.vendor.pk])
+        self.vendor.delete()
+        self.assertEqual(self.found('라비두스'), [])
+
+    def test_category_rename_reindexes_its_vendors(self):
+        self.hall.name = '하우스웨딩'
+        self.hall.save()
+        self.assertEqual(self.found('하우스웨딩'), [self.vendor.pk])
+
+    def test_short_terms_and_region_filter(self):
+        self.assertEqual(self.found('청담'), [self.vendor.pk])
+        self.assertEqual(list(filter_vendors_by_region('선릉로', Vendor.objects.all())), [self.vendor])
+        self.assertEqual(list(filter_vendors_by_region('부산', Vendor.objects.all())), [])
+
+    def test_name_match_ranks_first(self):
+        other = Vendor.objects.create(
+            name='청담스튜디오', category=self.hall, region_sido='서울', region_sigungu='강남구',
+            summary_positive='채플앳 느낌의 홀',
+        )
+        self.assertEqual(self.found('채플앳'), [self.vendor.pk, other.pk])
+
+
+class GeohashTests(SimpleTestCase):
+    def test_encode(self):
+        self.assertEqual(geo.encode(57.64911, 10.40744), 'u4pruydqq')
+
+    def test_cells_cover_the_radius(self):
+        lat, lng = 37.5172, 127.0473
+        for radius in (0.5, 5.0, 50.0):
+            cells = geo.covering_cells(lat, lng, radius)
+            # Points at the radius in each direction fall in one of the cells
+            dlat = radius / geo.KM_PER_DEGREE
+            for point in [(lat + dlat, lng), (lat - dlat, lng), (lat, lng + dlat * 1.3), (lat, lng - dlat * 1.3)]:
+                with self.subTest(radius=radius, point=point):
+                    self.assertTrue(any(geo.encode(*point).startswith(cell) for cell in cells))
+
+
+class VendorsNearTests(TestCase):
+    # Gangnam station and points roughly 1km, 3km and 30km away
+    CENTER = (37.4979, 127.0276)
+
+    def setUp(self):
+        self.hall = VendorCategory.objects.create(name='웨딩홀', slug='hall')
+        self.far = self.vendor('수원', 37.2636, 127.0286)
+        self.three = self.vendor('잠실', 37.5133, 127.0590)
+        self.one = self.vendor('신논현', 37.5046, 127.0250)
+        self.unlocated = self.vendor('좌표 없음', None, None)
+
+    def vendor(self, name, lat, lng):
+        return Vendor.objects.create(name=name, category=self.hall, region_sido='서울', region_sigungu='강남구',
+                                     latitude=lat, longitude=lng)
+
+    def test_geohash_is_set_on_save(self):
+        self.assertEqual(self.one.geohash, geo.encode(37.5046, 127.0250))
+        self.assertEqual(self.unlocated.geohash, '')
+
+    def test_partial_save_updates_geohash(self):
+        self.unlocated.latitude, self.unlocated.longitude = 37.5046, 127.0250
+        self.unlocated.save(update_fields=['latitude', 'longitude'])
+        self.assertEqual(list(geo.vendors_near(Vendor.objects.all(), *self.CENTER, 2.0)), [self.one, self.unlocated])
+
+    def test_nearest_first_within_radius(self):
+        found = list(geo.vendors_near(Vendor.objects.all(), *self.CENTER, 5.0))
+        self.assertEqual(found, [self.one, self.three])
+        self.assertAlmostEqual(found[0].distance_km, geo.haversine_km(*self.CENTER, 37.5046, 127.0250), places=3)
+        self.assertEqual(list(geo.vendors_near(Vendor.objects.all(), *self.CENTER, 2.0)), [self.one])
+
+    def test_nearby_view_ignores_non_finite_params(self):
+        self.client.force_login(get_user_model().objects.create_user('bride', password='pw'))
+        lat, lng = self.CENTER
+        response = self.client.get(reverse('vendor_nearby'), {'lat': lat, 'lng': lng, 'radius': 'nan'})
+        self.assertEqual(response.context['radius'], 5.0)
+        self.assertEqual(list(response.context['vendors']), [self.one, self.three])
+        response = self.client.get(reverse('vendor_nearby'), {'lat': 'inf', 'lng': lng})
+        self.assertIsNone(response.context['vendors'])
+
+
+class VendorScoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_region_cache()
+        self.hall = VendorCategory.objects.create(name='웨딩홀', slug='hall')
+
+    def tearDown(self):
+        cache.clear()
+        reset_region_cache()
+
+    def vendor(self, name, rating, count, address='서울특별시 강남구 테헤란로 1'):
+        return Vendor.objects.create(name=name, category=self.hall, region_sido='서울', region_sigungu='강남구',
+                                     address=address, avg_rating=rating, review_count=count)
+
+    def test_few_reviews_are_pulled_to_the_prior(self):
+        self.assertEqual(bayesian_score(0, 0), PRIOR_MEAN)
+        self.assertLess(bayesian_score(5.0, 2), bayesian_score(4.7, 900))
+        self.assertAlmostEqual(self.vendor('홀', 4.7, 900).score, bayesian_score(4.7, 900))
+
+    def test_partial_save_updates_score(self):
+        vendor = self.vendor('홀', 0, 0)
+        vendor.avg_rating, vendor.review_count = 4.8, 120
+        vendor.save(update_fields=['avg_rating', 'review_count'])
+        vendor.refresh_from_db()
+        self.assertAlmostEqual(vendor.score, bayesian_score(4.8, 120))
+
+    def test_rating_sort_in_region(self):
+        trusted = self.vendor('리뷰 많은 홀', 4.7, 900)
+        lucky = self.vendor('리뷰 적은 홀', 5.0, 2)
+        self.vendor('다른 지역 홀', 5.0, 900, address='부산광역시 해운대구 우동 1')
+        self.client.force_login(get_user_model().objects.create_user('bride', password='pw'))
+        response = self.client.get(reverse('vendor_list'), {'category': 'hall', 'region': '강남구', 'sort': 'rating'})
+        self.assertEqual(list(response.context['vendors']), [trusted, lucky])
+
+
+class VendorIngestTests(TestCase):
+    def setUp(self):
+        reset_region_cache()
+        self.addCleanup(reset_region_cache)
+        self.hall = VendorCategory.objects.create(name='웨딩홀', slug='hall')
+
+    def google(self, count, rating=4.5):
+        return [{
+            'place_id': f'g-{i}',
+            'name': f'홀 {i}',
+            'formatted_address': f'대한민국 서울특별시 강남구 테헤란로 {100 + i}',
+            'rating': rating,
+            'user_ratings_total': 10 * i,
+            'geometry': {'location': {'lat': 37.4979 + i * 0.001, 'lng': 127.0276}},
+        } for i in range(1, count + 1)]
+
+    def ingest(self, google=(), naver=()):
+        return ingest_provider_results(self.hall, '서울 강남구', {'google': list(google), 'naver': list(naver)})
+
+    def test_insert_then_unchanged_then_updated(self):
+        stats = self.ingest(self.google(3))
+        self.assertEqual((stats.inserted, stats.updated, stats.unchanged), (3, 0, 0))
+        stats = self.ingest(self.google(3))
+        self.assertEqual((stats.inserted, stats.updated, stats.unchanged), (0, 0, 3))
+        stats = self.ingest(self.google(3, rating=3.0))
+        self.assertEqual((stats.inserted, stats.updated, stats.unchanged), (0, 3, 0))
+
+        vendor = Vendor.objects.get(google_place_id='g-2')
+        self.assertEqual((vendor.avg_rating, vendor.review_count), (3.0, 20))
+        self.assertAlmostEqual(vendor.score, bayesian_score(3.0, 20))
+
+    def test_bulk_path_sets_derived_fields(self):
+        naver = [{'title': '<b>더채플</b>앳청담', 'roadAddress': '서울특별시 강남구 선릉로 757',
+                  'mapx': '1270392000', 'mapy': '375224000'}]
+        self.ingest(self.google(1), naver)
+        for vendor in Vendor.objects.all():
+            with self.subTest(vendor=vendor.name):
+                self.assertEqual((vendor.sido.name, vendor.sigungu.name), ('서울', '강남구'))
+                self.assertEqual(vendor.geohash, geo.encode(vendor.latitude, vendor.longitude))
+        self.assertTrue(Vendor.objects.filter(name='더채플앳청담').exists())
+
+    def test_collected_reviews_keep_their_average(self):
+        self.ingest(self.google(1))
+        Vendor.objects.filter(google_place_id='g-1').update(avg_rating=4.9, rating_count=30, review_count=30)
+        self.ingest(self.google(1, rating=3.0))
+        vendor = Vendor.objects.get(google_place_id='g-1')
+        self.assertEqual((vendor.avg_rating, vendor.review_count, vendor.provider_rating), (4.9, 30, 3.0))
+
+    def test_query_count_does_not_grow_with_results(self):
+        resolve_region('서울')  # load the region index outside the measured calls
+        counts = []
+        for start, count in ((0, 5), (100, 40)):  # both fit one INSERT batch on SQLite
+            results = self.google(count)
+            for result in results:
+                result['place_id'] = f"{start}-{result['place_id']}"
+            with CaptureQueriesContext(connection) as queries:
+                self.ingest(results)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+# Near-zero refill rate: the bucket only holds its burst during a test
+QUOTA = {'RATE': 0.001, 'BURST': 10, 'DAILY': 100, 'BACKGROUND_RESERVE': 0.3,
+         'BACKGROUND_DAILY_SHARE': 0.8, 'MAX_WAIT': 0}
+
+
+@override_settings(VENDOR_API_QUOTAS={'naver': QUOTA})
+class QuotaLaneTests(TestCase):
+    def take(self, lane=None):
+        """한도 초과까지 허가받은 횟수"""
+        taken = 0
+        while True:
+            try:
+                acquire('naver', lane)
+            except QuotaExceeded as e:
+                return taken, e.reason
+            taken += 1
+
+    def test_background_leaves_a_reserve_for_interactive(self):
+        # 10 tokens; background stops while 1 + 30% of the burst would remain
+        self.assertEqual(self.take('background'), (7, 'rate limit'))
+        self.assertEqual(self.take('interactive'), (3, 'rate limit'))
+        usage = ApiQuotaUsage.objects.get(provider='naver')
+        self.assertEqual((usage.background, usage.interactive, usage.denied), (7, 3, 2))
+
+    def test_daily_share(self):
+        quota = dict(QUOTA, DAILY=5, BACKGROUND_DAILY_SHARE=0.6)
+        with override_settings(VENDOR_API_QUOTAS={'naver': quota}):
+            self.assertEqual(self.take('background'), (3, 'daily limit'))
+            self.assertEqual(self.take('interactive'), (2, 'daily limit'))
+
+    def test_denied_call_keeps_its_token(self):
+        with override_settings(VENDOR_API_QUOTAS={'naver': dict(QUOTA, DAILY=1)}):
+            self.assertEqual(self.take(), (1, 'daily limit'))
+        # The token of the call refused by the daily limit was rolled back
+        self.assertEqual(self.take(), (9, 'rate limit'))
+
+    def test_lane_from_context(self):
+        with use_lane('background'):
+            self.assertEqual(self.take(), (7, 'rate limit'))
+        with self.assertRaises(ValueError):
+            with use_lane('batch'):
+                pass
+
+    @override_settings(VENDOR_API_QUOTAS={})
+    def test_unconfigured_provider_is_not_limited(self):
+        for _ in range(50):
+            acquire('naver')
+        self.assertFalse(ApiQuotaUsage.objects.exists())
+
+
+class VendorMatchingTests(TestCase):
+    def setUp(self):
+        reset_region_cache()
+        self.addCleanup(reset_region_cache)
+        self.hall = VendorCategory.objects.create(name='웨딩홀', slug='hall')
+
+    def vendor(self, name, address, **ids):
+        return Vendor.objects.create(name=name, category=self.hall, region_sido='', region_sigungu='',
+                                     address=address, **ids)
+
+    def test_normalization(self):
+        self.assertEqual(normalize_name('(주)더채플앳청담 웨딩홀 본점'), '더채플앳청담')
+        self.assertEqual(normalize_name('웨딩홀'), '웨딩홀')  # never stripped to nothing
+        self.assertEqual(normalize_address('대한민국 서울특별시 강남구 선릉로 757 (청담동) 2층'),
+                         ['서울', '강남구', '선릉로', '757'])
+
+    def test_only_complementary_rows_are_paired(self):
+        rows = [
+            {'id': 1, 'name': '더채플앳청담', 'address': '서울 강남구 선릉로 757', 'naver_place_id': 'nv-1', 'google_place_id': None},
+            {'id': 2, 'name': '더 채플 앳 청담', 'address': '서울특별시 강남구 선릉로 757', 'naver_place_id': None, 'google_place_id': 'g-1'},
+            {'id': 3, 'name': '더채플앳청담', 'address': '서울 강남구 선릉로 757', 'naver_place_id': None, 'google_place_id': 'g-2'},
+            {'id': 4, 'name': '라비두스', 'address': '서울 강남구 논현로 1', 'naver_place_id': 'nv-2', 'google_place_id': None},
+        ]
+        # 2 and 3 are both Google rows; the Naver row pairs with one of them, 4 with none
+        matches = find_matches(rows)
+        self.assertEqual(len(matches), 1)
+        pair = set(matches[0][1:])
+        self.assertIn(1, pair)
+        self.assertEqual(len(pair & {2, 3}), 1)
+
+    def test_merge_keeps_the_google_row(self):
+        naver = self.vendor('더채플앳청담', '서울 강남구 선릉로 757', naver_place_id='nv-1')
+        google = self.vendor('더채플앳청담 웨딩홀', '대한민국 서울특별시 강남구 선릉로 757', google_place_id='g-1')
+        other = self.vendor('라비두스', '서울 강남구 논현로 1', naver_place_id='nv-2')
+        user = get_user_model().objects.create_user('bride', password='pw')
+        profile = WeddingProfile.objects.create(user=user)
+        UserVendorSelection.objects.create(profile=profile, vendor=naver, status='final')
+        UserVendorSelection.objects.create(profile=profile, vendor=google)
+        RawReview.objects.create(vendor=naver, source='Naver', content='좋아요', rating=5, content_hash='h1')
+
+        self.assertEqual(len(resolve_duplicates(dry_run=True)), 1)
+        self.assertEqual(Vendor.objects.count(), 3)
+
+        self.assertEqual(len(resolve_duplicates()), 1)
+        self.assertFalse(Vendor.objects.filter(pk=naver.pk).exists())
+        google.refresh_from_db()
+        self.assertEqual((google.naver_place_id, google.google_place_id), ('nv-1', 'g-1'))
+        self.assertEqual(list(UserVendorSelection.objects.values_list('vendor', 'status')), [(google.pk, 'final')])
+        self.assertEqual((google.rating_count, google.avg_rating), (1, 5.0))
+        self.assertTrue(Vendor.objects.filter(pk=other.pk).exists())
+        self.assertEqual(resolve_duplicates(), [])
+
+
+class VendorRecommendationTests(TestCase):
+    def setUp(self):
+        reset_region_cache()
+        self.addCleanup(reset_region_cache)
+        self.hall = VendorCategory.objects.create(name='웨딩홀', slug='hall')
+        self.studio = VendorCategory.objects.create(name='스튜디오', slug='studio')
+        self.seoul_halls = [self.vendor(f'채플 홀 {i}', self.hall, '서울특별시 강남구', 4.0 + i / 10, 50)
+                            for i in range(3)]
+        self.seoul_studio = self.vendor('모던 스튜디오', self.studio, '서울특별시 강남구', 4.0, 50)
+        self.busan_hall = self.vendor('부산 채플 홀', self.hall, '부산광역시 해운대구', 5.0, 500)
+        user = get_user_model().objects.create_user('bride', password='pw')
+        self.profile = WeddingProfile.objects.create(user=user, region_sido='서울', region_sigungu='강남구',
+                                                     style='클래식', budget_max=30_000_000)
+
+    def vendor(self, name, category, address, rating, count):
+        return Vendor.objects.create(name=name, category=category, region_sido='', region_sigungu='',
+                                     address=f'{address} 테헤란로 1', avg_rating=rating, review_count=count)
+
+    def test_segment_keys(self):
+        self.assertEqual((style_key('클래식한 호텔 예식'), style_key('아무거나')), ('classic', ANY))
+        self.assertEqual((budget_band(None, 30_000_000), budget_band(80_000_000, None), budget_band(None, None)),
+                         ('under40m', 'over70m', ANY))
+        self.assertEqual(fallback_keys(segment_key(1, 'classic', 'under40m')), ['1|classic|under40m', '1|*|*', '*|*|*'])
+
+    def test_in_region_first_one_per_category(self):
+        build_recommendations()
+        with self.assertNumQueries(2):
+            picked = recommend_for_profile(self.profile, limit=2)
+        self.assertEqual(picked, [self.seoul_halls[2], self.seoul_studio])
+
+    def test_selected_vendors_and_booked_categories(self):
+        UserVendorSelection.objects.create(profile=self.profile, vendor=self.seoul_halls[2], status='final')
+        build_recommendations()
+        picked = recommend_for_profile(self.profile, limit=3)
+        self.assertNotIn(self.seoul_halls[2], picked)
+        self.assertEqual(picked[0], self.seoul_studio)  # the hall category is already booked
+
+    def test_unbuilt_segments(self):
+        self.assertEqual(recommend_for_profile(self.profile), [])
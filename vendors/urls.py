@@ -3,6 +3,7 @@ from . import views
 
 urlpatterns = [
     path('', views.vendor_list, name='vendor_list'),
+    path('nearby/', views.vendor_nearby, name='vendor_nearby'),
     path('<int:vendor_id>/', views.vendor_detail, name='vendor_detail'),
     path('<int:vendor_id>/select/', views.add_selection, name='add_selection'),
     path('my-candidates/', views.my_candidates_list, name='my_candidates_list'),
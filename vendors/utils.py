@@ -1,21 +1,25 @@
-import requests
+import hashlib
+import html
 import logging
 from django.conf import settings
+from django.utils.html import strip_tags
+from .clients import get_client, ProviderError
+from .payload_cache import get_payload_cache
 
 logger = logging.getLogger(__name__)
 
-def search_naver_local(query, display=5):
+def search_naver_local(query, display=5, strict=False):
     """
     네이버 지역 검색 API 호출
+    strict=True 이면 호출 실패 시 빈 목록 대신 ProviderError 를 그대로 전달
     """
     client_id = settings.NAVER_CLIENT_ID
     client_secret = settings.NAVER_CLIENT_SECRET
     
-    if not client_id or not client_secret or client_id == 'YOUR_NAVER_CLIENT_ID':
+    if (not client_id or not client_secret or client_id == 'YOUR_NAVER_CLIENT_ID') and not get_payload_cache().replay_only:
         logger.warning("Naver API keys are not configured.")
         return []
 
-    url = "https://openapi.naver.com/v1/search/local.json"
     headers = {
         "X-Naver-Client-Id": client_id,
         "X-Naver-Client-Secret": client_secret
@@ -27,25 +31,25 @@ def search_naver_local(query, display=5):
     }
 
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = get_client('naver').get_json('naver_local', params=params, headers=headers)
         return data.get('items', [])
-    except requests.exceptions.RequestException as e:
+    except ProviderError as e:
+        if strict:
+            raise
         logger.error(f"Naver Local Search API failed: {e}")
         return []
 
-def search_google_places(query):
+def search_google_places(query, strict=False):
     """
     Google Places API (Text Search) 호출
+    strict=True 이면 호출 실패 시 빈 목록 대신 ProviderError 를 그대로 전달
     """
     api_key = settings.GOOGLE_MAPS_API_KEY
     
-    if not api_key or api_key == 'YOUR_GOOGLE_MAPS_API_KEY':
+    if (not api_key or api_key == 'YOUR_GOOGLE_MAPS_API_KEY') and not get_payload_cache().replay_only:
         logger.warning("Google Maps API key is not configured.")
         return []
 
-    url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
     params = {
         "query": query,
         "key": api_key,
@@ -53,11 +57,11 @@ def search_google_places(query):
     }
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = get_client('google').get_json('google_textsearch', params=params)
         return data.get('results', [])
-    except requests.exceptions.RequestException as e:
+    except ProviderError as e:
+        if strict:
+            raise
         logger.error(f"Google Places API failed: {e}")
         return []
 
@@ -67,10 +71,9 @@ def fetch_google_place_details(place_id):
     """
     api_key = settings.GOOGLE_MAPS_API_KEY
     
-    if not api_key or api_key == 'YOUR_GOOGLE_MAPS_API_KEY':
+    if (not api_key or api_key == 'YOUR_GOOGLE_MAPS_API_KEY') and not get_payload_cache().replay_only:
         return None
 
-    url = "https://maps.googleapis.com/maps/api/place/details/json"
     params = {
         "place_id": place_id,
         "key": api_key,
@@ -79,10 +82,23 @@ def fetch_google_place_details(place_id):
     }
 
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = get_client('google').get_json('google_details', params=params)
         return data.get('result')
-    except requests.exceptions.RequestException as e:
+    except ProviderError as e:
         logger.error(f"Google Place Details API failed: {e}")
         return None
+
+def clean_naver_title(title):
+    """
+    네이버 검색 결과 title 의 <b> 강조 태그/HTML 엔티티 제거
+    """
+    return html.unescape(strip_tags(title or '')).strip()
+
+def naver_place_key(item):
+    """
+    네이버 지역 검색 결과에는 고유 ID가 없으므로 (업체명, 주소) 해시를 naver_place_id 로 사용
+    """
+    name = clean_naver_title(item.get('title'))
+    address = item.get('roadAddress') or item.get('address') or ''
+    digest = hashlib.sha1(f"{name}|{address}".encode('utf-8')).hexdigest()
+    return f"nv-{digest[:24]}"
@@ -1,7 +1,27 @@
+import math
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
+from django.conf import settings
+from django.core.paginator import Paginator
+from core.pagination import InvalidCursor, KeysetPaginator, cursor_query
+from core.regions import resolve_region
 from .models import Vendor, VendorCategory, UserVendorSelection
+from .geo import vendors_near
+from .refresh import request_refresh
+from .search import filter_vendors_by_region, search_vendors
+
+VENDORS_PER_PAGE = 12
+DISTANCE_SORT_RADIUS_KM = 50.0
+
+# 정렬 옵션 -> 키셋 정렬 키 (마지막은 항상 pk, Vendor.Meta.indexes 에 대응하는 복합 인덱스가 있음)
+VENDOR_SORTS = {
+    'relevance': ['search_rank', 'pk'],
+    'rating': ['-score', '-pk'],
+    'reviews': ['-review_count', '-pk'],
+    'name': ['name', 'pk'],
+    'distance': ['distance_km', 'pk'],
+}
 
 @login_required
 def vendor_list(request):
@@ -10,55 +30,16 @@ def vendor_list(request):
     """
     category_slug = request.GET.get('category')
     region = request.GET.get('region')
+    query = (request.GET.get('q') or '').strip()
+    # '강남', '서울 강남구', '서울특별시 강남구' 등을 같은 행정구역으로 정규화
+    region_match = resolve_region(region) if region else None
     
-    # 1. API 검색 및 데이터 저장 (지역 + 카테고리가 모두 있을 때만)
-    if category_slug and region:
-        # Caching logic to prevent redundant API calls
-        from django.core.cache import cache
-        cache_key = f"vendor_search_{category_slug}_{region}"
-        
-        if not cache.get(cache_key):
-            category = get_object_or_404(VendorCategory, slug=category_slug)
-            search_query = f"{region} {category.name}"
-            
-            # 유틸리티 함수 호출 (lazy import to avoid circular dependency if any)
-            from .utils import search_naver_local, search_google_places
-            
-            # 네이버 검색 (Reference only, or implement logic to use it)
-            # naver_results = search_naver_local(search_query)
-            
-            # 구글 장소 검색 (Text Search)
-            google_results = search_google_places(search_query)
-            for result in google_results:
-                place_id = result.get('place_id')
-                name = result.get('name')
-                address = result.get('formatted_address', '')
-                rating = result.get('rating', 0.0)
-                user_ratings_total = result.get('user_ratings_total', 0)
-                
-                # DB 존재 여부 확인 (Google Place ID 기준)
-                vendor, created = Vendor.objects.get_or_create(
-                    google_place_id=place_id,
-                    defaults={
-                        'name': name,
-                        'category': category,
-                        'region_sido': region.split(' ')[0] if region else '',
-                        'region_sigungu': region.split(' ')[1] if region and len(region.split(' ')) > 1 else '',
-                        'address': address,
-                        'avg_rating': rating,
-                        'review_count': user_ratings_total,
-                    }
-                )
-                
-                # 이미 존재하면 정보 업데이트
-                if not created:
-                    if vendor.avg_rating != rating or vendor.review_count != user_ratings_total:
-                        vendor.avg_rating = rating
-                        vendor.review_count = user_ratings_total
-                        vendor.save()
-            
-            # Set cache for 24 hours
-            cache.set(cache_key, True, 60*60*24)
+    # 1. 검색 결과 갱신 요청 (카테고리 + 행정구역으로 해석되는 지역이 모두 있을 때만)
+    # API 호출/저장은 백그라운드 워커(process_vendor_refreshes)가 처리하고, 여기서는 저장된 결과로 즉시 응답
+    refreshing = False
+    if category_slug and region_match:
+        category = get_object_or_404(VendorCategory, slug=category_slug)
+        refreshing = request_refresh(category, region_match.label)
 
     # 2. DB 조회 및 필터링 (기존 로직 유지)
     vendors = Vendor.objects.all()
@@ -66,19 +47,111 @@ def vendor_list(request):
     if category_slug:
         vendors = vendors.filter(category__slug=category_slug)
     
-    if region:
-        vendors = vendors.filter(Q(region_sido__contains=region) | Q(region_sigungu__contains=region) | Q(address__contains=region))
-        
+    if region_match and region_match.sigungu_id:
+        vendors = vendors.filter(sigungu_id=region_match.sigungu_id)
+    elif region_match:
+        vendors = vendors.filter(sido_id=region_match.sido_id)
+    elif region:
+        # 행정구역으로 해석되지 않는 입력(도로명, 동 이름 등)은 주소 전문 검색으로
+        vendors = filter_vendors_by_region(region, vendors)
+
+    # 3. 검색어: 업체명/카테고리/지역/주소/리뷰 요약 전문 검색 (관련도순)
+    if query:
+        vendors = search_vendors(query, vendors)
+
+    # 4. 정렬 + 키셋 페이지네이션 (COUNT/OFFSET 없이 정렬 키 인덱스 범위만 읽음)
+    sort = request.GET.get('sort') or ('relevance' if query else 'rating')
+    if sort == 'relevance' and not query:
+        sort = 'rating'
+    if sort == 'distance':
+        # 거리순은 기준 위치(좌표 또는 최종 선택한 예식장) 반경 안에서만, 기준이 없으면 평점순
+        lat, lng, _ = _reference_point(request)
+        if lat is None:
+            sort = 'rating'
+        else:
+            vendors = vendors_near(vendors, lat, lng, DISTANCE_SORT_RADIUS_KM)
+    if sort not in VENDOR_SORTS:
+        sort = 'rating'
+
+    paginator = KeysetPaginator(vendors.select_related('category'), VENDOR_SORTS[sort], VENDORS_PER_PAGE)
+    try:
+        page = paginator.page(after=request.GET.get('after'), before=request.GET.get('before'))
+    except InvalidCursor:
+        page = paginator.page()
+
     categories = VendorCategory.objects.all()
     
     context = {
-        'vendors': vendors,
+        'vendors': page,
         'categories': categories,
         'current_category': category_slug,
         'current_region': region,
+        'current_query': query,
+        'current_sort': sort,
+        'next_query': cursor_query(request.GET, after=page.next_cursor) if page.has_next() else None,
+        'previous_query': cursor_query(request.GET, before=page.previous_cursor) if page.has_previous() else None,
+        'refreshing': refreshing,
     }
     return render(request, 'vendors/vendor_list_v2.html', context)
 
+def _float_param(request, name, default=None):
+    try:
+        value = float(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        return default
+    # float() also accepts 'nan' / 'inf', which would break the radius clamp and geohash cells
+    return value if math.isfinite(value) else default
+
+def _reference_point(request):
+    """
+    기준 위치 (lat, lng, 예식장): 좌표 파라미터가 없으면 최종 선택한 예식장 좌표, 둘 다 없으면 (None, None, None)
+    """
+    lat = _float_param(request, 'lat')
+    lng = _float_param(request, 'lng')
+    if lat is not None and lng is not None:
+        return lat, lng, None
+    if hasattr(request.user, 'wedding_profile'):
+        selection = (UserVendorSelection.objects
+                     .filter(profile=request.user.wedding_profile, status='final',
+                             vendor__category__slug=settings.VENDOR_VENUE_CATEGORY,
+                             vendor__latitude__isnull=False)
+                     .select_related('vendor')
+                     .first())
+        if selection:
+            venue = selection.vendor
+            return venue.latitude, venue.longitude, venue
+    return None, None, None
+
+@login_required
+def vendor_nearby(request):
+    """
+    기준 위치(좌표 또는 최종 선택한 예식장) 반경 내 업체를 가까운 순으로 조회
+    """
+    category_slug = request.GET.get('category')
+    radius = min(max(_float_param(request, 'radius', 5.0), 0.5), 50.0)
+    lat, lng, venue = _reference_point(request)
+
+    page = None
+    if lat is not None and lng is not None:
+        vendors = Vendor.objects.select_related('category')
+        if category_slug:
+            vendors = vendors.filter(category__slug=category_slug)
+        if venue:
+            vendors = vendors.exclude(pk=venue.pk)
+        page = Paginator(vendors_near(vendors, lat, lng, radius), 12).get_page(request.GET.get('page', 1))
+
+    context = {
+        'vendors': page,
+        'categories': VendorCategory.objects.all(),
+        'current_category': category_slug,
+        'radius': radius,
+        'radius_choices': [1, 3, 5, 10, 20],
+        'lat': lat,
+        'lng': lng,
+        'venue': venue,
+    }
+    return render(request, 'vendors/vendor_nearby.html', context)
+
 @login_required
 def vendor_detail(request, vendor_id):
     """
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import WeddingGroup, WeddingProfile, ScheduleTask, DailyLog, Notice, Post, PostComment, NoticeComment
+from .models import WeddingGroup, WeddingProfile, ScheduleTask, DailyLog, Notice, Post, PostComment, NoticeComment, HotPost
 
 @admin.register(WeddingGroup)
 class WeddingGroupAdmin(admin.ModelAdmin):
@@ -33,3 +33,8 @@ class PostCommentAdmin(admin.ModelAdmin):
 @admin.register(NoticeComment)
 class NoticeCommentAdmin(admin.ModelAdmin):
     list_display = ('author', 'notice', 'created_at')
+
+@admin.register(HotPost)
+class HotPostAdmin(admin.ModelAdmin):
+    list_display = ('scope', 'post', 'score')
+    list_filter = ('scope',)
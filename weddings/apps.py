@@ -6,3 +6,4 @@ class WeddingsConfig(AppConfig):
 
     def ready(self):
         import weddings.signals
+        import weddings.search  # registers the full-text index with core.fts
@@ -0,0 +1,83 @@
+"""
+커뮤니티 목록 조각(fragment) 캐시
+
+community_main 의 게시글 목록(인기글 + 게시글 행 + 페이지 커서)과 공지 행을 렌더링한 HTML 로 캐시합니다.
+캐시 키에는 세대(generation) 번호가 들어가고, 글 작성/수정/삭제, 댓글, 추천이 일어나면 해당 카테고리와
+전체 목록의 세대를 올려 이전 조각을 한 번에 무효화합니다 (지울 키를 찾지 않음, 옛 조각은 TTL 로 사라짐).
+
+- 목록 키: (카테고리, 정렬, 커서) 별. 검색 결과는 캐시하지 않습니다.
+- 조회수와 인기글은 세대를 올리지 않으므로 FRAGMENT_TTL 만큼 늦게 반영될 수 있습니다.
+- 캐시 적중 시 목록/공지 ORM 쿼리 없이 캐시 조회 세 번(세대, 목록 조각, 공지 조각)으로 끝납니다.
+- 세대 번호로 무효화하므로 모든 프로세스가 같은 캐시(settings.CACHES, REDIS_URL)를 써야 합니다.
+  REDIS_URL 이 없을 때의 기본값 LocMemCache 는 프로세스별이므로 쓰기 기반 무효화는 단일 프로세스 서버에서만
+  유효합니다 (여러 프로세스면 다른 프로세스의 조각은 FRAGMENT_TTL 이 지나야 갱신됨).
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+FRAGMENT_TTL = 60
+NOTICES = 'notices'
+
+GENERATION_KEY = 'community_gen_{}'
+POST_LIST_KEY = 'community_posts_{}_{}_{}_{}'
+NOTICE_KEY = 'community_notices_{}'
+
+
+def _new_generation():
+    # Starts from the clock so an evicted counter never reuses an old generation
+    return time.time_ns() // 1000
+
+
+def _scope(category):
+    return category or 'all'
+
+
+def generations(*scopes):
+    """{범위: 현재 세대} (없으면 새로 시작)"""
+    keys = {GENERATION_KEY.format(scope): scope for scope in scopes}
+    found = cache.get_many(keys)
+    result = {}
+    for key, scope in keys.items():
+        if key not in found:
+            cache.add(key, _new_generation(), None)
+            found[key] = cache.get(key)
+        result[scope] = found[key]
+    return result
+
+
+def bump(*scopes):
+    for scope in scopes:
+        key = GENERATION_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_generation(), None)
+
+
+def bump_posts(*categories):
+    """카테고리 목록과 전체 목록의 조각 무효화 (글/댓글/추천 변경 시)"""
+    bump('all', *{_scope(category) for category in categories if category})
+
+
+def bump_notices():
+    bump(NOTICES)
+
+
+def fragment_keys(category, sort, after=None, before=None):
+    """(게시글 목록 키, 공지 키)"""
+    scope = _scope(category)
+    current = generations(scope, NOTICES)
+    cursor = hashlib.md5(f"{after or ''}|{before or ''}".encode()).hexdigest()
+    return (
+        POST_LIST_KEY.format(scope, current[scope], sort, cursor),
+        NOTICE_KEY.format(current[NOTICES]),
+    )
+
+
+def get_or_render(key, render):
+    """key 가 None 이면(검색 등) 캐시하지 않고 render()"""
+    if key is None:
+        return render()
+    return cache.get_or_set(key, render, FRAGMENT_TTL)
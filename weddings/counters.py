@@ -0,0 +1,124 @@
+"""
+게시글 댓글/추천 수 카운터 (Post.comment_count, Post.recommendation_count)
+
+목록/정렬에서 COUNT JOIN 없이 컬럼만 읽도록 변경 시점에 F() 로 증감합니다.
+- 댓글: PostComment 저장/삭제 시그널 (관리자 삭제, 작성자 탈퇴 등 연쇄 삭제 포함)
+- 추천: set_recommendations/toggle_recommendation 이 추천 행 변경과 같은 트랜잭션에서 갱신 (인기글 점수 weddings.hot_posts 도 함께)
+관리자 화면의 M2M 편집이나 사용자 삭제로 지워진 추천은 reconcile_post_counters 명령으로 맞춥니다.
+"""
+from collections import defaultdict
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.constants import OnConflict
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .hot_posts import WEIGHTS, record_activities
+from .models import Post, PostComment, PostRecommendation
+
+
+def add_to_counter(post_id, field, delta):
+    Post.objects.filter(pk=post_id).update(**{field: Greatest(F(field) + delta, Value(0))})
+
+
+def _insert_recommendation(post_id, user_id, recommended_at):
+    """추천 행 INSERT (이미 있으면 무시: ON CONFLICT DO NOTHING / INSERT OR IGNORE) 후 삽입된 행 수"""
+    ops = connection.ops
+    opts = PostRecommendation._meta
+    sql = "{} {} ({}, {}, {}) VALUES (%s, %s, %s) {}".format(
+        ops.insert_statement(on_conflict=OnConflict.IGNORE),
+        ops.quote_name(opts.db_table),
+        ops.quote_name(opts.get_field('post').column),
+        ops.quote_name(opts.get_field('user').column),
+        ops.quote_name(opts.get_field('created_at').column),
+        ops.on_conflict_suffix_sql([], OnConflict.IGNORE, [], []),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [post_id, user_id, recommended_at])
+        return cursor.rowcount
+
+
+def _delete_recommendation(post_id, user_id):
+    """추천 행 DELETE ... RETURNING created_at 한 문장, 지운 행의 추천 시각 (없었으면 None)"""
+    ops = connection.ops
+    opts = PostRecommendation._meta
+    created_at = opts.get_field('created_at')
+    sql = "DELETE FROM {} WHERE {} = %s AND {} = %s RETURNING {}".format(
+        ops.quote_name(opts.db_table),
+        ops.quote_name(opts.get_field('post').column),
+        ops.quote_name(opts.get_field('user').column),
+        ops.quote_name(created_at.column),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [post_id, user_id])
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    # Raw rows skip the backend's converters: SQLite hands back naive UTC text
+    recommended_at = created_at.to_python(row[0])
+    if settings.USE_TZ and timezone.is_naive(recommended_at):
+        recommended_at = timezone.make_aware(recommended_at, dt_timezone.utc)
+    return recommended_at
+
+
+def set_recommendations(user_id, changes):
+    """
+    [(post_id, recommended)] 를 순서대로 적용하고 게시글마다 [(post_id, 최종 추천 상태, 최종 추천 수)] 를 반환
+    (같은 게시글이 여러 번 나오면 모두 적용한 뒤의 상태 하나, 처음 나온 순서대로)
+    recommended 가 True/False 면 그 상태로 (이미 그 상태면 변화 없음), None 이면 토글
+    추천 행 변경은 변경마다 DELETE ... RETURNING 또는 INSERT 한 문장이고, 실제로 바뀐 행 수만큼만 카운터를 조정합니다.
+    """
+    now = timezone.now()
+    deltas = defaultdict(int)
+    activities = []
+    states = {}
+    with transaction.atomic():
+        for post_id, recommended in changes:
+            # The deleted row's created_at: the hot score gives back what it added at that time
+            recommended_at = None if recommended else _delete_recommendation(post_id, user_id)
+            if recommended or (recommended is None and recommended_at is None):
+                if _insert_recommendation(post_id, user_id, now):
+                    deltas[post_id] += 1
+                    activities.append((post_id, WEIGHTS['recommendation'], now))
+                states[post_id] = True
+            else:
+                if recommended_at is not None:
+                    deltas[post_id] -= 1
+                    activities.append((post_id, -WEIGHTS['recommendation'], recommended_at))
+                states[post_id] = False
+        for post_id, delta in deltas.items():
+            if delta:
+                add_to_counter(post_id, 'recommendation_count', delta)
+        record_activities(activities)
+        counts = dict(Post.objects.filter(pk__in=states).values_list('pk', 'recommendation_count'))
+    return [(post_id, state, counts.get(post_id)) for post_id, state in states.items()]
+
+
+def toggle_recommendation(post_id, user_id, recommended=None):
+    """추천을 토글하고 (recommended 를 주면 그 상태로) (추천 상태, 새 추천 수)를 반환"""
+    [(_, state, count)] = set_recommendations(user_id, [(post_id, recommended)])
+    return state, count
+
+
+def _count_subquery(queryset):
+    counts = queryset.filter(post_id=OuterRef('pk')).order_by().values('post_id').annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def reconcile_post_counters(queryset=None):
+    """
+    카운터를 실제 댓글/추천 행 수로 다시 맞추고 값이 틀렸던 게시글 수를 반환
+    """
+    queryset = Post.objects.all() if queryset is None else queryset
+    comments = _count_subquery(PostComment.objects.all())
+    recommendations = _count_subquery(PostRecommendation.objects.all())
+    with transaction.atomic():
+        drifted = list(queryset
+                       .annotate(actual_comments=comments, actual_recommendations=recommendations)
+                       .exclude(comment_count=F('actual_comments'), recommendation_count=F('actual_recommendations'))
+                       .values_list('pk', flat=True))
+        Post.objects.filter(pk__in=drifted).update(comment_count=comments, recommendation_count=recommendations)
+    return len(drifted)
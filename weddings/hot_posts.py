@@ -0,0 +1,175 @@
+"""
+커뮤니티 인기글 (시간 감쇠 hot score)
+
+점수는 활동 가중치의 지수 감쇠 합을 log 공간에 둔 값입니다.
+    hot_score = ln( Σ weight_i · 2^((t_i - EPOCH) / HALF_LIFE) )
+모든 게시글이 같은 기준 시각(EPOCH)으로 정규화되어 있으므로 '지금' 기준으로 다시 감쇠시키지 않아도
+점수 순서가 곧 현재 인기 순서입니다. 그래서 활동이 생길 때 해당 게시글 점수만 logaddexp 로 갱신하면 됩니다.
+
+- 활동: 글 작성(기본 점수), 추천(취소 시 차감), 댓글(삭제 시 차감), 조회(view_counter flush 때 묶어서)
+- 순위표: HotPost 에 범위(전체 / 카테고리)별 상위 BOARD_SIZE 개만 유지, 읽기는 인덱스로 k 행
+- 취소/삭제는 그 활동이 있었던 시각(댓글 created_at, PostRecommendation.created_at)의 가중치를 빼므로
+  더했던 만큼만 정확히 빠집니다.
+- 게시글이 삭제되면 (연쇄 삭제되는 댓글은 점수를 건드리지 않음) 그 글이 있던 순위표의 빈자리를
+  다음 순위 글로 채웁니다. rebuild_hot_posts 명령은 순위표 전체를 다시 만듭니다.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+from .models import HotPost, Post
+
+ALL = ''  # HotPost.scope of the board across categories
+BOARD_SIZE = 20
+
+HALF_LIFE = timedelta(hours=24)
+# Fixed reference time keeps the exponent small; only score differences matter
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+WEIGHTS = {
+    'post': 1.0,
+    'recommendation': 3.0,
+    'comment': 2.0,
+    'view': 0.1,
+}
+
+# Lower bound of the fraction kept when an activity is withdrawn: guards ln(0) against rounding only,
+# since a withdrawal subtracts exactly what its activity added
+_REMOVE_FLOOR = 1e-9
+
+
+def _time_term(when=None):
+    when = when or timezone.now()
+    return (when - EPOCH).total_seconds() / HALF_LIFE.total_seconds() * math.log(2)
+
+
+def activity_score(weight, when=None):
+    """가중치 weight 인 활동 1건의 log 공간 점수"""
+    return math.log(weight) + _time_term(when)
+
+
+def _logsumexp(terms):
+    top = max(terms)
+    return top + math.log(sum(math.exp(term - top) for term in terms))
+
+
+def initial_score(created_at, recommendations=0, views=0, comment_times=()):
+    """
+    활동 시각이 남아 있지 않은 기존 게시글의 점수 (마이그레이션/재계산용)
+    추천과 조회는 글 작성 시각에 있었던 것으로, 댓글은 각 댓글의 작성 시각으로 계산
+    """
+    weight = WEIGHTS['post'] + WEIGHTS['recommendation'] * recommendations + WEIGHTS['view'] * views
+    terms = [activity_score(weight, created_at)]
+    terms += [activity_score(WEIGHTS['comment'], when) for when in comment_times]
+    return _logsumexp(terms)
+
+
+def _combine(x, remove=False):
+    """hot_score 와 활동 점수 x 의 logaddexp (remove 면 log(e^s - e^x)) SQL 식"""
+    score = F('hot_score')
+    if remove:
+        return score + Ln(Greatest(Value(1.0) - Exp(x - score), Value(_REMOVE_FLOOR)))
+    return Greatest(score, x) + Ln(Value(1.0) + Exp(-Abs(score - x)))
+
+
+def record_activity(weights, when=None):
+    """{post_id: 가중치} (모두 when 시각의 활동) 를 반영, 음수 가중치는 when 시각에 더했던 만큼 차감"""
+    record_activities([(pk, weight, when) for pk, weight in weights.items()])
+
+
+def record_activities(activities):
+    """
+    [(post_id, 가중치, 활동 시각)] 을 hot_score 에 반영하고 순위표 갱신
+    음수 가중치는 취소: 그 활동이 있었던 시각으로 계산해 더했던 값만큼 뺌
+    게시글 묶음당 UPDATE 한 번씩 (추가/차감)
+    """
+    terms = {False: defaultdict(list), True: defaultdict(list)}
+    for pk, weight, when in activities:
+        if weight:
+            terms[weight < 0][pk].append(activity_score(abs(weight), when))
+    with transaction.atomic():
+        for remove, per_post in terms.items():
+            if not per_post:
+                continue
+            batch = {pk: _logsumexp(values) for pk, values in per_post.items()}
+            if len(batch) == 1:
+                x = Value(next(iter(batch.values())))
+            else:
+                x = Case(*[When(pk=pk, then=Value(value)) for pk, value in batch.items()], output_field=FloatField())
+            Post.objects.filter(pk__in=batch).update(hot_score=_combine(x, remove))
+        update_boards({pk for pk, _, _ in activities})
+
+
+def update_boards(post_ids):
+    """게시글들의 현재 점수를 전체/카테고리 순위표에 넣고 상위 BOARD_SIZE 개 밖은 잘라냄"""
+    posts = list(Post.objects.filter(pk__in=post_ids).values_list('pk', 'category', 'hot_score'))
+    scopes = defaultdict(list)
+    for pk, category, score in posts:
+        scopes[ALL].append(HotPost(scope=ALL, post_id=pk, score=score))
+        scopes[category].append(HotPost(scope=category, post_id=pk, score=score))
+    for scope, entries in scopes.items():
+        HotPost.objects.bulk_create(
+            entries, update_conflicts=True, unique_fields=['scope', 'post'], update_fields=['score']
+        )
+        _trim(scope)
+
+
+def move_to_category(post):
+    """게시글 카테고리가 바뀌면 이전 카테고리 순위표에서 빼고 새 카테고리에 반영"""
+    HotPost.objects.filter(post=post).exclude(scope__in=[ALL, post.category]).delete()
+    update_boards([post.pk])
+
+
+def _trim(scope):
+    board = HotPost.objects.filter(scope=scope)
+    cutoff = board.order_by('-score').values_list('score', flat=True)[BOARD_SIZE - 1:BOARD_SIZE]
+    if cutoff:
+        board.filter(score__lt=cutoff[0]).delete()
+
+
+def boards_of(post_id):
+    """게시글이 올라 있는 순위표 범위 목록"""
+    return list(HotPost.objects.filter(post_id=post_id).values_list('scope', flat=True))
+
+
+def refill_boards(scopes):
+    """BOARD_SIZE 보다 작아진 순위표를 순위표 밖의 다음 순위 글로 채움 (게시글 삭제 후)"""
+    for scope in scopes:
+        board = HotPost.objects.filter(scope=scope)
+        missing = BOARD_SIZE - board.count()
+        if missing <= 0:
+            continue
+        # Everything off the board scores at most the board's cutoff, so the best of the rest fills it
+        posts = Post.objects.filter(category=scope) if scope else Post.objects.all()
+        top = (posts.exclude(pk__in=board.values('post_id'))
+               .order_by('-hot_score')
+               .values_list('pk', 'hot_score')[:missing])
+        HotPost.objects.bulk_create(
+            [HotPost(scope=scope, post_id=pk, score=score) for pk, score in top], ignore_conflicts=True
+        )
+
+
+def hot_posts(category=None, limit=3):
+    """인기글 상위 limit 개 (category 가 없으면 전체), 순위표에서 limit 행만 읽음"""
+    entries = (HotPost.objects
+               .filter(scope=category or ALL)
+               .select_related('post__author')
+               .order_by('-score')[:limit])
+    return [entry.post for entry in entries]
+
+
+def rebuild_boards():
+    """모든 순위표를 저장된 hot_score 로 다시 채움 (게시글 삭제로 빈자리가 생겼을 때)"""
+    scopes = [ALL] + [category for category, _ in Post.CATEGORY_CHOICES]
+    with transaction.atomic():
+        HotPost.objects.all().delete()
+        for scope in scopes:
+            posts = Post.objects.filter(category=scope) if scope else Post.objects.all()
+            top = posts.order_by('-hot_score').values_list('pk', 'hot_score')[:BOARD_SIZE]
+            HotPost.objects.bulk_create([HotPost(scope=scope, post_id=pk, score=score) for pk, score in top])
+    return len(scopes)
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from weddings.view_counter import flush_views
+
+
+class Command(BaseCommand):
+    help = (
+        "캐시에 쌓인 게시글 조회수를 Post.view_count 에 반영 (cron 으로 주기 실행). "
+        "웹 프로세스와 공유하는 캐시(REDIS_URL)가 필요하며, 기본 LocMemCache 에서는 이 명령 프로세스의 빈 버퍼만 봅니다."
+    )
+
+    def handle(self, *args, **options):
+        if 'locmem' in settings.CACHES['default']['BACKEND'].lower():
+            self.stderr.write(self.style.WARNING(
+                "Per-process LocMemCache: web processes' buffered views are not visible here (set REDIS_URL)"
+            ))
+        flushed = flush_views()
+        self.stdout.write(self.style.SUCCESS(f"Flushed views of {flushed} post(s)"))
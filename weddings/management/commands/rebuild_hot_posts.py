@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from weddings.hot_posts import rebuild_boards
+
+
+class Command(BaseCommand):
+    help = "인기글 순위표(HotPost)를 저장된 hot_score 로 다시 채움 (게시글 대량 삭제 후 등)"
+
+    def handle(self, *args, **options):
+        boards = rebuild_boards()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt hot post boards: {boards}"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from weddings.counters import reconcile_post_counters
+
+
+class Command(BaseCommand):
+    help = "게시글 댓글/추천 수 카운터를 실제 행 수로 다시 맞춤 (주기적으로 또는 대량 삭제 후 실행)"
+
+    def handle(self, *args, **options):
+        fixed = reconcile_post_counters()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled post counters: fixed={fixed}"))
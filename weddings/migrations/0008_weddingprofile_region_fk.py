@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_load_regions'),
+        ('weddings', '0007_post_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weddingprofile',
+            name='sido',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='profiles', to='core.sido'),
+        ),
+        migrations.AddField(
+            model_name='weddingprofile',
+            name='sigungu',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='profiles', to='core.sigungu'),
+        ),
+    ]
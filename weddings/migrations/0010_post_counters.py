@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_existing(apps, schema_editor):
+    Post = apps.get_model('weddings', 'Post')
+    PostComment = apps.get_model('weddings', 'PostComment')
+    Recommendation = Post.recommendations.through
+
+    def count(model):
+        rows = model.objects.filter(post_id=OuterRef('pk')).order_by().values('post_id').annotate(n=Count('pk'))
+        return Coalesce(Subquery(rows.values('n'), output_field=IntegerField()), Value(0))
+
+    Post.objects.update(comment_count=count(PostComment), recommendation_count=count(Recommendation))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weddings', '0009_post_image_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='recommendation_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_existing, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['recommendation_count', 'view_count'], name='weddings_po_recomme_db41b7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['recommendation_count', 'created_at'], name='weddings_po_recomme_4638c0_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations, OperationalError
+
+# The SQL this migration runs lives here, not in core.fts, so later changes there can't alter it.
+# Only the FTS table is created: the weddings_post / auth_user triggers and the initial indexing are
+# installed after every migrate (core.fts.install_index_triggers).
+TABLE = 'weddings_post_fts'
+COLUMNS = 'title, content, author'
+RANK = 'bm25(10.0, 2.0, 5.0)'
+TRIGGERS = [f'{TABLE}_ai', f'{TABLE}_ad', f'{TABLE}_au', f'{TABLE}_rel0']
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return  # search falls back to icontains
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(f"CREATE VIRTUAL TABLE {TABLE} USING fts5({COLUMNS}, tokenize='trigram')")
+        except OperationalError:
+            return  # SQLite built without FTS5 / the trigram tokenizer
+        cursor.execute(f"INSERT INTO {TABLE}({TABLE}, rank) VALUES ('rank', '{RANK}')")
+
+
+def drop_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weddings', '0010_post_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
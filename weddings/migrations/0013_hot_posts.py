@@ -0,0 +1,94 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:16
+
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of weddings.hot_posts as of this migration (the live module imports the real models)
+ALL = ''
+BOARD_SIZE = 20
+HALF_LIFE = timedelta(hours=24)
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+WEIGHTS = {'post': 1.0, 'recommendation': 3.0, 'comment': 2.0, 'view': 0.1}
+
+
+def activity_score(weight, when):
+    return math.log(weight) + (when - EPOCH).total_seconds() / HALF_LIFE.total_seconds() * math.log(2)
+
+
+def initial_score(created_at, recommendations, views, comment_times):
+    # Recommendations and views count from the post's creation, comments from their own time
+    weight = WEIGHTS['post'] + WEIGHTS['recommendation'] * recommendations + WEIGHTS['view'] * views
+    terms = [activity_score(weight, created_at)]
+    terms += [activity_score(WEIGHTS['comment'], when) for when in comment_times]
+    top = max(terms)
+    return top + math.log(sum(math.exp(term - top) for term in terms))
+
+
+def score_existing(apps, schema_editor):
+    Post = apps.get_model('weddings', 'Post')
+    PostComment = apps.get_model('weddings', 'PostComment')
+    HotPost = apps.get_model('weddings', 'HotPost')
+
+    comment_times = defaultdict(list)
+    for post_id, created_at in PostComment.objects.values_list('post_id', 'created_at').iterator():
+        comment_times[post_id].append(created_at)
+
+    posts = list(Post.objects.only('pk', 'category', 'created_at', 'recommendation_count', 'view_count'))
+    for post in posts:
+        post.hot_score = initial_score(post.created_at, post.recommendation_count, post.view_count, comment_times[post.pk])
+    Post.objects.bulk_update(posts, ['hot_score'], batch_size=500)
+
+    boards = defaultdict(list)
+    for post in sorted(posts, key=lambda post: post.hot_score, reverse=True):
+        for scope in (ALL, post.category):
+            if len(boards[scope]) < BOARD_SIZE:
+                boards[scope].append(HotPost(scope=scope, post_id=post.pk, score=post.hot_score))
+    HotPost.objects.bulk_create([entry for entries in boards.values() for entry in entries])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weddings', '0012_post_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HotPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(blank=True, max_length=20)),
+                ('score', models.FloatField()),
+            ],
+            options={
+                'ordering': ['scope', '-score'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='weddings_po_recomme_db41b7_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='hot_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='hotpost',
+            name='post',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hot_entries', to='weddings.post'),
+        ),
+        migrations.AddIndex(
+            model_name='hotpost',
+            index=models.Index(fields=['scope', '-score'], name='weddings_ho_scope_c6a241_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hotpost',
+            unique_together={('scope', 'post')},
+        ),
+        migrations.RunPython(score_existing, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+from core.models import DerivedFieldsModel
 import random
 import string
 
@@ -17,7 +19,7 @@ class WeddingGroup(models.Model):
     def __str__(self):
         return f"Group {self.invite_code} ({self.wedding_date})"
 
-class WeddingProfile(models.Model):
+class WeddingProfile(DerivedFieldsModel):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='wedding_profile')
     group = models.ForeignKey(WeddingGroup, on_delete=models.SET_NULL, null=True, blank=True, related_name='profiles')
     
@@ -25,11 +27,19 @@ class WeddingProfile(models.Model):
     
     region_sido = models.CharField(max_length=50, blank=True, null=True)
     region_sigungu = models.CharField(max_length=50, blank=True, null=True)
+    sido = models.ForeignKey('core.Sido', on_delete=models.SET_NULL, null=True, blank=True, related_name='profiles')
+    sigungu = models.ForeignKey('core.Sigungu', on_delete=models.SET_NULL, null=True, blank=True, related_name='profiles')
     style = models.CharField(max_length=50, blank=True, null=True)
     budget_min = models.IntegerField(null=True, blank=True)
     budget_max = models.IntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # weddings.signals 가 저장 시 다시 계산하는 필드 (core.models.DerivedFieldsModel)
+    DERIVED_FIELDS = {
+        'sido': {'region_sido', 'region_sigungu'},
+        'sigungu': {'region_sido', 'region_sigungu'},
+    }
+
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
@@ -97,7 +107,7 @@ class Notice(models.Model):
     def __str__(self):
         return self.title
 
-class Post(models.Model):
+class Post(DerivedFieldsModel):
     CATEGORY_CHOICES = [
         ('CHAT', '수다'),
         ('QUESTION', '질문'),
@@ -110,24 +120,88 @@ class Post(models.Model):
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default='CHAT')
     view_count = models.PositiveIntegerField(default=0)
     image = models.ImageField(upload_to='community_images/', blank=True, null=True)
+    # 원본 이미지 sha256 (core.images 파생본 경로 키, 비어 있으면 원본을 그대로 사용)
+    image_hash = models.CharField(max_length=64, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='posts')
-    recommendations = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='recommended_posts', blank=True)
+    recommendations = models.ManyToManyField(
+        settings.AUTH_USER_MODEL, through='PostRecommendation', related_name='recommended_posts', blank=True
+    )
+    # 비정규화 카운터 (weddings.counters 가 댓글/추천 변경과 같은 트랜잭션에서 갱신, reconcile_post_counters 로 보정)
+    comment_count = models.PositiveIntegerField(default=0)
+    recommendation_count = models.PositiveIntegerField(default=0)
+    # 시간 감쇠 인기 점수 (log 공간, weddings.hot_posts 가 추천/댓글/조회 때마다 갱신)
+    hot_score = models.FloatField(default=0)
+
+    # weddings.signals 가 저장 시 다시 계산하는 필드 (core.models.DerivedFieldsModel)
+    DERIVED_FIELDS = {
+        'image_hash': {'image'},
+    }
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination sort keys (weddings.views.community.POST_SORTS), per category and overall
+            models.Index(fields=['category', 'created_at', 'id']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['category', 'recommendation_count', 'id']),
+            models.Index(fields=['recommendation_count', 'id']),
+            models.Index(fields=['category', 'view_count', 'id']),
+            models.Index(fields=['view_count', 'id']),
+        ]
 
     def __str__(self):
         return f"[{self.get_category_display()}] {self.title}"
 
+class PostRecommendation(models.Model):
+    """
+    게시글 추천 (Post.recommendations 의 중간 테이블, 기존 자동 생성 테이블을 그대로 사용)
+    created_at: 추천 취소 시 인기 점수에서 그 시각의 가중치만큼 빼기 위해 저장
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'weddings_post_recommendations'
+        unique_together = ('post', 'user')
+
+    def __str__(self):
+        return f'{self.user} recommends {self.post_id}'
+
+class HotPost(models.Model):
+    """
+    인기글 순위표 (범위별 상위 BOARD_SIZE 개, weddings.hot_posts 가 점진적으로 갱신)
+    scope: '' 는 전체, 그 외는 Post 카테고리
+    """
+    scope = models.CharField(max_length=20, blank=True)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='hot_entries')
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ('scope', 'post')
+        indexes = [
+            models.Index(fields=['scope', '-score']),
+        ]
+        ordering = ['scope', '-score']
+
+    def __str__(self):
+        return f"{self.scope or 'ALL'}: {self.post_id} ({self.score:.3f})"
+
 class PostComment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='post_comments')
+    # 답글이면 최상위 댓글 (한 단계만: 답글에 단 답글도 최상위 댓글에 붙음)
+    parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # Keyset pages of top-level comments (parent IS NULL) per post
+            models.Index(fields=['post', 'parent', 'created_at', 'id']),
+        ]
 
     def __str__(self):
         return f'Comment by {self.author} on {self.post}'
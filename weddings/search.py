@@ -0,0 +1,36 @@
+"""
+커뮤니티 게시글 전문 검색 (제목, 본문, 작성자 이름)
+
+인덱스(weddings_post_fts)는 마이그레이션 0011 에서 만들어지고 weddings_post / auth_user 트리거로 갱신됩니다
+(트리거 설치/재설치는 migrate 직후 core.fts.install_index_triggers).
+공통 동작(trigram, 짧은 검색어 처리, 대체 검색)은 core.fts 를 참고하세요.
+"""
+from core.fts import FullTextIndex, register
+
+POST_INDEX = register(FullTextIndex(
+    table='weddings_post_fts',
+    source_table='weddings_post',
+    columns=[
+        ('title', '{row}.title'),
+        ('content', '{row}.content'),
+        ('author', "(SELECT first_name || ' ' || username FROM auth_user WHERE id = {row}.author_id)"),
+    ],
+    weights=[10.0, 2.0, 5.0],
+    watch=['title', 'content', 'author_id'],
+    related=[('auth_user', 'first_name, username', 'author', 'author_id', "NEW.first_name || ' ' || NEW.username")],
+    fallback_fields={
+        'title': 'title',
+        'content': 'content',
+        'author__first_name': 'author',
+        'author__username': 'author',
+    },
+))
+
+
+def search_posts(text, queryset=None):
+    """
+    검색어로 게시글을 찾아 관련도순으로 반환 (search_rank 주석 포함)
+    """
+    from .models import Post
+    queryset = Post.objects.all() if queryset is None else queryset
+    return POST_INDEX.search(queryset, text)
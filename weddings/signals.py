@@ -1,6 +1,14 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from .models import WeddingGroup, ScheduleTask  # WeddingProfile 대신 WeddingGroup 임포트
+from core.images import process_field
+from core.regions import assign_region
+from .counters import add_to_counter
+from .hot_posts import WEIGHTS, boards_of, move_to_category, record_activity, refill_boards
+from .models import WeddingGroup, WeddingProfile, ScheduleTask, Post, PostComment
+
+# Posts in the middle of delete() -> hot board scopes they were on.
+# Their comments are cascade-deleted first and must not write score/board rows back for them.
+_deleting_posts = {}
 
 
 @receiver(post_save, sender=WeddingGroup)  # WeddingGroup 생성 시 실행되도록 변경
@@ -72,4 +80,65 @@ def create_default_schedule(sender, instance, created, **kwargs):
                 )
             )
 
-        ScheduleTask.objects.bulk_create(tasks_to_create)
\ No newline at end of file
+        ScheduleTask.objects.bulk_create(tasks_to_create)
+
+
+@receiver(pre_save, sender=WeddingProfile)
+def normalize_profile_region(sender, instance, update_fields=None, **kwargs):
+    """
+    프로필 저장 시 시도/시군구 문자열로 행정구역 FK 를 맞춤
+    """
+    if update_fields is not None and not WeddingProfile.DERIVED_FIELDS['sido'] & set(update_fields):
+        return
+    assign_region(instance, f"{instance.region_sido or ''} {instance.region_sigungu or ''}")
+
+
+@receiver(pre_save, sender=Post)
+def update_post_image_hash(sender, instance, update_fields=None, **kwargs):
+    """
+    새 이미지가 올라오면 파생본(core.images)을 만들고 해시를 저장, 이미지를 지우면 해시도 비움
+    """
+    if update_fields is not None and not Post.DERIVED_FIELDS['image_hash'] & set(update_fields):
+        return
+    if not instance.image:
+        instance.image_hash = ''
+    elif not instance.image._committed:
+        instance.image_hash = process_field(instance.image)
+
+
+@receiver(post_save, sender=Post)
+def update_post_hot_score(sender, instance, created, update_fields=None, **kwargs):
+    """
+    새 글은 작성 시각 기준 기본 점수로 인기글 순위에 넣고, 카테고리가 바뀐 글은 순위표를 옮김
+    """
+    if created:
+        record_activity({instance.pk: WEIGHTS['post']}, when=instance.created_at)
+    elif update_fields is None or 'category' in update_fields:
+        move_to_category(instance)
+
+
+@receiver(pre_delete, sender=Post)
+def mark_post_deleting(sender, instance, **kwargs):
+    _deleting_posts[instance.pk] = boards_of(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def refill_hot_boards(sender, instance, **kwargs):
+    """삭제된 글이 있던 인기글 순위표의 빈자리를 다음 순위 글로 채움"""
+    refill_boards(_deleting_posts.pop(instance.pk, ()))
+
+
+@receiver(post_save, sender=PostComment)
+def count_comment_added(sender, instance, created, **kwargs):
+    if created:
+        add_to_counter(instance.post_id, 'comment_count', 1)
+        record_activity({instance.post_id: WEIGHTS['comment']}, when=instance.created_at)
+
+
+@receiver(post_delete, sender=PostComment)
+def count_comment_deleted(sender, instance, **kwargs):
+    if instance.post_id in _deleting_posts:
+        return  # cascade from the post itself: its counters, score and board rows go with it
+    add_to_counter(instance.post_id, 'comment_count', -1)
+    # Withdraw the comment's weight as of when it was written (that is what it added)
+    record_activity({instance.post_id: -WEIGHTS['comment']}, when=instance.created_at)
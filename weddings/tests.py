@@ -1,3 +1,409 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.regions import reset_region_cache
+from weddings import community_cache, hot_posts, view_counter
+from weddings.counters import add_to_counter, reconcile_post_counters, set_recommendations, toggle_recommendation
+from weddings.models import HotPost, Notice, Post, PostComment, PostRecommendation, WeddingProfile
+from weddings.search import search_posts
+from weddings.views import community
+
+
+class ViewCounterFlushTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        author = get_user_model().objects.create_user('writer', password='pw')
+        self.post = Post.objects.create(title='제목', content='내용', author=author)
+        self.other = Post.objects.create(title='제목2', content='내용2', author=author)
+
+    def tearDown(self):
+        cache.clear()
+
+    def view_count(self, post):
+        post.refresh_from_db()
+        return post.view_count
+
+    def test_flush_writes_buffered_views(self):
+        cache.set(view_counter.FLUSH_DUE_KEY, 1)  # not due: record_view only buffers
+        for _ in range(3):
+            self.assertFalse(view_counter.record_view(self.post.pk))
+        self.assertEqual(self.view_count(self.post), 0)
+        self.assertEqual(view_counter.flush_views(), 1)
+        self.assertEqual(self.view_count(self.post), 3)
+        self.assertEqual(view_counter.pending_views([self.post.pk]), {})
+
+    def test_slot_numbered_but_not_written_is_read_next_flush(self):
+        # Another request took sequence number 1 but has not written its slot yet
+        cache.set(view_counter.PENDING_KEY.format(self.post.pk), 2, None)
+        view_counter._incr(view_counter.SEQUENCE_KEY, timeout=None)
+        view_counter._incr(view_counter.PENDING_KEY.format(self.other.pk))
+        view_counter._mark_dirty(self.other.pk)
+
+        self.assertEqual(view_counter.flush_views(), 0)
+        self.assertEqual(self.view_count(self.other), 0)
+
+        cache.set(view_counter.SLOT_KEY.format(1), self.post.pk)
+        self.assertEqual(view_counter.flush_views(), 2)
+        self.assertEqual((self.view_count(self.post), self.view_count(self.other)), (2, 1))
+
+    def test_slot_lost_from_cache_is_skipped_after_one_flush(self):
+        view_counter._incr(view_counter.SEQUENCE_KEY, timeout=None)
+        view_counter._incr(view_counter.PENDING_KEY.format(self.other.pk))
+        view_counter._mark_dirty(self.other.pk)
+
+        view_counter.flush_views()
+        self.assertEqual(view_counter.flush_views(), 1)
+        self.assertEqual(self.view_count(self.other), 1)
+
+
+
+class WeddingProfileRegionTests(TestCase):
+    def setUp(self):
+        reset_region_cache()
+        self.addCleanup(reset_region_cache)
+        user = get_user_model().objects.create_user('bride', password='pw')
+        self.profile = WeddingProfile.objects.create(user=user, region_sido='서울특별시', region_sigungu='강남')
+
+    def test_region_strings_are_mapped(self):
+        self.assertEqual((self.profile.sido.name, self.profile.sigungu.name), ('서울', '강남구'))
+
+    def test_partial_save_updates_region(self):
+        self.profile.region_sido, self.profile.region_sigungu = '경기도', '분당구'
+        self.profile.save(update_fields=['region_sido', 'region_sigungu'])
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.sido.name, self.profile.sigungu.name), ('경기', '성남시'))
+
+class HotPostsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.author = User.objects.create_user('writer', password='pw')
+        self.reader = User.objects.create_user('reader', password='pw')
+        self.posts = [
+            Post.objects.create(title=f'글 {i}', content='내용', author=self.author,
+                                category='TIP' if i % 2 else 'CHAT')
+            for i in range(4)
+        ]
+
+    def tearDown(self):
+        cache.clear()
+
+    def comment(self, post, author=None):
+        return PostComment.objects.create(post=post, author=author or self.reader, content='댓글')
+
+    def board(self, scope=hot_posts.ALL):
+        return list(HotPost.objects.filter(scope=scope).order_by('-score').values_list('post_id', flat=True))
+
+    def test_activity_moves_post_up_its_boards(self):
+        self.comment(self.posts[0])
+        self.assertEqual(hot_posts.hot_posts(limit=1), [self.posts[0]])
+        self.assertEqual(hot_posts.hot_posts('TIP', limit=1), [self.posts[3]])
+        self.assertEqual(set(self.board('CHAT')), {self.posts[0].pk, self.posts[2].pk})
+
+    def test_deleted_comment_withdraws_exactly_what_it_added(self):
+        post = self.posts[1]
+        post.refresh_from_db()
+        before = post.hot_score
+        comment = self.comment(post)
+        comment.delete()
+        post.refresh_from_db()
+        self.assertAlmostEqual(post.hot_score, before, places=6)
+
+    def test_older_activity_counts_less(self):
+        a, b = self.posts[0], self.posts[1]
+        hot_posts.record_activity({a.pk: hot_posts.WEIGHTS['comment']},
+                                  when=a.created_at - timedelta(days=3))
+        hot_posts.record_activity({b.pk: hot_posts.WEIGHTS['comment']}, when=b.created_at)
+        self.assertEqual(self.board()[0], b.pk)
+
+    def test_delete_commented_post(self):
+        post = self.posts[0]
+        self.comment(post)
+        self.comment(post, author=self.author)
+        post.delete()
+        connection.check_constraints()
+        self.assertFalse(HotPost.objects.filter(post_id=post.pk).exists())
+        self.assertEqual(len(self.board()), 3)
+
+    def test_delete_view_for_commented_post(self):
+        post = self.posts[0]
+        self.comment(post)
+        self.client.force_login(self.author)
+        self.client.post(reverse('post_delete', args=[post.pk]))
+        connection.check_constraints()
+        self.assertFalse(Post.objects.filter(pk=post.pk).exists())
+
+    def test_delete_user_with_commented_posts(self):
+        self.comment(self.posts[0])
+        other = Post.objects.create(title='다른 글', content='내용', author=self.reader)
+        self.comment(other, author=self.author)
+        self.comment(other)
+        self.author.delete()
+        connection.check_constraints()
+        other.refresh_from_db()
+        self.assertEqual(other.comment_count, 1)
+        self.assertEqual(self.board(), [other.pk])
+
+    def test_deleted_post_leaves_no_gap_on_full_board(self):
+        with mock.patch.object(hot_posts, 'BOARD_SIZE', 2):
+            hot_posts.rebuild_boards()
+            self.assertEqual(len(self.board()), 2)
+            top = self.board()[0]
+            Post.objects.get(pk=top).delete()
+            self.assertEqual(len(self.board()), 2)
+            self.assertNotIn(top, self.board())
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user('reader', password='pw')
+        self.posts = [Post.objects.create(title=f'글 {i}', content='내용', author=self.user) for i in range(2)]
+
+    def tearDown(self):
+        cache.clear()
+
+    def state(self, post):
+        post.refresh_from_db()
+        return post.recommendation_count, post.hot_score
+
+    def test_toggle_round_trip(self):
+        post = self.posts[0]
+        before = self.state(post)
+        self.assertEqual(toggle_recommendation(post.pk, self.user.pk), (True, 1))
+        self.assertEqual(toggle_recommendation(post.pk, self.user.pk), (False, 0))
+        count, score = self.state(post)
+        self.assertEqual(count, 0)
+        self.assertAlmostEqual(score, before[1], places=6)
+
+    def test_explicit_state_is_idempotent(self):
+        post = self.posts[0]
+        for _ in range(2):
+            self.assertEqual(toggle_recommendation(post.pk, self.user.pk, True), (True, 1))
+        for _ in range(2):
+            self.assertEqual(toggle_recommendation(post.pk, self.user.pk, False), (False, 0))
+        self.assertFalse(PostRecommendation.objects.exists())
+
+    def test_unrecommend_is_one_statement(self):
+        post = self.posts[0]
+        toggle_recommendation(post.pk, self.user.pk, True)
+        table = PostRecommendation._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            toggle_recommendation(post.pk, self.user.pk, False)
+        touching = [q['sql'] for q in queries.captured_queries if table in q['sql']]
+        self.assertEqual(len(touching), 1)
+        self.assertTrue(touching[0].startswith('DELETE'))
+
+    def test_duplicate_post_ids_report_final_state(self):
+        a, b = self.posts
+        results = set_recommendations(self.user.pk, [(a.pk, True), (b.pk, None), (a.pk, False), (b.pk, None)])
+        self.assertEqual(results, [(a.pk, False, 0), (b.pk, False, 0)])
+
+    def test_batch_endpoint(self):
+        a, b = self.posts
+        self.client.force_login(self.user)
+        body = {'recommendations': [
+            {'post_id': a.pk, 'recommended': True},
+            {'post_id': b.pk, 'recommended': True},
+            {'post_id': b.pk, 'recommended': False},
+            {'post_id': 9999, 'recommended': True},
+        ]}
+        for _ in range(2):  # resending the same batch gives the same result
+            response = self.client.post(reverse('post_recommend_batch'), body, content_type='application/json')
+            self.assertEqual(response.json(), {
+                'results': [
+                    {'post_id': a.pk, 'recommended': True, 'recommendation_count': 1},
+                    {'post_id': b.pk, 'recommended': False, 'recommendation_count': 0},
+                ],
+                'missing': [9999],
+            })
+
+    def test_batch_endpoint_rejects_bad_body(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('post_recommend_batch'), {'recommendations': [{'id': 1}]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+
+class PostCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.author = User.objects.create_user('writer', password='pw')
+        self.reader = User.objects.create_user('reader', password='pw')
+        self.post = Post.objects.create(title='글', content='내용', author=self.author)
+
+    def tearDown(self):
+        cache.clear()
+
+    def counts(self):
+        self.post.refresh_from_db()
+        return self.post.comment_count, self.post.recommendation_count
+
+    def test_comments_and_recommendations_are_counted(self):
+        comments = [PostComment.objects.create(post=self.post, author=self.reader, content='댓글') for _ in range(2)]
+        toggle_recommendation(self.post.pk, self.reader.pk)
+        self.assertEqual(self.counts(), (2, 1))
+        comments[0].delete()
+        self.assertEqual(self.counts(), (1, 1))
+
+    def test_counter_never_goes_negative(self):
+        add_to_counter(self.post.pk, 'comment_count', -1)
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_reconcile_fixes_drift(self):
+        PostComment.objects.create(post=self.post, author=self.reader, content='댓글')
+        toggle_recommendation(self.post.pk, self.author.pk)
+        toggle_recommendation(self.post.pk, self.reader.pk)
+        self.reader.delete()  # cascades the recommendation row without touching the counter
+        self.assertEqual(self.counts(), (0, 2))
+        self.assertEqual(reconcile_post_counters(), 1)
+        self.assertEqual(self.counts(), (0, 1))
+        out = StringIO()
+        call_command('reconcile_post_counters', stdout=out)
+        self.assertIn('fixed=0', out.getvalue())
+
+    def test_likes_sort_reads_the_counter(self):
+        other = Post.objects.create(title='다른 글', content='내용', author=self.author)
+        toggle_recommendation(other.pk, self.reader.pk)
+        self.client.force_login(self.reader)
+        response = self.client.get(reverse('community_main'), {'sort': 'likes'})
+        self.assertEqual([post.pk for post in response.context['posts']][:2], [other.pk, self.post.pk])
+
+
+class CommunityCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user('writer', password='pw')
+        self.post = Post.objects.create(title='첫 글', content='내용', author=self.user, category='TIP')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def page(self, **params):
+        return self.client.get(reverse('community_main'), params).content.decode()
+
+    def test_cache_hit_runs_no_post_queries(self):
+        self.page()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIn('첫 글', self.page())
+        tables = (Post._meta.db_table, Notice._meta.db_table)
+        self.assertEqual([q['sql'] for q in queries.captured_queries if any(t in q['sql'] for t in tables)], [])
+
+    def test_writes_through_the_views_invalidate(self):
+        self.page()
+        self.page(category='CHAT')
+        chat = community_cache.generations('CHAT')['CHAT']
+        self.client.post(reverse('post_create'), {'category': 'TIP', 'title': '새 글', 'content': '내용'})
+        self.assertIn('새 글', self.page())
+        self.assertIn('새 글', self.page(category='TIP'))
+        self.assertEqual(community_cache.generations('CHAT')['CHAT'], chat)  # other categories keep their fragments
+
+        generation = community_cache.generations('all')['all']
+        self.client.post(reverse('comment_create'), {'post_id': self.post.pk, 'content': '댓글'})
+        self.assertNotEqual(community_cache.generations('all')['all'], generation)
+
+    def test_unbumped_write_is_stale_but_search_is_not_cached(self):
+        self.page()
+        Post.objects.create(title='조용히 쓴 글', content='내용', author=self.user)
+        self.assertNotIn('조용히 쓴 글', self.page())
+        self.assertIn('조용히 쓴 글', self.page(q='조용히'))
+
+class PostSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = get_user_model().objects.create_user('bride', password='pw', first_name='김신부')
+        self.post = Post.objects.create(title='드레스 투어 후기', content='청담 드레스샵 세 곳 다녀왔어요',
+                                        author=self.author, category='REVIEW')
+        self.other = Post.objects.create(title='예산 질문', content='스드메 평균 비용이 궁금해요',
+                                         author=self.author, category='QUESTION')
+
+    def tearDown(self):
+        cache.clear()
+
+    def found(self, text, queryset=None):
+        return list(search_posts(text, queryset).values_list('pk', flat=True))
+
+    def test_title_content_and_author(self):
+        self.assertEqual(self.found('드레스샵'), [self.post.pk])
+        self.assertEqual(self.found('평균 비용'), [self.other.pk])
+        self.assertEqual(set(self.found('김신부')), {self.post.pk, self.other.pk})
+        self.assertEqual(self.found('청담'), [self.post.pk])  # short term
+
+    def test_title_hit_ranks_above_content_hit(self):
+        third = Post.objects.create(title='스드메 견적', content='드레스 투어 일정 공유', author=self.author)
+        self.assertEqual(self.found('드레스 투어'), [self.post.pk, third.pk])
+
+    def test_edits_and_author_rename_are_reindexed(self):
+        self.post.title = '본식 스냅 후기'
+        self.post.content = '작가님이 친절해요'
+        self.post.save()
+        self.assertEqual(self.found('드레스샵'), [])
+        self.assertEqual(self.found('본식 스냅'), [self.post.pk])
+        self.author.first_name = '박신부'
+        self.author.save()
+        self.assertEqual(self.found('김신부'), [])
+        self.assertEqual(set(self.found('박신부')), {self.post.pk, self.other.pk})
+
+    def test_scoped_to_queryset(self):
+        self.assertEqual(self.found('김신부', Post.objects.filter(category='QUESTION')), [self.other.pk])
+
+    def test_community_search_view(self):
+        self.client.force_login(self.author)
+        response = self.client.get(reverse('community_main'), {'q': '드레스샵'})
+        self.assertContains(response, '드레스 투어 후기')
+        self.assertNotContains(response, '예산 질문')
+
+
+@mock.patch.object(community, 'COMMENTS_PER_PAGE', 3)
+class CommentPageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user('writer', password='pw')
+        self.post = Post.objects.create(title='글', content='내용', author=self.user)
+        self.comments = [PostComment.objects.create(post=self.post, author=self.user, content=f'댓글 {i}')
+                         for i in range(7)]
+        self.reply = PostComment.objects.create(post=self.post, author=self.user, content='답글',
+                                                parent=self.comments[4])
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_pages_of_top_level_comments_with_their_replies(self):
+        seen, after = [], None
+        while True:
+            with self.assertNumQueries(2):  # one page, one batch of replies
+                page = community.comment_page(self.post.pk, after=after)
+                seen += [(comment.pk, [reply.pk for reply in comment.thread]) for comment in page]
+            if not page.has_next():
+                break
+            after = page.next_cursor
+        self.assertEqual([pk for pk, _ in seen], [comment.pk for comment in self.comments])
+        self.assertEqual(dict(seen)[self.comments[4].pk], [self.reply.pk])
+
+    def test_reply_to_a_reply_hangs_off_the_top_level_comment(self):
+        self.client.post(reverse('comment_create'),
+                         {'post_id': self.post.pk, 'parent_id': self.reply.pk, 'content': '답글의 답글'})
+        nested = PostComment.objects.get(content='답글의 답글')
+        self.assertEqual(nested.parent_id, self.comments[4].pk)
 
-# Create your tests here.
+    def test_more_comments_endpoint(self):
+        first = community.comment_page(self.post.pk)
+        response = self.client.get(reverse('post_comments', args=[self.post.pk]), {'after': first.next_cursor})
+        self.assertContains(response, '댓글 3')
+        self.assertContains(response, '답글')
+        self.assertNotContains(response, '댓글 0')
+        response = self.client.get(reverse('post_comments', args=[self.post.pk]), {'after': 'garbage'})
+        self.assertEqual(response.status_code, 400)
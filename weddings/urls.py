@@ -10,8 +10,10 @@ urlpatterns = [
     path('community/', views.community_main, name='community_main'),
     path('community/write/', views.post_create, name='post_create'),
     path('community/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('community/<int:post_id>/comments/', views.post_comments, name='post_comments'),
     path('community/comment/create/', views.comment_create, name='comment_create'),
     path('community/<int:post_id>/recommend/', views.post_recommend, name='post_recommend'),
+    path('community/recommend/batch/', views.post_recommend_batch, name='post_recommend_batch'),
     path('community/<int:post_id>/delete/', views.post_delete, name='post_delete'),
     path('community/<int:post_id>/edit/', views.post_edit, name='post_edit'),
 ]
@@ -0,0 +1,146 @@
+"""
+게시글 조회수 write-behind 버퍼
+
+post_detail 은 조회마다 UPDATE 하지 않고 캐시 카운터만 올립니다 (cache.incr). 쌓인 조회수는
+flush_post_views 가 게시글별 증가분을 CASE 식 UPDATE 한 번으로 Post.view_count 에 더합니다.
+인기글 점수(weddings.hot_posts)의 조회 가중치도 flush 때 같은 묶음으로 반영합니다.
+
+- 버퍼 등록: 게시글 카운터가 0 -> 1 이 될 때만 (flush 이후 첫 조회) 일련번호 슬롯 키에 id 를 적어 둡니다.
+  잠금 없이 cache.incr 만 쓰므로 여러 프로세스가 동시에 기록해도 안전합니다.
+- flush: 슬롯에서 id 를 모아 증가분을 DB 에 더한 뒤 그만큼 cache.decr (그 사이 들어온 조회는 남음)
+  일련번호는 받았지만 아직 적히지 않은 슬롯에서 멈추고 다음 flush 때 이어서 읽습니다.
+  한 주기가 지나도 비어 있는 슬롯은 캐시에서 사라진 것으로 보고 건너뜁니다.
+- 주기: 타이머는 없고, 마지막 flush 후 POST_VIEW_FLUSH_INTERVAL 초가 지난 뒤 들어온 첫 조회 요청이 flush 합니다.
+  요청이 뜸하면 다음 요청이나 flush_post_views 명령(cron)이 돌 때까지 버퍼에 남습니다.
+- 유실 한도: 캐시가 사라지면(프로세스 종료, 캐시 서버 재시작) 마지막 flush 이후 쌓인 조회수를 잃습니다.
+  조회가 꾸준하면 약 INTERVAL 초 분량, cron 을 돌리면 최대 cron 주기 분량이지만, 조회도 cron 도 없으면
+  키 만료(KEY_TIMEOUT, 24시간)까지 반영되지 않을 수 있습니다.
+- 캐시: REDIS_URL 이 없을 때의 LocMemCache 는 프로세스별이라 프로세스마다 자기 버퍼를 flush 합니다 (settings.CACHES).
+  flush_post_views 명령은 웹 프로세스와 같은 공유 캐시(REDIS_URL)가 있어야 의미가 있습니다.
+- 화면에는 저장된 값 + 버퍼의 미반영 값을 더해 보여줍니다.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .hot_posts import WEIGHTS, record_activity
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'post_views_pending_{}'
+SLOT_KEY = 'post_views_dirty_{}'
+SEQUENCE_KEY = 'post_views_dirty_seq'
+FLUSHED_KEY = 'post_views_flushed_seq'
+SEEN_KEY = 'post_views_seen_seq'
+FLUSH_DUE_KEY = 'post_views_flush_due'
+FLUSH_LOCK_KEY = 'post_views_flush_lock'
+
+# Buffered keys outlive many flush intervals; losing one only drops its pending views
+KEY_TIMEOUT = 60 * 60 * 24
+
+
+def _flush_interval():
+    return getattr(settings, 'POST_VIEW_FLUSH_INTERVAL', 30)
+
+
+def _incr(key, timeout=KEY_TIMEOUT):
+    """cache.incr, 키가 없으면 1 로 생성 (동시 생성 경쟁 시 재시도)"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout):
+            return 1
+        return cache.incr(key)
+
+
+def _mark_dirty(post_id):
+    # The sequence never expires: flush compares it with the last flushed slot
+    slot = _incr(SEQUENCE_KEY, timeout=None)
+    cache.set(SLOT_KEY.format(slot), post_id, KEY_TIMEOUT)
+
+
+def record_view(post_id):
+    """
+    조회 1회 기록 (캐시 연산만). 주기가 되면 이 요청이 버퍼를 flush 하고 True 를 반환
+    (이미 읽어 둔 Post.view_count 는 그만큼 오래된 값이 됨)
+    """
+    if _incr(PENDING_KEY.format(post_id)) == 1:
+        _mark_dirty(post_id)
+    if cache.add(FLUSH_DUE_KEY, 1, _flush_interval()):
+        flush_views()
+        return True
+    return False
+
+
+def pending_views(post_ids):
+    """{post_id: 아직 DB 에 반영되지 않은 조회수}"""
+    keys = {PENDING_KEY.format(pk): pk for pk in post_ids}
+    return {keys[key]: count for key, count in cache.get_many(keys).items() if count}
+
+
+def with_pending_views(posts):
+    """게시글 객체들의 view_count 에 미반영 조회수를 더함 (목록 화면용, 캐시 조회 1회)"""
+    posts = list(posts)
+    pending = pending_views([post.pk for post in posts])
+    for post in posts:
+        post.view_count += pending.get(post.pk, 0)
+    return posts
+
+
+def flush_views():
+    """
+    버퍼의 조회수를 Post.view_count 에 반영 (UPDATE 1회) 하고 반영한 게시글 수를 반환
+    다른 프로세스가 flush 중이면 건너뜀
+    """
+    if not cache.add(FLUSH_LOCK_KEY, 1, 60):
+        return 0
+    try:
+        return _flush()
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+
+def _flush():
+    last = cache.get(SEQUENCE_KEY) or 0
+    flushed = cache.get(FLUSHED_KEY) or 0
+    if last <= flushed:
+        return 0
+    numbers = range(flushed + 1, last + 1)
+    found = cache.get_many([SLOT_KEY.format(n) for n in numbers])
+    # Slots up to the sequence seen by the previous flush had a whole interval to be written
+    seen = cache.get(SEEN_KEY) or 0
+    end = last
+    for n in numbers:
+        if SLOT_KEY.format(n) not in found and n > seen:
+            # Numbered but not written yet: stop here so the slot is read next time
+            end = n - 1
+            break
+    cache.set(SEEN_KEY, last, None)
+    if end <= flushed:
+        return 0
+    slots = [SLOT_KEY.format(n) for n in range(flushed + 1, end + 1)]
+    post_ids = {found[slot] for slot in slots if slot in found}
+    counts = {pk: count for pk, count in pending_views(post_ids).items() if count > 0}
+
+    if counts:
+        Post.objects.filter(pk__in=counts).update(view_count=F('view_count') + Case(
+            *[When(pk=pk, then=Value(count)) for pk, count in counts.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+        record_activity({pk: WEIGHTS['view'] * count for pk, count in counts.items()})
+    # Subtract what was written: views recorded meanwhile stay buffered (and re-register once back at 0 -> 1)
+    for pk, count in counts.items():
+        try:
+            remaining = cache.decr(PENDING_KEY.format(pk), count)
+        except ValueError:  # evicted meanwhile
+            continue
+        if remaining > 0:
+            _mark_dirty(pk)
+    cache.set(FLUSHED_KEY, end, None)
+    cache.delete_many(slots)
+    logger.debug("Flushed views of %d post(s)", len(counts))
+    return len(counts)
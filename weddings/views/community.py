@@ -1,101 +1,180 @@
+import json
+from collections import defaultdict
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q, Count
-from django.core.paginator import Paginator
-from weddings.models import Post, PostComment, NoticeComment, Notice, WeddingProfile
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.views.decorators.http import require_POST
+from django.core.cache import cache
+from django.db.models import Count
+from django.template.loader import render_to_string
+from core.pagination import InvalidCursor, KeysetPaginator, cursor_query
+from weddings.models import Post, PostComment, NoticeComment, Notice
+from weddings import community_cache
 from weddings.forms import PostForm, PostCommentForm, NoticeCommentForm
+from weddings.counters import set_recommendations, toggle_recommendation
+from weddings.hot_posts import hot_posts
+from weddings.search import search_posts
+from weddings.view_counter import pending_views, record_view, with_pending_views
 
-@login_required
-def community_main(request):
-    try:
-        profile = request.user.wedding_profile
-        group = profile.group
-        # if not group: pass
-    except WeddingProfile.DoesNotExist:
-        pass
+POSTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 20
+POST_COUNT_TTL = 60 * 5
 
-    # Community Search & Sort
-    search_query = request.GET.get('q', '')
-    sort_option = request.GET.get('sort', 'date')
-    category_filter = request.GET.get('category', '') # Added
+# 정렬 -> 키셋 정렬 키 (Post.Meta.indexes 의 (category, 키, id) / (키, id) 인덱스와 같은 순서)
+POST_SORTS = {
+    'date': ['-created_at', '-pk'],
+    'likes': ['-recommendation_count', '-pk'],
+    'views': ['-view_count', '-pk'],
+    'relevance': ['search_rank', 'pk'],
+}
 
-    posts_qs = Post.objects.annotate(
-        comment_count=Count('comments', distinct=True),
-        recommendation_count=Count('recommendations', distinct=True)
-    )
+def approximate_post_count(category):
+    """카테고리별 게시글 수 (POST_COUNT_TTL 동안 캐시한 근사값, 목록마다 COUNT 하지 않음)"""
+    key = f"community_post_count_{category or 'all'}"
+    queryset = Post.objects.filter(category=category) if category else Post.objects.all()
+    return cache.get_or_set(key, queryset.count, POST_COUNT_TTL)
+
+def render_post_list(search_query, sort_option, category_filter, after=None, before=None):
+    """
+    게시글 목록 조각: 인기글 + 게시글 행 HTML 과 페이지 커서, 게시글 수
+    (weddings.community_cache 에 그대로 캐시되므로 요청/사용자별 값은 넣지 않음)
+    """
+    # comment_count/recommendation_count are stored on Post (weddings.counters)
+    posts_qs = Post.objects.select_related('author')
 
     # Filter by category
     if category_filter:
         posts_qs = posts_qs.filter(category=category_filter)
 
-    # Filter by search query
+    # Filter by search query: title/content/author full-text index, ranked (weddings.search)
     if search_query:
-        posts_qs = posts_qs.filter(
-            Q(title__icontains=search_query) |
-            Q(content__icontains=search_query) |
-            Q(author__first_name__icontains=search_query) |
-            Q(author__username__icontains=search_query)
-        )
-
-    # Top recommended posts (only if no search query for cleaner results)
+        posts_qs = search_posts(search_query, posts_qs)
+
+    # Hot posts leaderboard (only if no search query for cleaner results), read from weddings.hot_posts
     top_posts = []
     if not search_query and not category_filter:
-        top_posts = posts_qs.order_by('-recommendation_count', '-view_count')[:3]
+        top_posts = with_pending_views(hot_posts(limit=3))
+
+    # Keyset pagination: after/before cursors on the sort key, no COUNT/OFFSET
+    paginator = KeysetPaginator(posts_qs, POST_SORTS[sort_option], POSTS_PER_PAGE)
+    try:
+        posts_page = paginator.page(after=after, before=before)
+    except InvalidCursor:
+        posts_page = paginator.page()
+    posts_page.object_list = with_pending_views(posts_page.object_list)
 
-    # Sort posts
-    if sort_option == 'likes':
-        posts_qs = posts_qs.order_by('-recommendation_count', '-created_at')
-    elif sort_option == 'views': # Added sort by views
-        posts_qs = posts_qs.order_by('-view_count', '-created_at')
-    else:  # default 'date'
-        posts_qs = posts_qs.order_by('-created_at')
+    return {
+        'html': render_to_string('weddings/includes/_community_post_rows.html', {
+            'posts': posts_page,
+            'top_posts': top_posts,
+        }),
+        'next_cursor': posts_page.next_cursor if posts_page.has_next() else None,
+        'previous_cursor': posts_page.previous_cursor if posts_page.has_previous() else None,
+        'post_count': None if search_query else approximate_post_count(category_filter),
+    }
 
+def render_notices():
     notices = Notice.objects.annotate(comment_count=Count('comments'))
+    return render_to_string('weddings/includes/_community_notice_rows.html', {'notices': notices})
+
+@login_required
+def community_main(request):
+    # Community Search & Sort
+    search_query = request.GET.get('q', '').strip()
+    # Searches are ordered by relevance unless a sort is picked explicitly
+    sort_option = request.GET.get('sort') or ('relevance' if search_query else 'date')
+    category_filter = request.GET.get('category', '') # Added
+    if sort_option not in POST_SORTS or (sort_option == 'relevance' and not search_query):
+        sort_option = 'date'
+    after, before = request.GET.get('after'), request.GET.get('before')
+
+    # Rendered fragments cached per (category, sort, cursor); writes bump generations (weddings.community_cache)
+    post_list_key, notices_key = community_cache.fragment_keys(category_filter, sort_option, after, before)
+    if search_query:
+        post_list_key = None
+    post_list = community_cache.get_or_render(
+        post_list_key, lambda: render_post_list(search_query, sort_option, category_filter, after, before)
+    )
+    notices_html = community_cache.get_or_render(notices_key, render_notices)
 
-    # Pagination
-    paginator = Paginator(posts_qs, 10)  # 10 posts per page
-    page_number = request.GET.get('page', 1)
-    posts_page = paginator.get_page(page_number)
-    
     context = {
-        'posts': posts_page,
-        'notices': notices,
-        'top_posts': top_posts, # Added top recommended posts
+        'post_rows': post_list['html'],
+        'notice_rows': notices_html,
         'search_query': search_query,
         'sort_option': sort_option,
         'category_filter': category_filter, # Added to context
         'CATEGORIES': Post.CATEGORY_CHOICES, # Pass choices to template
+        'post_count': post_list['post_count'],
+        'next_query': cursor_query(request.GET, after=post_list['next_cursor']) if post_list['next_cursor'] else None,
+        'previous_query': cursor_query(request.GET, before=post_list['previous_cursor']) if post_list['previous_cursor'] else None,
     }
     return render(request, 'weddings/community_main.html', context)
 
 @login_required
 def post_create(request):
     if request.method == 'POST':
-        form = PostForm(request.POST)
+        form = PostForm(request.POST, request.FILES)
         if form.is_valid():
             post = form.save(commit=False)
             post.author = request.user
             post.save()
+            community_cache.bump_posts(post.category)
             return redirect('community_main')
     else:
         form = PostForm()
     return render(request, 'weddings/post_form.html', {'form': form})
 
+def comment_page(post_id, after=None):
+    """
+    최상위 댓글 한 페이지 (created_at, id 키셋, 작성자 포함)와 각 댓글의 답글(comment.thread)
+    답글은 페이지마다 쿼리 한 번으로 가져옴. 잘못된 커서는 InvalidCursor
+    """
+    top_level = PostComment.objects.filter(post_id=post_id, parent__isnull=True).select_related('author')
+    page = KeysetPaginator(top_level, ['created_at', 'pk'], COMMENTS_PER_PAGE).page(after=after)
+    replies = defaultdict(list)
+    if page.object_list:
+        thread = (PostComment.objects
+                  .filter(parent__in=[comment.pk for comment in page])
+                  .select_related('author')
+                  .order_by('created_at', 'pk'))
+        for reply in thread:
+            replies[reply.parent_id].append(reply)
+    for comment in page:
+        comment.thread = replies[comment.pk]
+    return page
+
 @login_required
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_object_or_404(Post.objects.select_related('author'), id=post_id)
     
-    # Increment view count
-    from django.db.models import F
-    Post.objects.filter(id=post_id).update(view_count=F('view_count') + 1)
-    post.refresh_from_db()
+    # Buffered in the cache and flushed to view_count in batches (weddings.view_counter)
+    if record_view(post.id):
+        post.refresh_from_db(fields=['view_count'])
+    post.view_count += pending_views([post.id]).get(post.id, 0)
 
-    comments = post.comments.all()
+    try:
+        comments = comment_page(post.id, after=request.GET.get('after'))
+    except InvalidCursor:
+        comments = comment_page(post.id)
     form = PostCommentForm()
     return render(request, 'weddings/post_detail.html', {
         'post': post,
         'comments': comments,
-        'form': form
+        'form': form,
+        'recommended': post.recommendations.filter(id=request.user.id).exists(),
+    })
+
+@login_required
+def post_comments(request, post_id):
+    """댓글 "더 보기" 조각 (?after=커서 다음 페이지의 댓글 + 다음 더 보기 버튼)"""
+    try:
+        comments = comment_page(post_id, after=request.GET.get('after'))
+    except InvalidCursor:
+        return HttpResponseBadRequest('invalid cursor')
+    return render(request, 'weddings/includes/_post_comments.html', {
+        'post_id': post_id,
+        'comments': comments,
     })
 
 @login_required
@@ -111,7 +190,13 @@ def comment_create(request):
                 comment.author = request.user
                 post = get_object_or_404(Post, id=post_id)
                 comment.post = post
+                # Replies hang off the top-level comment of the same post
+                parent_id = request.POST.get('parent_id', '')
+                parent = PostComment.objects.filter(pk=parent_id, post=post).first() if parent_id.isdigit() else None
+                if parent:
+                    comment.parent_id = parent.parent_id or parent.pk
                 comment.save()
+                community_cache.bump_posts(post.category)
                 return redirect('post_detail', post_id=post.id)
                 
         elif notice_id:
@@ -122,28 +207,85 @@ def comment_create(request):
                 notice = get_object_or_404(Notice, id=notice_id)
                 comment.notice = notice
                 comment.save()
+                community_cache.bump_notices()
                 return redirect('community_main')
     
     return redirect('community_main')
 
+RECOMMEND_BATCH_LIMIT = 100
+
+def wants_json(request):
+    return 'application/json' in request.headers.get('Accept', '')
+
+def parse_recommended(value):
+    """'true'/'false' (또는 JSON true/false) -> bool, 없으면 None (토글)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in ('1', 'true', 'on'):
+        return True
+    if str(value).lower() in ('0', 'false', 'off'):
+        return False
+    raise ValueError(value)
+
 @login_required
 def post_recommend(request, post_id):
     post = get_object_or_404(Post, id=post_id)
-    if post.recommendations.filter(id=request.user.id).exists():
-        post.recommendations.remove(request.user)
-    else:
-        post.recommendations.add(request.user)
+
+    # JSON clients (fetch from post_detail, apps) get the new state instead of a redirect
+    if wants_json(request):
+        if request.method != 'POST':
+            return JsonResponse({'error': 'POST only'}, status=405)
+        try:
+            recommended = parse_recommended(request.POST.get('recommended'))
+        except ValueError:
+            return JsonResponse({'error': 'invalid recommended'}, status=400)
+        recommended, count = toggle_recommendation(post.id, request.user.id, recommended)
+        community_cache.bump_posts(post.category)
+        return JsonResponse({'post_id': post.id, 'recommended': recommended, 'recommendation_count': count})
+
+    toggle_recommendation(post.id, request.user.id)
+    community_cache.bump_posts(post.category)
     
     next_url = request.META.get('HTTP_REFERER')
     if next_url:
         return redirect(next_url)
     return redirect('community_main')
 
+@login_required
+@require_POST
+def post_recommend_batch(request):
+    """
+    여러 추천 변경을 한 요청/트랜잭션으로 적용 (오프라인 동기화용)
+    본문: {"recommendations": [{"post_id": 1, "recommended": true}, {"post_id": 2}, ...]}
+    recommended 를 생략하면 토글, 주면 그 상태로 (같은 요청을 다시 보내도 결과가 같음)
+    """
+    try:
+        items = json.loads(request.body)['recommendations']
+        changes = [(int(item['post_id']), parse_recommended(item.get('recommended'))) for item in items]
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': 'invalid body'}, status=400)
+    if len(changes) > RECOMMEND_BATCH_LIMIT:
+        return JsonResponse({'error': f'at most {RECOMMEND_BATCH_LIMIT} recommendations'}, status=400)
+
+    categories = dict(Post.objects.filter(pk__in={post_id for post_id, _ in changes}).values_list('pk', 'category'))
+    results = set_recommendations(request.user.id, [change for change in changes if change[0] in categories])
+    community_cache.bump_posts(*set(categories.values()))
+    return JsonResponse({
+        'results': [
+            {'post_id': post_id, 'recommended': state, 'recommendation_count': count}
+            for post_id, state, count in results
+        ],
+        'missing': sorted({post_id for post_id, _ in changes} - set(categories)),
+    })
+
 @login_required
 def post_delete(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     if request.user == post.author:
         post.delete()
+        community_cache.bump_posts(post.category)
     return redirect('community_main')
 
 @login_required
@@ -153,9 +295,11 @@ def post_edit(request, post_id):
         return redirect('post_detail', post_id=post.id)
     
     if request.method == 'POST':
-        form = PostForm(request.POST, instance=post)
+        previous_category = post.category
+        form = PostForm(request.POST, request.FILES, instance=post)
         if form.is_valid():
             form.save()
+            community_cache.bump_posts(previous_category, post.category)
             return redirect('post_detail', post_id=post.id)
     else:
         form = PostForm(instance=post)
@@ -2,19 +2,23 @@ from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from weddings.models import WeddingProfile
 from vendors.models import Vendor, VendorCategory, UserVendorSelection
+from vendors.recommendations import recommend_for_profile
 
 @login_required
 def vendor_main(request):
     try:
         profile = request.user.wedding_profile
-        group = profile.group
-        # if not group: pass
     except WeddingProfile.DoesNotExist:
-        pass
+        profile = None
+
+    recommended = recommend_for_profile(profile) if profile else []
+    if not recommended:
+        # Recommendations not built yet (or no profile): best rated vendors
+        recommended = Vendor.objects.select_related('category').order_by('-score', '-pk')[:4]
 
     context = {
-        'my_selected_vendors': UserVendorSelection.objects.filter(profile=profile, status='final').select_related('vendor', 'vendor__category'),
+        'my_selected_vendors': UserVendorSelection.objects.filter(profile=profile, status='final').select_related('vendor', 'vendor__category') if profile else [],
         'vendor_categories': VendorCategory.objects.all(),
-        'recommended_vendors': Vendor.objects.all()[:4],
+        'recommended_vendors': recommended,
     }
     return render(request, 'weddings/vendor_main.html', context)